@@ -7,6 +7,20 @@ PORT_A = '/dev/ttyBoardA'  # 센서 보드
 PORT_B = '/dev/ttyBoardB'  # 액추에이터 보드
 BAUD_RATE = 9600
 
+# 다중 보드 포트 테이블 (수신 허브가 하나의 루프에서 모두 처리)
+# - id: 보드 ID (로그/통계 표시용), port: 시리얼 포트, zone: 구역 ID
+# - 같은 zone의 센서 보드 명령(CMD_M*, 비상 정지)은 같은 zone의 액추에이터 보드로 전달
+# - 상태 저장소(StateStore)와 CSV 로그는 첫 번째 센서 보드의 zone(주 구역) 기준
+SENSOR_BOARDS = [
+    {'id': 'A', 'port': PORT_A, 'zone': 'main'},
+]
+ACTUATOR_BOARDS = [
+    {'id': 'B', 'port': PORT_B, 'zone': 'main'},
+]
+
+# OLED(Board A) 상태 전송: 구동계 상태가 바뀌면 즉시, 그 외에는 분이 바뀔 때와 하트비트 주기마다 전송
+OLED_HEARTBEAT_SEC = 10
+
 # ==========================================
 # 📁 파일 저장 경로
 # ==========================================
@@ -14,6 +28,36 @@ BASE_DIR = '/home/pi/smartfarm'
 LOG_DIR = os.path.join(BASE_DIR, 'logs_data')  # 센서 데이터 로그 (CSV)
 LOG_SYSTEM_DIR = os.path.join(BASE_DIR, 'logs_system')  # 시스템 로그 (smartfarm.log)
 IMG_DIR = os.path.join(BASE_DIR, 'images')
+TIER_DIR = os.path.join(BASE_DIR, 'logs_tiers')  # 계층형 기록 (원본 프레임 세그먼트 + 롤업)
+COLUMNAR_DIR = os.path.join(BASE_DIR, 'logs_columnar')  # 컬럼형 바이너리 로그 (CSV와 같은 내용)
+DAILY_SUMMARY_FILE = os.path.join(BASE_DIR, 'logs_summary', 'daily_summary.csv')  # 일별 요약 (하루·구역당 한 행)
+SQLITE_LOG_FILE = os.path.join(BASE_DIR, 'logs_db', 'smartfarm.db')  # SQLite 로그 (DATA_BACKEND = 'sqlite'일 때)
+
+# CSV 로그 기록 (로거 스레드)
+# - 큐에서 최대 LOG_BATCH_MAX_ROWS개 또는 LOG_BATCH_MAX_WAIT_MS 동안 모은 행을 한 번에 기록
+# - 파일 핸들은 날짜가 바뀔 때만 교체, fsync는 LOG_FSYNC_INTERVAL_SEC 주기로 수행 (0: 매 배치, None: 안 함)
+LOG_BATCH_MAX_ROWS = 50
+LOG_BATCH_MAX_WAIT_MS = 500
+LOG_FSYNC_INTERVAL_SEC = 60
+LOG_INDEX_EVERY_ROWS = 60  # N행마다 CSV 옆 사이드카 인덱스(.csv.idx)에 오프셋 기록 (시간 범위/최신 행 조회용)
+LOG_COLUMNAR = True  # CSV와 함께 컬럼형 바이너리 로그도 기록 (기존 CSV 변환: scripts/convert_csv_to_columnar.py)
+DATA_BACKEND = 'csv'  # 조회 백엔드: 'csv' (일별 CSV) 또는 'sqlite' (CSV와 함께 SQLite에도 기록, 기존 CSV 적재: scripts/load_csv_to_sqlite.py)
+LOG_PARSE_CACHE_BYTES = 32 * 1024 * 1024  # 파싱한 CSV 행(열별 압축 배열)을 메모리에 보관할 최대 크기, 최근 조회 순 (오늘 파일은 늘어난 끝부분만 다시 파싱, 0: 사용 안 함)
+READ_WORKERS = 2  # 긴 기간 조회 시 CSV를 나눠 파싱할 작업 프로세스 수 (1: 현재 프로세스에서 순서대로, 제어 루프 몫으로 코어 하나는 남김)
+READ_PARALLEL_MIN_FILES = 4  # 캐시에 없는 지난 날짜 파일이 이 수 이상일 때만 작업 프로세스 사용
+CATALOG_CHECK_INTERVAL_SEC = 2.0  # 로그/이미지 폴더 목록 캐시의 변경 확인 간격 (inotify_simple 설치 시 이벤트 기반)
+HTTP_CACHE_MAX_AGE_CLOSED = 30 * 24 * 3600  # 지난 날짜만 담은 API 응답/이미지의 브라우저 캐시 시간 (오늘 포함 응답은 매번 ETag 검증)
+HTTP_COMPRESS_MIN_BYTES = 1024  # 이 크기 이상 API 응답만 gzip/brotli 압축 (brotli 패키지 설치 시 br 우선)
+HTTP_PRECOMPRESS_STATIC = True  # 시작 시 web_ui/static의 .gz/.br 사본을 만들어 두고 그대로 전송
+
+# 계층형 기록 (CSV와 별개로 모든 센서 프레임을 기록)
+# - 원본: 2초마다 오는 프레임 전체를 메모리 링 + 일별 바이너리 세그먼트(TIER_DIR/raw)에 저장
+# - 롤업: 구간별 min/max/mean/last + 구동계 ON 비율 (이름: 구간 초)
+RECORDER_TIERS = {'10s': 10, '1m': 60, '10m': 600}
+RECORDER_TIER_CAPACITY = {'10s': 2160, '1m': 1440, '10m': 1008}  # 메모리 보관 구간 수 (6시간, 1일, 7일)
+RECORDER_PERSIST_TIERS = ['1m', '10m']  # 일별 CSV로 저장할 롤업 (TIER_DIR/rollup_<이름>)
+RECORDER_RAW_RING_SIZE = 43200  # 메모리에 보관할 원본 프레임 수 (2초 간격 약 24시간)
+RECORDER_RAW_SEGMENTS = True  # 원본 프레임을 디스크 세그먼트에도 저장
 
 # ==========================================
 # 💾 용량 관리 설정
@@ -122,6 +166,21 @@ CURTAIN_STEPS_CLOSE = int(CURTAIN_STEPS_PER_REVOLUTION * CURTAIN_REVOLUTIONS)  #
 # 7. 📷 카메라 설정
 CAM_INTERVAL_MIN = 30     # 30분 간격
 
+# ==========================================
+# 🌐 웹 대시보드 실행 설정
+# ==========================================
+# 'dev': Flask 개발 서버 (기존 방식)
+# 'wsgi': 운영용 WSGI 서버를 제어 프로세스의 스레드로 실행 (waitress 설치 시 사용)
+# 'process': 웹 서버를 별도 프로세스로 실행, 제어 프로세스와는 로컬 소켓으로 통신 (대시보드 조회가 제어를 지연시키지 않음)
+WEB_SERVER_MODE = 'wsgi'
+WEB_HOST = '0.0.0.0'
+WEB_PORT = 5000
+WEB_THREADS = 4               # 요청 처리 스레드 수 (동시 요청 상한)
+WEB_REQUEST_TIMEOUT_SEC = 30  # 클라이언트 연결 타임아웃 (초)
+WEB_PROCESS_NICE = 5          # 'process' 모드에서 웹 프로세스 우선순위 낮춤 (nice 증가값)
+LIVE_STREAM_MAX_CLIENTS = 2  # /api/stream 동시 연결 한도 (연결마다 작업 스레드 하나 사용, WEB_THREADS보다 작게)
+CONTROL_SOCKET_PATH = os.path.join(BASE_DIR, 'run', 'control.sock')  # 제어 채널 Unix 소켓
+
 # ==========================================
 # 🌐 웹 대시보드 인증 설정
 # ==========================================
@@ -6,7 +6,13 @@ import os
 import config
 from .logger import app_logger
 from .analyzer import StatusAnalyzer
+from .data_reader import create_data_reader
+from .daily_summary import DailySummaryStore, schedule_day_summary, start_backfill, previous_day
 from .discord_notifier import discord_notifier
+from .event_bus import (
+    event_bus, POLICY_COALESCE,
+    TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY,
+)
 
 # 상태 기록 (Global State)
 last_watering_time = 0
@@ -24,6 +30,10 @@ vpd_valve_start_time = 0  # 현재 상태 시작 시간
 vpd_valve_last_set_vpd = None  # 마지막 세트 종료 시점의 VPD 값 (다음 세트 시작 조건 판단용)
 vpd_valve_last_date = None  # 마지막 첫 세트 시작 날짜 (1일 1회 제한용, 세트 반복은 제한 없음)
 
+# 루프 주기: 센서/구동계/비상 정지 이벤트가 오면 즉시 실행, 없어도 최대 1초마다 실행 (시간 기반 제어, DLI 적분)
+AUTOMATION_TICK_SEC = 1.0
+AUTOMATION_MIN_INTERVAL_SEC = 0.2  # 이벤트가 몰려도 이 간격보다 자주 돌지 않음
+
 # DLI 상태 파일 경로
 DLI_STATE_FILE = os.path.join(config.BASE_DIR, 'data', 'dli_state.json')
 
@@ -150,7 +160,7 @@ def update_dli(ppfd, dt_seconds):
     
     return accumulated_dli
 
-def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
+def automation_loop(stop_event, state_store, ser_b, ser_b_lock):
     global last_watering_time, accumulated_dli, last_dli_reset_time
     global watering_count_today, total_water_used_today, curtain_state
     global vpd_valve_control_active, vpd_valve_cycle_count, vpd_valve_state
@@ -175,13 +185,11 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         
         if saved_date == today_str:
             accumulated_dli = saved_dli
-            with state_lock:
-                sys_state['dli'] = saved_dli
+            state_store.update(dli=saved_dli)
             app_logger.info(f"[Auto] 📊 DLI 상태 복원: {saved_dli:.4f} mol/m²/day (날짜: {today_str})")
         else:
             accumulated_dli = 0.0
-            with state_lock:
-                sys_state['dli'] = 0.0
+            state_store.update(dli=0.0)
             if saved_date:
                 app_logger.info(f"[Auto] 📊 DLI 리셋 (새로운 하루: {saved_date} → {today_str})")
             else:
@@ -189,10 +197,19 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
             # 초기화 시 파일에도 저장
             save_dli_state(0.0, today_str)
     
+    # 일별 요약: 시작 시 빠진 날짜를 기존 CSV로 채우고, 이후 자정 리셋마다 전날 요약 기록
+    summary_reader = create_data_reader()
+    summary_store = DailySummaryStore()
+    start_backfill(summary_reader, summary_store)
+    
     last_loop_time = time.time()
     last_day_reset = datetime.now().day
     last_dli_save_time = time.time()  # DLI 저장 시간 추적
     
+    # 토픽별 최신 이벤트 하나만 유지 (깨어나는 용도이므로 개별 이벤트 내용은 불필요)
+    wake_sub = event_bus.subscribe([TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY],
+                                   maxsize=4, policy=POLICY_COALESCE, name='automation')
+    
     while not stop_event.is_set():
         loop_start = time.time()
         dt = loop_start - last_loop_time
@@ -206,6 +223,10 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         
         # 자정에 일일 통계 리셋
         if current_day != last_day_reset:
+            # 리셋 전 전날 값으로 일별 요약 기록 (백그라운드)
+            schedule_day_summary(summary_reader, summary_store, previous_day(today_str),
+                                 watering_count=watering_count_today, water_used=total_water_used_today,
+                                 final_dli=accumulated_dli)
             watering_count_today = 0
             total_water_used_today = 0.0
             last_day_reset = current_day
@@ -213,45 +234,39 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
             accumulated_dli = 0.0
             last_dli_reset_time = time.time()
             save_dli_state(0.0, today_str)  # 리셋된 상태 저장
-            # sys_state에도 리셋 반영
-            with state_lock:
-                sys_state['watering_count_today'] = 0
-                sys_state['water_used_today'] = 0.0
-                sys_state['dli'] = 0.0
+            # 상태 저장소에도 리셋 반영
+            state_store.update(watering_count_today=0, water_used_today=0.0, dli=0.0)
             app_logger.info("[Auto] 📊 일일 통계 리셋 (새로운 하루 시작)")
         
-        # sys_state에서 값 가져오기 (없으면 안전한 기본값)
-        with state_lock:
-            curr_soil = sys_state.get('soil_pct', 100)  # 기본값 100(습함)으로 두어 오작동 방지
-            curr_temp = sys_state.get('temp', 0)
-            curr_hum = sys_state.get('hum', 0)
-            curr_lux = sys_state.get('lux', 0)
-            curr_vpd = sys_state.get('vpd', 0.0)
-            current_valve = sys_state.get('valve_status', 'OFF')
-            current_fan = sys_state.get('fan_status', 'OFF')
-            current_led_w = sys_state.get('led_w_status', 'OFF')
-            current_led_p = sys_state.get('led_p_status', 'OFF')
-            emergency_stop = sys_state.get('emergency_stop', False)  # 비상 정지 상태
+        # 한 스냅샷에서 값 가져오기 (락 없음, 없으면 안전한 기본값)
+        snap = state_store.snapshot()
+        curr_soil = snap.get('soil_pct', 100)  # 기본값 100(습함)으로 두어 오작동 방지
+        curr_temp = snap.get('temp', 0)
+        curr_hum = snap.get('hum', 0)
+        curr_lux = snap.get('lux', 0)
+        curr_vpd = snap.get('vpd', 0.0)
+        current_valve = snap.get('valve_status', 'OFF')
+        current_fan = snap.get('fan_status', 'OFF')
+        current_led_w = snap.get('led_w_status', 'OFF')
+        current_led_p = snap.get('led_p_status', 'OFF')
+        emergency_stop = snap.get('emergency_stop', False)  # 비상 정지 상태
         
         # VPD 재계산 (센서값이 유효한 경우)
         if curr_temp > 0 and 0 < curr_hum <= 100:
             calculated_vpd = calculate_vpd(curr_temp, curr_hum)
             if calculated_vpd > 0:
                 curr_vpd = calculated_vpd
-                with state_lock:
-                    sys_state['vpd'] = calculated_vpd
+                state_store.update(vpd=calculated_vpd)
         
         # DLI 업데이트
         if curr_lux > 0:
             ppfd = calculate_ppfd_from_lux(curr_lux)
             dli = update_dli(ppfd, dt)
-            with state_lock:
-                sys_state['dli'] = dli
+            state_store.update(dli=dli)
         else:
             # 조도가 0이어도 기존 DLI 값은 유지 (update_dli 함수가 파일에서 복원함)
-            with state_lock:
-                if 'dli' not in sys_state:
-                    sys_state['dli'] = accumulated_dli
+            if 'dli' not in state_store.snapshot():
+                state_store.update(dli=accumulated_dli)
         
         # DLI 상태 파일에 주기적으로 저장 (5분마다)
         if loop_start - last_dli_save_time >= 300:  # 5분마다 저장
@@ -271,7 +286,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         #             'Soil_Pct': curr_soil,
         #             'Lux': curr_lux,
         #             'VPD_kPa': curr_vpd,
-        #             'DLI_mol': sys_state.get('dli', 0.0),
+        #             'DLI_mol': snap.get('dli', 0.0),
         #             'Fan_Status': current_fan,
         #             'LED_W_Status': current_led_w,
         #             'LED_P_Status': current_led_p,
@@ -281,12 +296,12 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         #         }
         #         
         #         # 디버깅: 전달되는 데이터 확인 (항상 로그 출력)
-        #         app_logger.info(f"[Auto] 📊 Discord 알림 생성 - 전달되는 센서 데이터: Temp={curr_temp:.1f}°C, Hum={curr_hum:.1f}%, Soil={curr_soil}%, Lux={curr_lux}, VPD={curr_vpd:.2f}kPa, DLI={sys_state.get('dli', 0.0):.4f}")
+        #         app_logger.info(f"[Auto] 📊 Discord 알림 생성 - 전달되는 센서 데이터: Temp={curr_temp:.1f}°C, Hum={curr_hum:.1f}%, Soil={curr_soil}%, Lux={curr_lux}, VPD={curr_vpd:.2f}kPa, DLI={snap.get('dli', 0.0):.4f}")
         #         
         #         # 디버깅: 0.0 값이 있는지 체크
         #         if curr_temp == 0.0 or curr_hum == 0.0 or curr_lux == 0.0:
         #             app_logger.warning(f"[Auto] ⚠️ 센서 데이터가 0.0입니다: Temp={curr_temp}, Hum={curr_hum}, Lux={curr_lux}, Soil={curr_soil}, VPD={curr_vpd}")
-        #             app_logger.warning(f"[Auto] sys_state 내용: {dict(sys_state)}")
+        #             app_logger.warning(f"[Auto] 상태 스냅샷 내용: {snap.to_dict()}")
         #         
         #         # 상태 분석
         #         alerts = analyzer.analyze_current_status(current_status)
@@ -335,7 +350,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         
         if not emergency_stop:
             current_time = time.time()
-            current_vpd_check = curr_vpd  # 이미 읽은 curr_vpd 사용 (state_lock 최소화)
+            current_vpd_check = curr_vpd  # 이미 읽은 curr_vpd 사용 (스냅샷 재사용)
             
             # 첫 세트 시작 조건: VPD > 2.0이고 제어가 비활성화되어 있고 idle 상태
             # 1일 1회 제한 체크 (첫 세트만 적용)
@@ -381,10 +396,9 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                     
                     # 밸브 켜기
                     if send_cmd(ser_b, ser_b_lock, "M1", caller_info="[Auto] VPD 밸브 제어"):
-                        with state_lock:
-                            sys_state['valve_status'] = 'ON'
+                        state_store.update(valve_status='ON')
                         
-                        # Discord 알림: 밸브 켜기 (state_lock 밖에서 실행)
+                        # Discord 알림: 밸브 켜기 (상태 갱신 후 실행)
                         discord_notifier.send_message(
                             title="🌊 VPD 밸브 제어 시작",
                             message=f"VPD가 {current_vpd_check:.2f} kPa로 높아 밸브를 켭니다.\n"
@@ -412,10 +426,9 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                     if elapsed >= config.VALVE_ON_DURATION:
                         # 밸브 끄기
                         if send_cmd(ser_b, ser_b_lock, "M1", caller_info="[Auto] VPD 밸브 제어"):
-                            with state_lock:
-                                sys_state['valve_status'] = 'OFF'
+                            state_store.update(valve_status='OFF')
                             
-                            # Discord 알림: 밸브 끄기 (state_lock 밖에서 실행)
+                            # Discord 알림: 밸브 끄기 (상태 갱신 후 실행)
                             # [주석 처리] 세트 시작/종료 알림만 유지
                             # discord_notifier.send_message(
                             #     title="🌊 VPD 밸브 제어 - 밸브 OFF",
@@ -434,8 +447,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                             vpd_valve_start_time = current_time
                         else:
                             app_logger.error(f"[Auto] ❌ VPD 밸브 끄기 실패!")
-                            with state_lock:
-                                sys_state['valve_status'] = 'OFF'
+                            state_store.update(valve_status='OFF')
                             vpd_valve_control_active = False
                             vpd_valve_state = 'idle'
                 
@@ -449,7 +461,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                             vpd_valve_last_set_vpd = current_vpd_check  # 세트 종료 시점의 VPD 저장
                             app_logger.info(f"[Auto] 🌊 VPD 밸브 제어 세트 완료: {config.VPD_VALVE_CYCLES_PER_SET} 사이클 완료, 종료 VPD={vpd_valve_last_set_vpd:.2f} kPa")
                             
-                            # Discord 알림: 세트 완료 (state_lock 밖에서 실행)
+                            # Discord 알림: 세트 완료 (상태 갱신 후 실행)
                             discord_notifier.send_message(
                                 title="🌊 VPD 밸브 제어 세트 완료",
                                 message=f"{config.VPD_VALVE_CYCLES_PER_SET} 사이클을 완료하여 세트를 종료합니다.\n"
@@ -470,10 +482,9 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                             
                             # 밸브 켜기
                             if send_cmd(ser_b, ser_b_lock, "M1", caller_info="[Auto] VPD 밸브 제어"):
-                                with state_lock:
-                                    sys_state['valve_status'] = 'ON'
+                                state_store.update(valve_status='ON')
                                 
-                                # Discord 알림: 다음 사이클 시작 (state_lock 밖에서 실행)
+                                # Discord 알림: 다음 사이클 시작 (상태 갱신 후 실행)
                                 # [주석 처리] 세트 시작/종료 알림만 유지
                                 # discord_notifier.send_message(
                                 #     title="🌊 VPD 밸브 제어 - 다음 사이클",
@@ -497,14 +508,11 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                 vpd_valve_state = 'idle'
                 app_logger.info(f"[Auto] 🌊 VPD 밸브 제어 중단: VPD={curr_vpd:.2f} <= {config.VPD_VALVE_THRESHOLD} (안전장치)")
                 
-                # 밸브가 켜져있으면 끄기 (state_lock 최소 사용)
-                valve_status = None
-                with state_lock:
-                    valve_status = sys_state.get('valve_status', 'OFF')
+                # 밸브가 켜져있으면 끄기
+                valve_status = state_store.get('valve_status', 'OFF')
                 if valve_status == 'ON':
                     if send_cmd(ser_b, ser_b_lock, "M1", caller_info="[Auto] VPD 밸브 제어 중단"):
-                        with state_lock:
-                            sys_state['valve_status'] = 'OFF'
+                        state_store.update(valve_status='OFF')
                         app_logger.info(f"[Auto] 🌊 밸브 OFF (VPD 임계값 이하로 인한 중단)")
         
         # -------------------------------------------------------
@@ -552,16 +560,14 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         #         
         #         # [안전한 급수 시퀀스]
         #         if send_cmd(ser_b, ser_b_lock, "M1"):  # 밸브 ON
-        #             with state_lock:
-        #                 sys_state['valve_status'] = 'ON'
+        #             state_store.update(valve_status='ON')
         #             
         #             # 설정된 시간만큼 대기 (물 주는 중)
         #             time.sleep(config.WATERING_DURATION)
         #             
         #             # 밸브 OFF (반드시 꺼야 함!)
         #             if send_cmd(ser_b, ser_b_lock, "M1"):  # 밸브 OFF (토글)
-        #                 with state_lock:
-        #                     sys_state['valve_status'] = 'OFF'
+        #                 state_store.update(valve_status='OFF')
         #                 
         #                 last_watering_time = time.time()
         #                 # 급수량 계산 (점적스파이크 총 8개: 상추 5개 + 딸기 3개)
@@ -570,18 +576,18 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         #                 watering_count_today += 1
         #                 total_water_used_today += water_amount
         #                 
-        #                 # sys_state에 통계값 저장 (로그 기록용)
-        #                 with state_lock:
-        #                     sys_state['watering_count_today'] = watering_count_today
-        #                     sys_state['water_used_today'] = total_water_used_today
+        #                 # 상태 저장소에 통계값 저장 (로그 기록용)
+        #                 state_store.update(
+        #                     watering_count_today=watering_count_today,
+        #                     water_used_today=total_water_used_today,
+        #                 )
         #                 
         #                 # 고급 기능: 물주기 효율성 모니터링
         #                 efficiency_info = f"오늘 {watering_count_today}회, 총 {total_water_used_today:.2f}L 사용"
         #                 app_logger.info(f"[Auto] ✅ 급수 완료: {water_amount:.2f}L | {efficiency_info} | 다음 급수까지 {config.WATER_COOLDOWN}초 대기")
         #             else:
         #                 app_logger.error(f"[Auto] ❌ 밸브 OFF 명령 실패! 수동 확인 필요")
-        #                 with state_lock:
-        #                     sys_state['valve_status'] = 'OFF'
+        #                 state_store.update(valve_status='OFF')
         #         else:
         #             app_logger.error(f"[Auto] ❌ 밸브 ON 명령 실패! 급수 취소")
         
@@ -590,8 +596,9 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
         # -------------------------------------------------------
         # 수동 제어 플래그 확인 (웹 UI에서 수동 제어한 경우 자동 제어 건너뛰기)
         current_time = time.time()
-        led_w_manual_override = sys_state.get('led_w_manual_override', 0)
-        led_p_manual_override = sys_state.get('led_p_manual_override', 0)
+        snap = state_store.snapshot()
+        led_w_manual_override = snap.get('led_w_manual_override', 0)
+        led_p_manual_override = snap.get('led_p_manual_override', 0)
         led_w_manual_active = current_time < led_w_manual_override
         led_p_manual_active = current_time < led_p_manual_override
         
@@ -604,9 +611,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                     # White LED 페이드 인 (10분 동안 서서히 밝아짐)
                     if send_cmd(ser_b, ser_b_lock, "LED_FADE_ON", caller_info="[Auto] LED 자동 켜기"):
                         app_logger.info(f"[Auto] 💡 화이트 LED 페이드 인 시작: 자동 켜기 시간 ({config.LED_ON_HOUR}시, 10분 동안 서서히 밝아짐)")
-                        with state_lock:
-                            sys_state['led_w_status'] = 'ON'
-                            sys_state['led_w_brightness_pct'] = 100.0
+                        state_store.update(led_w_status='ON', led_w_brightness_pct=100.0)
                     else:
                         app_logger.warning(f"[Auto] 화이트 LED 페이드 인 시작 실패")
                 
@@ -614,9 +619,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                 if current_led_w == 'ON' and current_led_p == 'OFF' and not led_p_manual_active and config.LED_PURPLE_BOOST:
                     if send_cmd(ser_b, ser_b_lock, "PURPLE_FADE_ON", caller_info="[Auto] LED 자동 켜기"):
                         app_logger.info(f"[Auto] 💜 보라색 LED 페이드 인 시작: 화이트 LED와 함께 켜기")
-                        with state_lock:
-                            sys_state['led_p_status'] = 'ON'
-                            sys_state['led_p_brightness_pct'] = 100.0
+                        state_store.update(led_p_status='ON', led_p_brightness_pct=100.0)
                     else:
                         app_logger.warning(f"[Auto] 보라색 LED 페이드 인 시작 실패")
             else:
@@ -626,9 +629,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                     # White LED 페이드 아웃 (10분 동안 서서히 꺼짐)
                     if send_cmd(ser_b, ser_b_lock, "LED_FADE_OFF", caller_info="[Auto] LED 자동 끄기"):
                         app_logger.info(f"[Auto] 💡 화이트 LED 페이드 아웃 시작: 자동 끄기 시간 ({config.LED_OFF_HOUR}시, 10분 동안 서서히 꺼짐)")
-                        with state_lock:
-                            sys_state['led_w_status'] = 'OFF'
-                            sys_state['led_w_brightness_pct'] = 0.0
+                        state_store.update(led_w_status='OFF', led_w_brightness_pct=0.0)
                     else:
                         app_logger.warning(f"[Auto] 화이트 LED 페이드 아웃 시작 실패")
                 elif current_led_w == 'ON' and led_w_manual_active:
@@ -639,9 +640,7 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                 if current_led_p == 'ON' and not led_p_manual_active:
                     if send_cmd(ser_b, ser_b_lock, "PURPLE_FADE_OFF", caller_info="[Auto] LED 자동 끄기"):
                         app_logger.info(f"[Auto] 💜 보라색 LED 페이드 아웃 시작: 화이트 LED 종료와 동시에 끄기")
-                        with state_lock:
-                            sys_state['led_p_status'] = 'OFF'
-                            sys_state['led_p_brightness_pct'] = 0.0
+                        state_store.update(led_p_status='OFF', led_p_brightness_pct=0.0)
                     else:
                         app_logger.warning(f"[Auto] 보라색 LED 페이드 아웃 시작 실패")
                 elif current_led_p == 'ON' and led_p_manual_active:
@@ -674,15 +673,13 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
             if fan_should_be_on and current_fan == 'OFF':
                 if send_cmd(ser_b, ser_b_lock, "FAN_ON"):
                     app_logger.info(f"[Auto] 🌬️ 팬 작동: {fan_reason}")
-                    with state_lock:
-                        sys_state['fan_status'] = 'ON'
+                    state_store.update(fan_status='ON')
                 else:
                     app_logger.warning(f"[Auto] 팬 켜기 명령 실패: {fan_reason}")
             elif not fan_should_be_on and current_fan == 'ON':
                 if send_cmd(ser_b, ser_b_lock, "FAN_OFF"):
                     app_logger.info(f"[Auto] 🌬️ 팬 정지: {fan_reason}")
-                    with state_lock:
-                        sys_state['fan_status'] = 'OFF'
+                    state_store.update(fan_status='OFF')
                 else:
                     app_logger.warning(f"[Auto] 팬 끄기 명령 실패")
         
@@ -716,13 +713,17 @@ def automation_loop(stop_event, sys_state, ser_b, ser_b_lock, state_lock):
                 if send_cmd(ser_b, ser_b_lock, cmd):
                     curtain_state = target_curtain_state
                     app_logger.info(f"[Auto] 🪟 커튼 {target_curtain_state}: {reason} (스텝: {steps})")
-                    with state_lock:
-                        sys_state['curtain_status'] = target_curtain_state
+                    state_store.update(curtain_status=target_curtain_state)
                 else:
                     app_logger.warning(f"[Auto] 🪟 커튼 제어 명령 실패: {cmd}")
         
-        # CPU 과부하 방지 (1초 휴식)
-        time.sleep(1)
+        # 다음 이벤트까지 대기 (최소 간격 유지, 최대 AUTOMATION_TICK_SEC)
+        elapsed = time.time() - loop_start
+        if elapsed < AUTOMATION_MIN_INTERVAL_SEC:
+            stop_event.wait(AUTOMATION_MIN_INTERVAL_SEC - elapsed)
+        wake_sub.drain(timeout=AUTOMATION_TICK_SEC)
+    
+    wake_sub.close()
 
 def send_cmd(ser, lock, cmd, caller_info="Unknown"):
     """
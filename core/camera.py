@@ -7,7 +7,7 @@ import config as cfg
 from .logger import app_logger, get_image_path
 
 class CameraThread(threading.Thread):
-    def __init__(self, sys_state=None, state_lock=None, ser_b=None, ser_b_lock=None):
+    def __init__(self, state_store=None, ser_b=None, ser_b_lock=None):
         threading.Thread.__init__(self)
         self.running = True
         
@@ -16,9 +16,9 @@ class CameraThread(threading.Thread):
         
         # 상태 변수
         self.force_capture = False  # 수동 촬영 플래그
+        self._wake = threading.Event()  # 수동 촬영/종료 요청 시 대기 중인 루프를 즉시 깨움
         self.last_auto_time = time.time() # 시작하자마자 자동 촬영 되는 것 방지
-        self.sys_state = sys_state  # 시스템 상태 (조도 확인용)
-        self.state_lock = state_lock  # 상태 락
+        self.state_store = state_store  # 시스템 상태 저장소 (조도 확인용)
         self.ser_b = ser_b  # 시리얼 포트 (LED 제어용)
         self.ser_b_lock = ser_b_lock  # 시리얼 락
         
@@ -30,20 +30,20 @@ class CameraThread(threading.Thread):
     def trigger_manual_capture(self):
         """ 메인 스레드에서 수동 촬영 요청 시 호출 """
         self.force_capture = True
+        self._wake.set()
         app_logger.info("[Cam] 수동 촬영 플래그 설정됨 (대기중...)")
 
     def capture_image(self, tag="Auto"):
         """ 실제 사진을 찍는 함수 (tag: Auto 또는 User) """
         # 자동 촬영인 경우 조도 확인 (100 lux 이하이면 촬영하지 않음)
         if tag == "Auto":
-            if self.sys_state and self.state_lock:
-                with self.state_lock:
-                    current_lux = self.sys_state.get('lux', 0)
+            if self.state_store:
+                current_lux = self.state_store.get('lux', 0)
                 if current_lux <= 100:
                     app_logger.info(f"[Cam] ⚠️ 조도가 낮아 자동 촬영 건너뜀 (조도: {current_lux} Lux <= 100 Lux)")
                     return
             else:
-                app_logger.warning("[Cam] ⚠️ sys_state가 설정되지 않아 조도 확인 불가, 촬영 진행")
+                app_logger.warning("[Cam] ⚠️ 상태 저장소가 설정되지 않아 조도 확인 불가, 촬영 진행")
         
         # 수동 촬영은 LED 자동 제어 없이 단순히 촬영만 수행 (LED는 사용자가 직접 제어)
         
@@ -92,18 +92,29 @@ class CameraThread(threading.Thread):
                 if (now.minute == 0 or now.minute == 30):
                     if time.time() - self.last_auto_time > 60:
                         # 조도 확인 (100 lux 이하이면 촬영하지 않음)
-                        # sys_state는 외부에서 주입받아야 하므로, 
+                        # 상태 저장소는 외부에서 주입받아야 하므로, 
                         # 조도 확인은 capture_image 함수 내부에서 처리
                         app_logger.info("[Cam] ⏰ 정기 촬영 시간 도달")
                         self.capture_image("Auto")
                         self.last_auto_time = time.time()
 
-                time.sleep(0.5)  # CPU 점유율 방지
+                # 다음 정기 촬영 시각(00분/30분)까지 대기 (수동 촬영/종료 요청 시 즉시 깨어남)
+                self._wake.wait(self._seconds_until_next_slot())
+                self._wake.clear()
 
             except Exception as e:
                 app_logger.error(f"[Cam] 스레드 루프 에러: {e}")
                 time.sleep(1)
 
+    def _seconds_until_next_slot(self):
+        """다음 정기 촬영 시각(매시 00분/30분)까지 남은 시간 (초)"""
+        now = datetime.now()
+        if now.minute in (0, 30) and time.time() - self.last_auto_time > 60:
+            return 0.5  # 촬영 구간 안인데 아직 촬영 전 (조건 재확인)
+        elapsed = (now.minute % 30) * 60 + now.second + now.microsecond / 1e6
+        return max(0.5, 30 * 60 - elapsed)
+
     def stop(self):
         self.running = False
+        self._wake.set()
         self.join()
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+로그/이미지 폴더 목록 캐시 (카탈로그)
+- 루트 폴더(LOG_DIR, IMG_DIR) 아래 1단계 하위 폴더(YYYY-MM, manual)를 한 번 스캔해 날짜별 파일 목록을 메모리에 보관
+- 이후에는 바뀐 하위 폴더만 다시 스캔
+  · inotify_simple이 있으면 커널 이벤트로 바뀐 폴더만 표시
+  · 없으면 루트/하위 폴더 mtime만 확인 (파일 추가·삭제 시 폴더 mtime이 바뀜)
+- 요청마다 SD카드 전체를 glob 하지 않도록 DataReader와 이미지 API가 사용
+- 파일 크기/mtime은 마지막 스캔 시점 값 (기록 중인 오늘 파일은 실제보다 작을 수 있음)
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .logger import app_logger
+
+# inotify는 선택적 (리눅스 + inotify_simple 설치 시에만)
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+# 폴더 mtime 확인 최소 간격 (초). 그 사이 요청은 메모리 목록만 사용
+DEFAULT_CHECK_INTERVAL = 2.0
+# mtime 해상도가 낮은 파일시스템 대비: 스캔 직전 이 시간 안에 바뀐 폴더는 다음 확인 때 다시 스캔
+MTIME_SLACK_SEC = 2.0
+
+LOG_FILE_RE = re.compile(r'^smartfarm_log_(\d{4}-\d{2}-\d{2})\.csv$')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class FileEntry(NamedTuple):
+    path: str
+    name: str
+    subdir: str
+    key: str
+    size: int
+    mtime: float
+
+
+def log_file_key(name: str) -> Optional[str]:
+    """smartfarm_log_YYYY-MM-DD.csv → 'YYYY-MM-DD' (형식이 다르면 None)"""
+    m = LOG_FILE_RE.match(name)
+    if not m:
+        return None
+    return _valid_date(m.group(1))
+
+
+def image_file_key(name: str) -> Optional[str]:
+    """YYYY-MM-DD_HH-MM-SS_<태그>.jpg → 'YYYY-MM-DD' (이미지가 아니면 None)"""
+    if not name.lower().endswith(IMAGE_EXTENSIONS):
+        return None
+    return _valid_date(name[:10])
+
+
+def _valid_date(text: str) -> Optional[str]:
+    try:
+        datetime.strptime(text, '%Y-%m-%d')
+    except ValueError:
+        return None
+    return text
+
+
+class DirectoryCatalog:
+    """
+    루트 폴더 아래 하위 폴더별 파일 목록 캐시
+    - key_fn(파일명) → 날짜 키 (None이면 제외)
+    - 조회 메서드는 필요하면 refresh()를 먼저 수행 (check_interval로 횟수 제한)
+    """
+
+    def __init__(self, root: str, key_fn: Callable[[str], Optional[str]],
+                 check_interval: float = DEFAULT_CHECK_INTERVAL, use_inotify: bool = True):
+        self.root = root
+        self.key_fn = key_fn
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, tuple] = {}           # 하위 폴더 → (mtime, 스캔 시각, [FileEntry])
+        self._by_key: Dict[str, List[FileEntry]] = {}
+        self._keys: List[str] = []                  # 오름차순
+        self._root_mtime = None
+        self._last_check = 0.0
+        self._scans = 0
+        self._inotify = None
+        self._watches: Dict[int, Optional[str]] = {}  # wd → 하위 폴더 (루트는 None)
+        self._use_inotify = use_inotify and INOTIFY_AVAILABLE
+
+    # --- 조회 ---
+
+    def keys(self, reverse: bool = False) -> List[str]:
+        """날짜 키 목록 (정렬됨)"""
+        self.refresh()
+        with self._lock:
+            return list(reversed(self._keys)) if reverse else list(self._keys)
+
+    def files(self, key: str) -> List[FileEntry]:
+        """해당 날짜의 파일 목록 (파일명 순)"""
+        self.refresh()
+        with self._lock:
+            return list(self._by_key.get(key, ()))
+
+    def latest(self, subdir: Optional[str] = None) -> Optional[FileEntry]:
+        """가장 최근(mtime) 파일 (subdir 지정 시 해당 폴더 안에서만)"""
+        self.refresh()
+        with self._lock:
+            if subdir is not None:
+                entries = self._dirs.get(subdir, (0, 0, []))[2]
+                return max(entries, key=lambda e: e.mtime) if entries else None
+            best = None
+            for _, _, entries in self._dirs.values():
+                for entry in entries:
+                    if best is None or entry.mtime > best.mtime:
+                        best = entry
+            return best
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'root': self.root,
+                'dirs': len(self._dirs),
+                'keys': len(self._keys),
+                'files': sum(len(v[2]) for v in self._dirs.values()),
+                'scans': self._scans,
+                'inotify': self._inotify is not None,
+            }
+
+    # --- 갱신 ---
+
+    def refresh(self, force: bool = False) -> None:
+        """바뀐 하위 폴더만 다시 스캔 (force: 확인 간격 무시)"""
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            if self._inotify is not None and not force:
+                dirs = self._pending_inotify()
+                if dirs is not None:
+                    for subdir in dirs:
+                        self._rescan_dir(subdir)
+                    return
+            self._check_mtimes(now)
+
+    def _check_mtimes(self, now: float) -> None:
+        try:
+            root_mtime = os.stat(self.root).st_mtime
+        except OSError:
+            # 루트가 없으면 (정리로 삭제 등) 빈 목록
+            self._dirs.clear()
+            self._rebuild_keys()
+            self._root_mtime = None
+            return
+
+        if root_mtime != self._root_mtime or now - root_mtime < MTIME_SLACK_SEC:
+            # 하위 폴더가 추가/삭제됨
+            try:
+                subdirs = {e.name for e in os.scandir(self.root) if e.is_dir()}
+            except OSError:
+                subdirs = set()
+            for gone in set(self._dirs) - subdirs:
+                del self._dirs[gone]
+            for subdir in subdirs - set(self._dirs):
+                self._dirs[subdir] = (None, 0.0, [])
+            self._root_mtime = root_mtime
+            if self._inotify is None and self._use_inotify:
+                self._start_inotify(subdirs)
+
+        changed = False
+        for subdir, (mtime, scanned_at, _) in list(self._dirs.items()):
+            try:
+                current = os.stat(os.path.join(self.root, subdir)).st_mtime
+            except OSError:
+                del self._dirs[subdir]
+                changed = True
+                continue
+            if current != mtime or scanned_at - current < MTIME_SLACK_SEC:
+                self._scan_dir(subdir, current, now)
+                changed = True
+        if changed:
+            self._rebuild_keys()
+
+    def _rescan_dir(self, subdir: Optional[str]) -> None:
+        """inotify 이벤트로 표시된 폴더 다시 스캔 (None: 루트 - 하위 폴더 추가/삭제)"""
+        if subdir is None:
+            self._root_mtime = None
+            self._check_mtimes(time.time())
+            return
+        path = os.path.join(self.root, subdir)
+        if os.path.isdir(path):
+            self._scan_dir(subdir, os.stat(path).st_mtime, time.time())
+        else:
+            self._dirs.pop(subdir, None)
+        self._rebuild_keys()
+
+    def _scan_dir(self, subdir: str, mtime: float, now: float) -> None:
+        entries = []
+        try:
+            for e in os.scandir(os.path.join(self.root, subdir)):
+                if not e.is_file():
+                    continue
+                key = self.key_fn(e.name)
+                if key is None:
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append(FileEntry(e.path, e.name, subdir, key, st.st_size, st.st_mtime))
+        except OSError:
+            pass
+        self._dirs[subdir] = (mtime, now, entries)
+        self._scans += 1
+
+    def _rebuild_keys(self) -> None:
+        by_key: Dict[str, List[FileEntry]] = {}
+        for _, _, entries in self._dirs.values():
+            for entry in entries:
+                by_key.setdefault(entry.key, []).append(entry)
+        for entries in by_key.values():
+            entries.sort(key=lambda e: e.name)
+        self._by_key = by_key
+        self._keys = sorted(by_key)
+
+    # --- inotify ---
+
+    def _start_inotify(self, subdirs) -> None:
+        try:
+            self._inotify = INotify()
+            self._watches = {}
+            self._add_watch(None)
+            for subdir in subdirs:
+                self._add_watch(subdir)
+            app_logger.info(f"[Catalog] 👀 inotify 감시 시작: {self.root} ({len(subdirs)}개 폴더)")
+        except OSError as e:
+            app_logger.warning(f"[Catalog] inotify 사용 불가, mtime 확인으로 대체: {e}")
+            self._inotify = None
+            self._use_inotify = False
+
+    def _add_watch(self, subdir: Optional[str]) -> None:
+        path = self.root if subdir is None else os.path.join(self.root, subdir)
+        mask = (inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MOVED_FROM |
+                inotify_flags.MOVED_TO | inotify_flags.CLOSE_WRITE | inotify_flags.DELETE_SELF)
+        wd = self._inotify.add_watch(path, mask)
+        self._watches[wd] = subdir
+
+    def _pending_inotify(self):
+        """
+        쌓인 이벤트로 다시 스캔할 폴더 목록 (None이면 이벤트 유실 → mtime 확인으로 대체)
+        """
+        try:
+            events = self._inotify.read(timeout=0)
+        except OSError:
+            return None
+        dirs = set()
+        for event in events:
+            if event.mask & inotify_flags.Q_OVERFLOW:
+                return None
+            subdir = self._watches.get(event.wd)
+            if subdir is None and event.mask & inotify_flags.ISDIR:
+                # 새 월별 폴더: 감시 추가 후 루트 다시 확인
+                if event.mask & (inotify_flags.CREATE | inotify_flags.MOVED_TO):
+                    try:
+                        self._add_watch(event.name)
+                    except OSError:
+                        pass
+                dirs.add(None)
+            elif event.wd in self._watches:
+                dirs.add(subdir)
+        return dirs
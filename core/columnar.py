@@ -0,0 +1,412 @@
+"""
+컬럼형 바이너리 로그 (일별 CSV와 함께 기록)
+- 하루 = 폴더 하나, 필드마다 고정 길이 바이너리 파일 하나 (COLUMNAR_DIR/YYYY-MM/YYYY-MM-DD/<필드>.col)
+- Timestamp: int64 epoch 초, 숫자: float64/int32, 상태(ON/OFF/OPEN/CLOSED): 사전 인코딩 uint8
+- 행 추가는 각 파일 끝에 덧붙이기만 하므로 로거가 배치 단위로 바로 기록 가능
+- 읽기: numpy가 있으면 memmap, 없으면 array.fromfile. 시간 범위는 Timestamp 이진 탐색 후 슬라이스
+- 하루 중간에 켜졌거나 배치 기록이 실패한 날은 CSV보다 행이 적음 → covers()로 행 수를 비교해
+  CSV와 다르면 읽는 쪽이 CSV로 대체 (일부 행이 조용히 빠지지 않도록)
+"""
+import json
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import config
+from .logger import app_logger, CSV_HEADER
+from .csv_index import count_rows, parse_ts
+
+# numpy는 선택적 (없으면 array 모듈 사용)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 필드별 저장 형식 (array typecode). 상태 필드는 사전 인코딩 코드(uint8)
+KIND_TIME = 'time'
+KIND_FLOAT = 'float'
+KIND_INT = 'int'
+KIND_BOOL = 'bool'
+KIND_STATUS = 'status'
+
+SCHEMA = {
+    'Timestamp': KIND_TIME,
+    'Temp_C': KIND_FLOAT, 'Hum_Pct': KIND_FLOAT, 'Soil_Raw': KIND_INT, 'Soil_Pct': KIND_INT, 'Lux': KIND_INT,
+    'VPD_kPa': KIND_FLOAT, 'DLI_mol': KIND_FLOAT,
+    'Valve_Status': KIND_STATUS, 'Fan_Status': KIND_STATUS, 'LED_W_Status': KIND_STATUS,
+    'LED_P_Status': KIND_STATUS, 'Curtain_Status': KIND_STATUS,
+    'Fan_Speed_Pct': KIND_FLOAT, 'LED_W_Brightness_Pct': KIND_FLOAT, 'LED_P_Brightness_Pct': KIND_FLOAT,
+    'Emergency_Stop': KIND_BOOL,
+    'Watering_Count_Today': KIND_INT, 'Water_Used_Today_L': KIND_FLOAT,
+}
+
+TYPECODES = {KIND_TIME: 'q', KIND_FLOAT: 'd', KIND_INT: 'i', KIND_BOOL: 'B', KIND_STATUS: 'B'}
+NUMPY_DTYPES = {KIND_TIME: '<i8', KIND_FLOAT: '<f8', KIND_INT: '<i4', KIND_BOOL: 'u1', KIND_STATUS: 'u1'}
+
+# 상태 사전 기본값 (코드 = 목록 인덱스). 새 값은 그날의 사전 파일에 추가됨
+DEFAULT_STATUS_VALUES = ['OFF', 'ON', 'CLOSED', 'OPEN']
+DICT_FILE = '_dict.json'
+COLUMN_EXT = '.col'
+# 날짜 폴더 → ((CSV 크기, CSV mtime, Timestamp 열 크기), CSV와 행 수가 같은지)
+_coverage: Dict[str, tuple] = {}
+MAX_COVERAGE_ENTRIES = 1000
+
+
+def day_dir(date_str: str) -> str:
+    return os.path.join(config.COLUMNAR_DIR, date_str[:7], date_str)
+
+
+def _parse_ts(value) -> int:
+    """'YYYY-MM-DD HH:MM:SS' → epoch 초 (로컬 시간, core.csv_index.parse_ts 빠른 경로)"""
+    return parse_ts(str(value))
+
+
+def _parse_value(kind: str, value):
+    if kind == KIND_FLOAT:
+        return float(value) if value not in (None, '') else float('nan')
+    if kind == KIND_INT:
+        return int(float(value)) if value not in (None, '') else 0
+    if kind == KIND_BOOL:
+        return 1 if str(value).strip().lower() in ('true', '1') else 0
+    raise ValueError(kind)
+
+
+def typed_value(kind: str, value):
+    """CSV 문자열 → 스키마 형식의 파이썬 값 (JSON 응답용, 빈 값은 None)"""
+    if kind == KIND_STATUS or kind == KIND_TIME:
+        return value or ''
+    if kind == KIND_BOOL:
+        return str(value).strip().lower() in ('true', '1')
+    if value in (None, ''):
+        return None
+    try:
+        if kind == KIND_INT:
+            return int(float(value))
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def typed_row(row: Dict, fields: Optional[List[str]] = None) -> Dict:
+    """CSV 행 딕셔너리 → 스키마대로 변환한 딕셔너리 (내부 필드 '_' 제외, 스키마 밖 필드는 문자열)"""
+    result = {}
+    for key in (fields or row.keys()):
+        if key.startswith('_'):
+            continue
+        value = row.get(key)
+        kind = SCHEMA.get(key)
+        result[key] = typed_value(kind, value) if kind else ('' if value is None else str(value))
+    return result
+
+
+SCHEMA_JSON_TYPES = {KIND_TIME: 'string', KIND_FLOAT: 'number', KIND_INT: 'integer',
+                     KIND_BOOL: 'boolean', KIND_STATUS: 'string'}
+
+
+class ColumnarLogWriter:
+    """
+    컬럼형 일별 로그 기록기 (CsvLogWriter와 같은 행 목록을 입력으로 받음)
+    - 열린 날짜의 컬럼 파일 핸들을 유지하고 날짜가 바뀔 때만 교체
+    """
+
+    def __init__(self, header: Optional[List[str]] = None):
+        self.header = list(header or CSV_HEADER)
+        self.kinds = [SCHEMA.get(name, KIND_FLOAT) for name in self.header]
+        self._date = None
+        self._files = None
+        self._dicts: Dict[str, List[str]] = {}
+        self.rows_written = 0
+        self.rows_skipped = 0
+
+    def _open(self, date_str: str) -> None:
+        self.close()
+        path = day_dir(date_str)
+        os.makedirs(path, exist_ok=True)
+        self._dicts = _load_dicts(path)
+        files = []
+        counts = []
+        existed = []
+        for name, kind in zip(self.header, self.kinds):
+            col_path = os.path.join(path, name + COLUMN_EXT)
+            existed.append(os.path.exists(col_path))
+            f = open(col_path, 'ab')
+            files.append(f)
+            counts.append(f.tell() // array(TYPECODES[kind]).itemsize)
+        # 이전 실행이 배치 도중 끊긴 경우 열 길이를 가장 짧은 열에 맞춤
+        old_counts = [c for c, e in zip(counts, existed) if e]
+        n = min(old_counts) if old_counts else 0
+        for f, kind, count, was_there in zip(files, self.kinds, counts, existed):
+            if was_there and count != n:
+                f.truncate(n * array(TYPECODES[kind]).itemsize)
+                f.seek(0, os.SEEK_END)
+            elif not was_there and n:
+                # 이전 형식(열이 적은 CSV)에서 변환된 날짜에 새 열이 생긴 경우 기본값으로 채움
+                fill = float('nan') if kind == KIND_FLOAT else 0
+                array(TYPECODES[kind], [fill] * n).tofile(f)
+        self._files = files
+        self._date = date_str
+
+    def _encode_status(self, name: str, value) -> int:
+        values = self._dicts.setdefault(name, list(DEFAULT_STATUS_VALUES))
+        text = str(value)
+        try:
+            return values.index(text)
+        except ValueError:
+            if len(values) >= 255:
+                raise ValueError(f"{name} 상태 종류가 너무 많음")
+            values.append(text)
+            _save_dicts(day_dir(self._date), self._dicts)
+            return len(values) - 1
+
+    def _encode(self, rows: List[list]) -> List[array]:
+        """행 목록 → 필드별 array (변환 실패 행은 건너뜀)"""
+        columns = [array(TYPECODES[kind]) for kind in self.kinds]
+        for row in rows:
+            try:
+                encoded = []
+                for name, kind, value in zip(self.header, self.kinds, row):
+                    if kind == KIND_TIME:
+                        encoded.append(_parse_ts(value))
+                    elif kind == KIND_STATUS:
+                        encoded.append(self._encode_status(name, value))
+                    else:
+                        encoded.append(_parse_value(kind, value))
+                if len(encoded) != len(self.header):
+                    raise ValueError("필드 개수 불일치")
+            except (ValueError, TypeError):
+                self.rows_skipped += 1
+                continue
+            for col, value in zip(columns, encoded):
+                col.append(value)
+        return columns
+
+    def write_rows(self, rows: List[list]) -> int:
+        """
+        여러 행 기록 (Timestamp 열의 날짜별로 묶음)
+        Returns: 기록한 행 수
+        """
+        written = 0
+        start = 0
+        n = len(rows)
+        while start < n:
+            date_str = str(rows[start][0])[:10]
+            end = start + 1
+            while end < n and str(rows[end][0])[:10] == date_str:
+                end += 1
+            if date_str != self._date or self._files is None:
+                self._open(date_str)
+            columns = self._encode(rows[start:end])
+            count = len(columns[0]) if columns else 0
+            if count:
+                for f, col in zip(self._files, columns):
+                    col.tofile(f)
+                for f in self._files:
+                    f.flush()
+                written += count
+            start = end
+        self.rows_written += written
+        return written
+
+    def close(self) -> None:
+        if self._files:
+            for f in self._files:
+                try:
+                    f.close()
+                except (OSError, IOError):
+                    pass
+        self._files = None
+        self._date = None
+
+
+def _load_dicts(path: str) -> Dict[str, List[str]]:
+    try:
+        with open(os.path.join(path, DICT_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, IOError, ValueError):
+        return {}
+
+
+def _save_dicts(path: str, dicts: Dict[str, List[str]]) -> None:
+    tmp = os.path.join(path, DICT_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(dicts, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(path, DICT_FILE))
+
+
+class ColumnarDay:
+    """
+    하루치 컬럼형 로그 읽기
+
+    사용 예:
+        day = ColumnarDay('2026-01-05')
+        cols = day.read(['Timestamp', 'VPD_kPa'], start_ts, end_ts)
+        cols['VPD_kPa']  # numpy 배열 (numpy 없으면 array)
+    """
+
+    def __init__(self, date_str: str, use_numpy: Optional[bool] = None):
+        self.date_str = date_str
+        self.path = day_dir(date_str)
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+        self._dicts = None
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.path, 'Timestamp' + COLUMN_EXT))
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, name + COLUMN_EXT)
+
+    def covers(self, csv_path: str) -> bool:
+        """
+        같은 날 CSV의 행을 모두 담고 있는지 (행 수 비교, CSV는 사이드카 인덱스로 끝부분만 셈)
+        - CSV가 없으면 컬럼형 로그가 유일한 기록이므로 True
+        - 결과는 두 파일 크기가 그대로인 동안 재사용 (지난 날짜는 한 번만 셈)
+        """
+        try:
+            st = os.stat(csv_path)
+        except OSError:
+            return True
+        try:
+            signature = (st.st_size, st.st_mtime_ns, os.path.getsize(self._column_path('Timestamp')))
+        except OSError:
+            return False
+        cached = _coverage.get(self.path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        rows, csv_rows = len(self), count_rows(csv_path)
+        covered = rows == csv_rows
+        if not covered:
+            app_logger.debug(f"[Columnar] {self.date_str}: 컬럼형 {rows}행 / CSV {csv_rows}행 → CSV로 읽음")
+        if len(_coverage) >= MAX_COVERAGE_ENTRIES:
+            _coverage.clear()
+        _coverage[self.path] = (signature, covered)
+        return covered
+
+    def __len__(self) -> int:
+        """행 수 (기록 중인 배치를 고려해 모든 열 중 가장 짧은 길이)"""
+        lengths = []
+        for name, kind in SCHEMA.items():
+            try:
+                size = os.path.getsize(self._column_path(name))
+            except OSError:
+                continue
+            lengths.append(size // array(TYPECODES[kind]).itemsize)
+        return min(lengths) if lengths else 0
+
+    def status_values(self, name: str) -> List[str]:
+        """상태 열 사전 (코드 → 문자열)"""
+        if self._dicts is None:
+            self._dicts = _load_dicts(self.path)
+        return self._dicts.get(name, DEFAULT_STATUS_VALUES)
+
+    def _load(self, name: str, start: int = 0, stop: Optional[int] = None):
+        kind = SCHEMA[name]
+        path = self._column_path(name)
+        if self.use_numpy:
+            if not os.path.getsize(path):
+                return np.zeros(0, dtype=NUMPY_DTYPES[kind])
+            data = np.memmap(path, dtype=NUMPY_DTYPES[kind], mode='r')
+            return data[start:stop]
+        col = array(TYPECODES[kind])
+        with open(path, 'rb') as f:
+            total = os.fstat(f.fileno()).st_size // col.itemsize
+            stop = total if stop is None else min(stop, total)
+            if stop > start:
+                f.seek(start * col.itemsize)
+                col.fromfile(f, stop - start)
+        return col
+
+    def index_range(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None):
+        """[start_ts, end_ts] 구간의 (시작 행, 끝 행+1) — Timestamp 이진 탐색"""
+        n = len(self)
+        ts = self._load('Timestamp', 0, n)
+        if self.use_numpy:
+            lo = int(np.searchsorted(ts, start_ts, 'left')) if start_ts is not None else 0
+            hi = int(np.searchsorted(ts, end_ts, 'right')) if end_ts is not None else n
+        else:
+            lo = bisect_left(ts, start_ts) if start_ts is not None else 0
+            hi = bisect_right(ts, end_ts) if end_ts is not None else n
+        return lo, hi
+
+    def read(self, fields: Optional[List[str]] = None, start_ts: Optional[float] = None,
+             end_ts: Optional[float] = None) -> Dict[str, object]:
+        """
+        필드별 배열 읽기 (상태 열은 코드 배열, 사전은 status_values()로 조회)
+        Returns: {필드: 배열}. 해당 날짜 데이터가 없으면 빈 딕셔너리
+        """
+        if not self.exists:
+            return {}
+        fields = list(fields or SCHEMA.keys())
+        if 'Timestamp' not in fields:
+            fields.insert(0, 'Timestamp')
+        lo, hi = self.index_range(start_ts, end_ts)
+        result = {}
+        for name in fields:
+            if name not in SCHEMA or not os.path.exists(self._column_path(name)):
+                continue
+            result[name] = self._load(name, lo, hi)
+        return result
+
+    def rows(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> List[Dict]:
+        """CSV 로그와 같은 모양의 행 딕셔너리 목록 (값은 타입 변환된 상태)"""
+        cols = self.read(None, start_ts, end_ts)
+        if not cols:
+            return []
+        names = list(cols.keys())
+        decoded = []
+        for name in names:
+            kind = SCHEMA[name]
+            values = cols[name].tolist()
+            if kind == KIND_TIME:
+                values = [datetime.fromtimestamp(v).strftime('%Y-%m-%d %H:%M:%S') for v in values]
+            elif kind == KIND_STATUS:
+                table = self.status_values(name)
+                values = [table[v] if v < len(table) else '' for v in values]
+            elif kind == KIND_BOOL:
+                values = ['True' if v else 'False' for v in values]
+            decoded.append(values)
+        return [dict(zip(names, row)) for row in zip(*decoded)]
+
+
+def convert_csv_file(csv_path: str, overwrite: bool = False) -> int:
+    """
+    기존 일별 CSV를 컬럼형으로 변환
+    Returns: 변환한 행 수 (이미 있으면 0)
+    """
+    import csv
+    date_str = os.path.basename(csv_path).replace('smartfarm_log_', '').replace('.csv', '')
+    target = day_dir(date_str)
+    if os.path.exists(target):
+        if not overwrite:
+            return 0
+        for name in os.listdir(target):
+            os.remove(os.path.join(target, name))
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        # CSV 헤더 순서대로 기록 (스키마에 없는 열은 제외)
+        index = [i for i, name in enumerate(header) if name in SCHEMA]
+        writer = ColumnarLogWriter([header[i] for i in index])
+        try:
+            batch = []
+            for row in reader:
+                if len(row) < len(header):
+                    writer.rows_skipped += 1
+                    continue
+                batch.append([row[i] for i in index])
+                if len(batch) >= 1000:
+                    writer.write_rows(batch)
+                    batch = []
+            if batch:
+                writer.write_rows(batch)
+        finally:
+            writer.close()
+    if writer.rows_skipped:
+        app_logger.warning(f"[Columnar] {date_str}: 변환 불가 행 {writer.rows_skipped}개 건너뜀")
+    return writer.rows_written
@@ -0,0 +1,239 @@
+"""
+제어 프로세스 ↔ 웹 프로세스 로컬 소켓 채널
+- 웹 서버를 별도 프로세스로 돌릴 때(config.WEB_SERVER_MODE = 'process') 사용
+  · 무거운 대시보드 조회가 제어 프로세스의 GIL을 잡지 않아 시리얼/자동화 루프가 밀리지 않음
+- 제어 프로세스: ControlServer가 Unix 도메인 소켓(CONTROL_SOCKET_PATH)에서 요청 처리
+- 웹 프로세스: ControlClient + 프록시 객체 (web_server가 쓰던 인터페이스 그대로)
+  · RemoteStateStore: snapshot()/get()/update()
+  · RemoteSerial: is_open/write()/flush() → 제어 프로세스의 send_cmd로 전달 (포트는 제어 프로세스만 엶)
+  · RemoteCamera: is_alive()/trigger_manual_capture()/force_capture
+- 프로토콜: 한 줄에 JSON 하나 (요청 {"op": ..., ...} → 응답 {"ok": true, "result": ...} 또는 {"ok": false, "error": ...})
+"""
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, Optional
+
+import config
+from .logger import app_logger
+from .state import StateSnapshot
+
+# 요청 한 건 응답 대기 시간 (초)
+CONTROL_TIMEOUT_SEC = 5.0
+# 요청/응답 한 줄 최대 크기
+MAX_LINE_BYTES = 1 << 20
+
+
+class ControlError(OSError):
+    """제어 프로세스 연결/요청 실패 (send_cmd가 I/O 오류로 처리하도록 OSError 하위)"""
+
+
+def _socket_path(path: Optional[str] = None) -> str:
+    return path or getattr(config, 'CONTROL_SOCKET_PATH', os.path.join(config.BASE_DIR, 'run', 'control.sock'))
+
+
+def _encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+
+
+# ----------------------------------------------------------------------
+# 제어 프로세스 쪽
+# ----------------------------------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_LINE_BYTES)
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                result = self.server.control.dispatch(request.pop('op', ''), request)
+                reply = {'ok': True, 'result': result}
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self.wfile.write(_encode(reply))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ControlServer:
+    """
+    제어 프로세스의 상태/시리얼/카메라를 웹 프로세스에 제공
+
+    사용 예:
+        server = ControlServer(state_store, ser_b, ser_b_lock, t_cam)
+        server.start()   # 백그라운드 스레드
+        ...
+        server.stop()
+    """
+
+    def __init__(self, state_store, ser_b, ser_b_lock, camera_thread=None, path: Optional[str] = None):
+        self.state_store = state_store
+        self.ser_b = ser_b
+        self.ser_b_lock = ser_b_lock
+        self.camera_thread = camera_thread
+        self.path = _socket_path(path)
+        self.requests = 0
+        self._server = None
+        self._thread = None
+
+    def dispatch(self, op: str, params: Dict[str, Any]):
+        self.requests += 1
+        if op == 'ping':
+            camera = self.camera_thread
+            return {
+                'serial_open': bool(self.ser_b and self.ser_b.is_open),
+                'camera_alive': bool(camera and camera.is_alive()),
+                'force_capture': bool(camera and camera.force_capture),
+            }
+        if op == 'snapshot':
+            return self._snapshot_dict(self.state_store.snapshot())
+        if op == 'update':
+            return self._snapshot_dict(self.state_store.update(params.get('changes') or {}))
+        if op == 'send_cmd':
+            from .automation import send_cmd
+            return send_cmd(self.ser_b, self.ser_b_lock, params['cmd'], caller_info=params.get('caller', '[Web]'))
+        if op == 'capture':
+            if not self.camera_thread or not self.camera_thread.is_alive():
+                return False
+            self.camera_thread.trigger_manual_capture()
+            return True
+        raise ValueError(f'알 수 없는 요청: {op}')
+
+    @staticmethod
+    def _snapshot_dict(snap: StateSnapshot) -> Dict[str, Any]:
+        return {'data': snap.to_dict(), 'version': snap.version, 'updated_at': snap.updated_at}
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            os.unlink(self.path)  # 이전 실행이 남긴 소켓 파일
+        except FileNotFoundError:
+            pass
+        self._server = _UnixServer(self.path, _Handler)
+        self._server.control = self
+        os.chmod(self.path, 0o600)  # 같은 사용자(웹 프로세스)만 접근
+        self._thread = threading.Thread(target=self._server.serve_forever, name='ControlServer', daemon=True)
+        self._thread.start()
+        app_logger.info(f"[Control] 🔌 제어 채널 시작: {self.path}")
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+# ----------------------------------------------------------------------
+# 웹 프로세스 쪽
+# ----------------------------------------------------------------------
+
+class ControlClient:
+    """제어 채널 클라이언트 (요청마다 연결, 스레드 안전)"""
+
+    def __init__(self, path: Optional[str] = None, timeout: float = CONTROL_TIMEOUT_SEC):
+        self.path = _socket_path(path)
+        self.timeout = timeout
+
+    def call(self, op: str, **params):
+        params['op'] = op
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.path)
+                sock.sendall(_encode(params))
+                with sock.makefile('rb') as f:
+                    line = f.readline(MAX_LINE_BYTES)
+        except OSError as e:
+            raise ControlError(f'제어 프로세스 연결 실패 ({self.path}): {e}') from e
+        if not line:
+            raise ControlError('제어 프로세스 응답 없음')
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise ControlError(reply.get('error', '제어 요청 실패'))
+        return reply.get('result')
+
+    def ping(self) -> Optional[Dict[str, Any]]:
+        """제어 프로세스 상태 (연결 안 되면 None)"""
+        try:
+            return self.call('ping')
+        except ControlError:
+            return None
+
+
+def _to_snapshot(result: Dict[str, Any]) -> StateSnapshot:
+    return StateSnapshot(result['data'], result['version'], result['updated_at'])
+
+
+class RemoteStateStore:
+    """제어 프로세스 StateStore의 프록시 (읽기도 요청 한 번: 항상 최신 스냅샷)"""
+
+    def __init__(self, client: ControlClient):
+        self.client = client
+
+    def snapshot(self) -> StateSnapshot:
+        return _to_snapshot(self.client.call('snapshot'))
+
+    def get(self, key, default=None):
+        return self.snapshot().get(key, default)
+
+    def update(self, changes: Optional[Dict[str, Any]] = None, **kwargs) -> StateSnapshot:
+        if changes:
+            kwargs.update(changes)
+        return _to_snapshot(self.client.call('update', changes=kwargs))
+
+
+class RemoteSerial:
+    """
+    Board B 시리얼 포트 프록시
+    - write()로 받은 명령 줄을 flush()에서 제어 프로세스의 send_cmd로 전달
+    - 실패하면 OSError(ControlError) → send_cmd가 False 반환
+    """
+
+    def __init__(self, client: ControlClient):
+        self.client = client
+        self._pending = b''
+
+    @property
+    def is_open(self) -> bool:
+        status = self.client.ping()
+        return bool(status and status['serial_open'])
+
+    def write(self, data: bytes) -> int:
+        self._pending += data
+        return len(data)
+
+    def flush(self) -> None:
+        lines, self._pending = self._pending.decode().splitlines(), b''
+        for cmd in lines:
+            if not self.client.call('send_cmd', cmd=cmd, caller='[Web]'):
+                raise ControlError(f'제어 프로세스 명령 전송 실패: {cmd}')
+
+
+class RemoteCamera:
+    """카메라 스레드 프록시 (수동 촬영 트리거/완료 확인)"""
+
+    def __init__(self, client: ControlClient):
+        self.client = client
+
+    def is_alive(self) -> bool:
+        status = self.client.ping()
+        return bool(status and status['camera_alive'])
+
+    def trigger_manual_capture(self) -> None:
+        if not self.client.call('capture'):
+            raise ControlError('카메라 스레드가 실행 중이 아닙니다')
+
+    @property
+    def force_capture(self) -> bool:
+        status = self.client.ping()
+        return bool(status and status['force_capture'])
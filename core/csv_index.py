@@ -0,0 +1,240 @@
+"""
+일별 CSV 로그의 희소 오프셋 인덱스 (사이드카 파일)
+- smartfarm_log_YYYY-MM-DD.csv 옆에 .csv.idx 파일을 두고 N행마다 (epoch, 바이트 오프셋, 행 번호) 기록
+- 로거가 행을 추가하면서 인덱스도 함께 추가 (파일 전체를 다시 읽지 않음)
+- 시간 범위 조회: 인덱스 이진 탐색 → 해당 오프셋으로 seek → 필요한 행만 파싱
+- 최신 행 조회: 파일 끝에서 고정 크기 블록으로 거꾸로 읽어 필요한 줄만 파싱
+"""
+import csv
+import io
+import os
+import struct
+from bisect import bisect_right
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from .logger import app_logger
+
+INDEX_SUFFIX = '.idx'
+# 항목: epoch 초(int64), 바이트 오프셋(int64), 데이터 행 번호(0부터, int64)
+INDEX_RECORD = struct.Struct('<qqq')
+DEFAULT_INDEX_EVERY = 60  # 10초 간격 로그 기준 10분마다 한 항목
+TAIL_BLOCK_SIZE = 8192  # 끝에서 거꾸로 읽을 때 블록 크기
+
+TS_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def index_path(csv_path: str) -> str:
+    return csv_path + INDEX_SUFFIX
+
+
+def parse_datetime(text: str) -> datetime:
+    """
+    'YYYY-MM-DD HH:MM:SS' → datetime (로컬 시간)
+    - 로거가 쓰는 고정 형식이면 datetime.fromisoformat (C 구현, strptime보다 10배 이상 빠름)
+    - 형식이 다르면 strptime으로 처리 (잘못된 값은 ValueError)
+    - 구분자 위치까지 확인: fromisoformat은 '2026-01-02 12:30+09'(시간대 포함) 같은 값도 받아
+      시간대 있는 datetime을 만드므로 고정 형식이 아니면 strptime으로 넘김
+    """
+    if (len(text) == 19 and text[4] == '-' and text[7] == '-' and text[10] == ' '
+            and text[13] == ':' and text[16] == ':'):
+        return datetime.fromisoformat(text)
+    return datetime.strptime(text, TS_FORMAT)
+
+
+def parse_ts(text: str) -> int:
+    """'YYYY-MM-DD HH:MM:SS' → epoch 초 (로컬 시간)"""
+    return int(parse_datetime(text).timestamp())
+
+
+def load_index(csv_path: str) -> List[Tuple[int, int, int]]:
+    """사이드카 인덱스 읽기 (없거나 파일보다 앞서 있으면 빈 목록)"""
+    path = index_path(csv_path)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except (OSError, IOError):
+        return []
+    usable = len(data) - len(data) % INDEX_RECORD.size
+    entries = list(INDEX_RECORD.iter_unpack(data[:usable]))
+    try:
+        size = os.path.getsize(csv_path)
+    except OSError:
+        return []
+    # CSV가 잘리거나 교체된 경우 (오프셋이 파일 크기를 넘음) 인덱스 무효
+    if entries and entries[-1][1] >= size:
+        return []
+    return entries
+
+
+def scan_csv(csv_path: str, every: int = DEFAULT_INDEX_EVERY, start_offset: Optional[int] = None,
+             start_row: int = 0) -> Tuple[List[Tuple[int, int, int]], int]:
+    """
+    CSV를 바이너리로 훑어 인덱스 항목 생성
+    Args:
+        start_offset: 이 오프셋(행 시작)부터 스캔. None이면 헤더 다음부터
+        start_row: start_offset 위치의 데이터 행 번호
+    Returns:
+        (인덱스 항목 목록, 파일 끝까지의 전체 데이터 행 수)
+    """
+    entries = []
+    row = start_row
+    with open(csv_path, 'rb') as f:
+        if start_offset is None:
+            f.readline()  # 헤더
+        else:
+            f.seek(start_offset)
+        offset = f.tell()
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # 기록 중인 마지막 줄
+            if row % every == 0:
+                try:
+                    entries.append((parse_ts(line[:19].decode('ascii')), offset, row))
+                except (ValueError, UnicodeDecodeError):
+                    pass  # 깨진 행은 인덱스 없이 통과
+            row += 1
+            offset += len(line)
+    return entries, row
+
+
+def count_rows(csv_path: str) -> int:
+    """완성된 데이터 행 수 (인덱스가 있으면 마지막 항목 이후 행만 셈, 없으면 전체 스캔)"""
+    entries = load_index(csv_path)
+    if entries:
+        _, offset, row = entries[-1]
+        return scan_csv(csv_path, DEFAULT_INDEX_EVERY, offset, row)[1]
+    return scan_csv(csv_path)[1]
+
+
+def ensure_index(csv_path: str, every: int = DEFAULT_INDEX_EVERY, write: bool = True) -> List[Tuple[int, int, int]]:
+    """
+    인덱스 읽기, 없거나 무효면 다시 생성
+    Args:
+        write: 생성한 인덱스를 사이드카로 저장할지 (로거가 쓰는 오늘 파일은 False)
+    """
+    entries = load_index(csv_path)
+    if entries:
+        return entries
+    if not os.path.exists(csv_path):
+        return []
+    entries, _ = scan_csv(csv_path, every)
+    if write and entries:
+        try:
+            with open(index_path(csv_path) + '.tmp', 'wb') as f:
+                for entry in entries:
+                    f.write(INDEX_RECORD.pack(*entry))
+            os.replace(index_path(csv_path) + '.tmp', index_path(csv_path))
+        except (OSError, IOError) as e:
+            app_logger.warning(f"[CsvIndex] 인덱스 저장 실패 ({csv_path}): {e}")
+    return entries
+
+
+class CsvIndexWriter:
+    """로거용 증분 인덱스 기록기 (CsvLogWriter가 행을 쓰기 직전 오프셋을 전달)"""
+
+    def __init__(self, csv_path: str, every: int = DEFAULT_INDEX_EVERY):
+        self.csv_path = csv_path
+        self.every = max(1, int(every))
+        entries = load_index(csv_path)
+        if entries:
+            # 마지막 항목 이후 행 수만 세어 이어서 기록
+            last_ts, last_offset, last_row = entries[-1]
+            _, self.row_count = scan_csv(csv_path, self.every, last_offset, last_row)
+            mode = 'ab'
+        elif os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+            # 인덱스 없는 기존 파일 (이전 버전에서 생성): 전체 스캔 후 새로 작성
+            entries, self.row_count = scan_csv(csv_path, self.every)
+            mode = 'wb'
+        else:
+            self.row_count = 0
+            mode = 'wb'
+        self._file = open(index_path(csv_path), mode)
+        if mode == 'wb':
+            for entry in entries:
+                self._file.write(INDEX_RECORD.pack(*entry))
+            self._file.flush()
+
+    def rows_until_mark(self) -> int:
+        """다음 인덱스 항목까지 남은 행 수 (0이면 다음 행이 항목)"""
+        return (-self.row_count) % self.every
+
+    def mark(self, ts_text: str, offset: int) -> None:
+        """다음 행(행 번호 row_count)의 시작 오프셋 기록"""
+        try:
+            ts = parse_ts(str(ts_text)[:19])
+        except ValueError:
+            return
+        self._file.write(INDEX_RECORD.pack(ts, offset, self.row_count))
+
+    def advance(self, rows: int) -> None:
+        self.row_count += rows
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        except (OSError, IOError):
+            pass
+
+
+def iter_rows_from(csv_path: str, offset: Optional[int]) -> Iterator[dict]:
+    """
+    오프셋부터 행 딕셔너리 순회 (offset None이면 처음부터)
+    - 헤더는 파일 첫 줄에서 읽음, 마지막 줄이 기록 중(개행 없음)이면 제외
+    """
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode('utf-8', errors='ignore')]), [])
+        if offset is not None and offset > f.tell():
+            f.seek(offset)
+        text = io.TextIOWrapper(f, encoding='utf-8', newline='')
+        for values in csv.reader(_complete_lines(text)):
+            yield dict(zip(header, values))
+
+
+def _complete_lines(text) -> Iterator[str]:
+    for line in text:
+        if not line.endswith('\n'):
+            return
+        yield line
+
+
+def offset_for(entries: List[Tuple[int, int, int]], start_ts: float) -> Optional[int]:
+    """start_ts 이전의 마지막 인덱스 항목 오프셋 (없으면 None: 처음부터)"""
+    if not entries:
+        return None
+    keys = [e[0] for e in entries]
+    i = bisect_right(keys, start_ts) - 1
+    if i < 0:
+        return None
+    return entries[i][1]
+
+
+def read_tail(csv_path: str, limit: int, block_size: int = TAIL_BLOCK_SIZE) -> List[dict]:
+    """
+    마지막 limit개 행 (파일 끝에서 고정 크기 블록 단위로 거슬러 읽음, 파일 크기와 무관)
+    - 기록 중인 마지막 줄(개행 없음)은 제외
+    """
+    if limit <= 0:
+        return []
+    with open(csv_path, 'rb') as f:
+        header_line = f.readline()
+        header_end = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b''
+        # 완전한 줄 limit개 + 앞쪽 경계 개행이 확보될 때까지
+        while pos > header_end and buf.count(b'\n') <= limit:
+            step = min(block_size, pos - header_end)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    lines = buf.split(b'\n')[:-1]  # 마지막 조각은 빈 문자열 또는 기록 중인 줄
+    if pos > header_end and lines:
+        lines = lines[1:]  # 블록 경계에서 잘린 첫 줄
+    header = next(csv.reader([header_line.decode('utf-8', errors='ignore')]), [])
+    text = [line.decode('utf-8', errors='ignore') for line in lines[-limit:]]
+    return [dict(zip(header, values)) for values in csv.reader(text) if values]
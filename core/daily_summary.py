@@ -0,0 +1,231 @@
+"""
+일별 요약 저장소 (하루·구역당 한 행)
+- 온도/습도/토양/조도/VPD의 최소·최대·평균, 최종 DLI, 물주기 횟수·사용량, 구동계 ON 시간(분)
+- 자동화 루프가 자정 리셋 때 전날 요약을 기록하고, 기존 CSV 로그에서 빠진 날짜를 채움(backfill, 주 구역만)
+- 파일: DAILY_SUMMARY_FILE (CSV 한 개, 1년 약 365행이라 갱신 시 전체를 다시 씀)
+- 조회: /api/daily_summary?start=YYYY-MM-DD&end=YYYY-MM-DD[&zone=] (저장된 행만 읽음, zone은 필터)
+"""
+import csv
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import config
+from .logger import app_logger
+
+SUMMARY_FIELDS = ['Temp_C', 'Hum_Pct', 'Soil_Pct', 'Lux', 'VPD_kPa']
+ON_MINUTE_FIELDS = [('Valve_Status', 'Valve_On_Min'), ('Fan_Status', 'Fan_On_Min'),
+                    ('LED_W_Status', 'LED_W_On_Min'), ('LED_P_Status', 'LED_P_On_Min')]
+# 로그 간격이 이보다 벌어진 구간(기록 중단)은 ON 시간에 넣지 않음
+MAX_SAMPLE_GAP_SEC = 60
+# 자정 리셋 후 요약 기록까지 대기 (로거 배치에 남은 전날 마지막 행 반영)
+SUMMARY_DELAY_SEC = 5.0
+
+SUMMARY_HEADER = (['Date', 'Zone', 'Samples'] +
+                  [f'{name}_{agg}' for name in SUMMARY_FIELDS for agg in ('Min', 'Max', 'Mean')] +
+                  ['DLI_mol_Final', 'Watering_Count', 'Water_Used_L'] +
+                  [column for _, column in ON_MINUTE_FIELDS])
+
+
+def primary_zone() -> str:
+    """CSV 로그가 기록하는 주 구역 (첫 번째 센서 보드의 zone)"""
+    boards = getattr(config, 'SENSOR_BOARDS', None)
+    if boards:
+        return boards[0].get('zone', 'main')
+    return 'main'
+
+
+def summarize_day(data_reader, date_str: str, watering_count: Optional[int] = None, water_used: Optional[float] = None,
+                  final_dli: Optional[float] = None) -> Optional[Dict]:
+    """
+    하루 로그로 요약 행 계산 (로그가 없으면 None)
+    - CSV 로그는 주 구역만 기록하므로 행의 구역은 항상 primary_zone()
+    - watering_count/water_used/final_dli: 자동화 루프가 리셋 직전 값을 넘기면 로그 값 대신 사용
+    """
+    columns = data_reader.read_columns(date_str, date_str, ['DLI_mol', 'Watering_Count_Today', 'Water_Used_Today_L'] +
+                                       [field for field, _ in ON_MINUTE_FIELDS])
+    timestamps = columns.get('Timestamp', [])
+    if not timestamps:
+        return None
+
+    row = {'Date': date_str, 'Zone': primary_zone(), 'Samples': len(timestamps)}
+    stats = data_reader.get_statistics(date_str, date_str)  # 날짜별 부분 집계 캐시 재사용
+    for name in SUMMARY_FIELDS:
+        field_stats = stats.get(name, {})
+        row[f'{name}_Min'] = _round(field_stats.get('min'))
+        row[f'{name}_Max'] = _round(field_stats.get('max'))
+        row[f'{name}_Mean'] = _round(field_stats.get('avg'))
+
+    if final_dli is None:
+        final_dli = _last_value(columns.get('DLI_mol', []))
+    if watering_count is None:
+        watering_count = max((v for v in columns.get('Watering_Count_Today', []) if v is not None), default=0)
+    if water_used is None:
+        water_used = max((v for v in columns.get('Water_Used_Today_L', []) if v is not None), default=0.0)
+    row['DLI_mol_Final'] = _round(final_dli, 4)
+    row['Watering_Count'] = int(watering_count)
+    row['Water_Used_L'] = _round(water_used)
+
+    for field, column in ON_MINUTE_FIELDS:
+        row[column] = round(_on_seconds(timestamps, columns.get(field, [])) / 60.0, 1)
+    return row
+
+
+def _on_seconds(timestamps, statuses) -> float:
+    """각 행의 상태가 다음 행까지 유지됐다고 보고 ON 구간 합산"""
+    total = 0.0
+    for i in range(len(timestamps) - 1):
+        if statuses[i] == 'ON':
+            gap = timestamps[i + 1] - timestamps[i]
+            if 0 < gap <= MAX_SAMPLE_GAP_SEC:
+                total += gap
+    return total
+
+
+def _last_value(values):
+    for v in reversed(values):
+        if v is not None:
+            return v
+    return None
+
+
+def _round(value, digits=2):
+    return round(value, digits) if value is not None else None
+
+
+class DailySummaryStore:
+    """일별 요약 CSV 저장소 (메모리 사본 + 파일 mtime 확인)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or config.DAILY_SUMMARY_FILE
+        self._lock = threading.Lock()
+        self._rows: Dict[tuple, Dict] = {}  # (날짜, 구역) → 행
+        self._mtime = None
+
+    def _load(self) -> None:
+        """파일이 바뀌었으면 다시 읽기 (다른 프로세스의 기록 반영)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        rows = {}
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                rows[(row['Date'], row['Zone'])] = _typed(row)
+        self._rows = rows
+        self._mtime = mtime
+
+    def has(self, date_str: str, zone: str) -> bool:
+        with self._lock:
+            self._load()
+            return (date_str, zone) in self._rows
+
+    def query(self, start_date: str, end_date: str, zone: Optional[str] = None) -> List[Dict]:
+        """날짜 범위의 요약 행 (날짜순)"""
+        with self._lock:
+            self._load()
+            rows = [row for (date_str, row_zone), row in self._rows.items()
+                    if start_date <= date_str <= end_date and (zone is None or row_zone == zone)]
+        return sorted(rows, key=lambda r: (r['Date'], r['Zone']))
+
+    def upsert(self, rows: List[Dict]) -> None:
+        """행 추가/교체 후 파일 전체를 원자적으로 다시 씀"""
+        if not rows:
+            return
+        with self._lock:
+            self._load()
+            for row in rows:
+                self._rows[(row['Date'], row['Zone'])] = row
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=SUMMARY_HEADER, extrasaction='ignore')
+                writer.writeheader()
+                for key in sorted(self._rows):
+                    writer.writerow(self._rows[key])
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+
+
+def _typed(row: Dict) -> Dict:
+    """CSV 문자열 → 숫자 (빈 값은 None)"""
+    result = {}
+    for key, value in row.items():
+        if key in ('Date', 'Zone') or key is None:
+            result[key] = value
+        elif value in (None, ''):
+            result[key] = None
+        elif key in ('Samples', 'Watering_Count'):
+            result[key] = int(float(value))
+        else:
+            result[key] = float(value)
+    return result
+
+
+def backfill(data_reader, store: DailySummaryStore, start_date: Optional[str] = None,
+             end_date: Optional[str] = None, *, overwrite: bool = False) -> int:
+    """
+    요약이 없는 날짜를 CSV 로그로 채움 (오늘은 아직 끝나지 않았으므로 제외)
+    - 로그가 있는 주 구역(primary_zone)만 채움
+    - 자동화 루프(시작 시, 자정 리셋 후)와 scripts/backfill_daily_summary.py에서만 호출 (웹 요청에서는 조회만)
+    Returns: 기록한 날짜 수
+    """
+    zone = primary_zone()
+    today = datetime.now().strftime('%Y-%m-%d')
+    dates = [d for d in data_reader.get_available_dates()
+             if d < today and (start_date is None or d >= start_date) and (end_date is None or d <= end_date)]
+    rows = []
+    for date_str in sorted(dates):
+        if not overwrite and store.has(date_str, zone):
+            continue
+        row = summarize_day(data_reader, date_str)
+        if row:
+            rows.append(row)
+    store.upsert(rows)
+    return len(rows)
+
+
+def write_day_summary(data_reader, store: DailySummaryStore, date_str: str, **kwargs) -> None:
+    """자정 리셋 시 전날 요약 기록 (자동화 루프가 백그라운드 스레드로 호출)"""
+    try:
+        row = summarize_day(data_reader, date_str, **kwargs)
+        if row:
+            store.upsert([row])
+            app_logger.info(f"[Summary] 📅 일별 요약 기록: {date_str} ({row['Samples']}행)")
+        # 서비스가 멈춰 있던 날짜도 함께 채움
+        filled = backfill(data_reader, store)
+        if filled:
+            app_logger.info(f"[Summary] 📅 빠진 일별 요약 {filled}일 채움")
+    except Exception as e:
+        app_logger.error(f"[Summary] 일별 요약 기록 실패 ({date_str}): {e}")
+
+
+def schedule_day_summary(data_reader, store: DailySummaryStore, date_str: str, **kwargs) -> None:
+    """
+    전날 요약을 잠시 뒤 백그라운드로 기록 (제어 루프를 막지 않고, 로거 큐에 남은 전날 마지막 행도 반영되도록)
+    """
+    timer = threading.Timer(SUMMARY_DELAY_SEC, write_day_summary, args=(data_reader, store, date_str), kwargs=kwargs)
+    timer.daemon = True
+    timer.start()
+
+
+def start_backfill(data_reader, store: DailySummaryStore) -> threading.Thread:
+    """시작 시 빠진 날짜 채우기 (백그라운드)"""
+    def run():
+        try:
+            filled = backfill(data_reader, store)
+            if filled:
+                app_logger.info(f"[Summary] 📅 기존 로그로 일별 요약 {filled}일 채움")
+        except Exception as e:
+            app_logger.error(f"[Summary] 일별 요약 채우기 실패: {e}")
+
+    thread = threading.Thread(target=run, name='DailySummaryBackfill', daemon=True)
+    thread.start()
+    return thread
+
+
+def previous_day(date_str: str) -> str:
+    return (datetime.strptime(date_str, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
@@ -1,138 +1,308 @@
 """
-데이터 읽기 모듈 (CSV → MariaDB 전환 대비 추상화)
+데이터 읽기 모듈 (CSV 기본, 내장 DB 백엔드는 core.sqlite_store.SqliteReader)
 """
 import os
 import csv
-import glob
+import math
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from itertools import chain
+from typing import Iterator, List, Dict, Optional, Tuple
 import config
+from .csv_index import parse_ts
 
 class DataReader:
-    """CSV 파일 기반 데이터 읽기 (향후 MariaDB로 전환 가능)"""
+    """CSV 파일 기반 데이터 읽기 (DB 백엔드는 같은 인터페이스의 하위 클래스, create_data_reader 참고)"""
     
     def __init__(self):
+        from .catalog import DirectoryCatalog, log_file_key
+        from .parse_cache import parse_cache
         self.log_dir = config.LOG_DIR
+        # 파일별 파싱 결과 캐시 (늘어난 끝부분만 다시 파싱, 메모리 예산 내 LRU, core.parse_cache 참고). None이면 매번 파싱
+        self.parse_cache = parse_cache
+        self._stats_engine = None
+        # 월별 폴더의 파일 목록 캐시 (요청마다 glob 하지 않음)
+        self.catalog = DirectoryCatalog(self.log_dir, log_file_key,
+                                        check_interval=getattr(config, 'CATALOG_CHECK_INTERVAL_SEC', 2.0))
     
     def get_available_dates(self) -> List[str]:
-        """사용 가능한 날짜 목록 반환 (YYYY-MM-DD 형식)"""
-        dates = set()
-        
-        # 월별 폴더 검색
-        month_patterns = os.path.join(self.log_dir, "*/smartfarm_log_*.csv")
-        for filepath in glob.glob(month_patterns):
-            # 파일명에서 날짜 추출: smartfarm_log_YYYY-MM-DD.csv
-            filename = os.path.basename(filepath)
-            if filename.startswith("smartfarm_log_") and filename.endswith(".csv"):
-                date_str = filename.replace("smartfarm_log_", "").replace(".csv", "")
-                try:
-                    # 날짜 형식 검증
-                    datetime.strptime(date_str, "%Y-%m-%d")
-                    dates.add(date_str)
-                except ValueError:
-                    continue
-        
-        return sorted(list(dates), reverse=True)  # 최신순 정렬
+        """사용 가능한 날짜 목록 반환 (YYYY-MM-DD 형식, 최신순)"""
+        return self.catalog.keys(reverse=True)
     
-    def read_log_data(self, start_date: str, end_date: str) -> List[Dict]:
+    def read_log_data(self, start_date: str, end_date: str,
+                      start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Dict]:
         """
         지정된 날짜 범위의 로그 데이터 읽기
         Args:
             start_date: 시작 날짜 (YYYY-MM-DD)
             end_date: 종료 날짜 (YYYY-MM-DD)
+            start_time, end_time: 시각 범위 (선택). 지정하면 사이드카 인덱스로 seek 후 범위만 파싱
         Returns:
-            로그 데이터 리스트 (딕셔너리 형태)
+            로그 데이터 리스트 (딕셔너리 형태, _ts: epoch 초, _timestamp: datetime)
         """
-        data = []
+        # 날짜별 행은 서로 겹치지 않고 날짜순으로 나오므로 정렬 없이 이어 붙이기만 함
+        return list(self.iter_log_data(start_date, end_date, start_time, end_time))
+    
+    def iter_log_data(self, start_date: str, end_date: str,
+                      start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        read_log_data와 같은 행을 파일에서 읽는 대로 하나씩 반환 (전체 목록을 메모리에 만들지 않음)
+        - 날짜순, 각 파일 안에서는 기록 순서 (정렬하지 않음)
+        - 파싱 캐시가 있으면 캐시된 행에서 시각 범위를 이진 탐색 (파일은 새로 추가된 부분만 파싱)
+        """
+        return chain.from_iterable(map(self._with_datetime,
+                                       self._iter_days(start_date, end_date, start_time, end_time)))
+    
+    @staticmethod
+    def _with_datetime(rows: Iterator[Dict]) -> Iterator[Dict]:
+        """내부 행(_ts: epoch 초)에 _timestamp(datetime) 부여 (공개 API로 반환할 때만 만듦)"""
+        fromtimestamp = datetime.fromtimestamp
+        for row in rows:
+            row['_timestamp'] = fromtimestamp(row['_ts'])
+            yield row
+    
+    def _iter_days(self, start_date: str, end_date: str,
+                   start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> Iterator[Iterator[Dict]]:
+        """날짜별 행 반복자 (날짜순, 파일이 없는 날짜는 건너뜀, 행의 시각은 _ts epoch 초만)"""
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
         end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        today = datetime.now().strftime("%Y-%m-%d")
         
-        # 날짜 범위 내의 모든 날짜 생성
+        # 날짜 범위 내의 모든 날짜와 로그 파일 경로
+        files = []
         current_dt = start_dt
         while current_dt <= end_dt:
             date_str = current_dt.strftime("%Y-%m-%d")
-            month_dir = current_dt.strftime("%Y-%m")
-            
-            # 로그 파일 경로
-            log_file = os.path.join(self.log_dir, month_dir, f"smartfarm_log_{date_str}.csv")
-            
-            if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        # None 키 제거 (CSV 마지막 빈 컬럼 처리)
-                        if None in row:
-                            del row[None]
-                        
-                        # 타임스탬프 파싱
-                        try:
-                            timestamp = datetime.strptime(row['Timestamp'], "%Y-%m-%d %H:%M:%S")
-                            row['_timestamp'] = timestamp  # 내부 사용
-                            row['_date'] = date_str
-                            data.append(row)
-                        except (ValueError, KeyError) as e:
-                            continue
-            
+            files.append((date_str, self._log_file(date_str)))
             current_dt += timedelta(days=1)
         
-        # 타임스탬프 기준 정렬
-        data.sort(key=lambda x: x.get('_timestamp', datetime.min))
-        return data
+        if self.parse_cache is not None:
+            for date_str, parsed in self._parsed_days(files, today):
+                yield self._iter_parsed(parsed, date_str, start_time, end_time)
+            return
+        
+        for date_str, log_file in files:
+            if not os.path.exists(log_file):
+                continue
+            if start_time is None and end_time is None:
+                yield self._iter_file(log_file, date_str)
+            else:
+                yield self._read_range(log_file, date_str, start_time, end_time,
+                                       write_index=(date_str != today))
+    
+    def _parsed_days(self, files: List[Tuple[str, str]], today: str) -> Iterator[Tuple[str, object]]:
+        """
+        날짜별 파싱 결과 (날짜, ParsedLog)
+        - 캐시에 없는 지난 날짜가 여러 개면 작업 프로세스 풀에서 나눠 파싱 (core.parallel_reader)
+        - 오늘 파일은 캐시에서 늘어난 부분만 파싱
+        """
+        from .parallel_reader import parse_files
+        
+        pending = [path for date_str, path in files
+                   if date_str != today and not self.parse_cache.contains(path) and os.path.exists(path)]
+        parsed_files = parse_files(pending)
+        pending = set(pending)
+        for date_str, path in files:
+            if path in pending:
+                _, parsed = next(parsed_files)
+                if parsed is not None:
+                    self.parse_cache.put(parsed, parsed.offset)
+            else:
+                parsed = self.parse_cache.get(path, closed=(date_str != today))
+            if parsed is not None:
+                yield date_str, parsed
+    
+    def _iter_file(self, log_file: str, date_str: str) -> Iterator[Dict]:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            yield from self._iter_rows(csv.DictReader(f), date_str)
+    
+    def _iter_parsed(self, parsed, date_str: str, start_time: Optional[datetime] = None,
+                     end_time: Optional[datetime] = None) -> Iterator[Dict]:
+        """파싱 캐시의 행 → 행 딕셔너리 (호출마다 새 딕셔너리라 호출자가 수정해도 캐시는 그대로)"""
+        lo, hi = parsed.index_range(math.ceil(start_time.timestamp()) if start_time is not None else None,
+                                    math.floor(end_time.timestamp()) if end_time is not None else None)
+        header = parsed.header
+        for epoch, values in parsed.iter_values(lo, hi):
+            row = dict(zip(header, values))
+            row['_ts'] = epoch  # 내부 사용
+            row['_date'] = date_str
+            yield row
+    
+    def _iter_rows(self, rows, date_str: str, start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None) -> Iterator[Dict]:
+        """행 딕셔너리에 _ts(epoch 초)/_date 부여 후 범위 내 행만 반환 (end_time 이후 행을 만나면 중단)"""
+        lo = math.ceil(start_time.timestamp()) if start_time is not None else None
+        hi = math.floor(end_time.timestamp()) if end_time is not None else None
+        for row in rows:
+            # None 키 제거 (CSV 마지막 빈 컬럼 처리)
+            if None in row:
+                del row[None]
+            
+            # 타임스탬프 파싱
+            try:
+                ts = parse_ts(row['Timestamp'])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if lo is not None and ts < lo:
+                continue
+            if hi is not None and ts > hi:
+                break  # 파일은 시간순으로 기록되므로 이후 행은 모두 범위 밖
+            row['_ts'] = ts  # 내부 사용
+            row['_date'] = date_str
+            yield row
+    
+    def _read_range(self, log_file: str, date_str: str, start_time: Optional[datetime],
+                    end_time: Optional[datetime], write_index: bool = True) -> Iterator[Dict]:
+        """사이드카 인덱스로 start_time 직전 위치로 seek 후 범위만 읽기"""
+        from .csv_index import ensure_index, offset_for, iter_rows_from
+        
+        offset = None
+        if start_time is not None:
+            # 오늘 파일의 인덱스는 로거가 관리하므로 없을 때 새로 저장하지 않음
+            every = getattr(config, 'LOG_INDEX_EVERY_ROWS', None) or 60
+            entries = ensure_index(log_file, every, write=write_index)
+            offset = offset_for(entries, start_time.timestamp())
+        yield from self._iter_rows(iter_rows_from(log_file, offset), date_str, start_time, end_time)
+    
+    def read_columns(self, start_date: str, end_date: str, fields: Optional[List[str]] = None,
+                     start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> Dict[str, list]:
+        """
+        지정된 날짜 범위를 필드별 목록으로 읽기
+        - 컬럼형 로그가 있는 날짜는 이진 탐색 + 슬라이스로 읽고, 없는 날짜만 CSV 파싱
+        Args:
+            fields: 읽을 필드 (None이면 전체). Timestamp는 항상 포함 (epoch 초)
+            start_ts, end_ts: 시각 범위 (epoch 초, 선택)
+        Returns:
+            {필드: 값 목록} (상태 열은 문자열, 숫자 열은 float/int)
+        """
+        from .columnar import SCHEMA, KIND_STATUS, KIND_BOOL, typed_value
+        
+        wanted = ['Timestamp'] + [f for f in (fields or SCHEMA.keys()) if f != 'Timestamp' and f in SCHEMA]
+        result = {name: [] for name in wanted}
+        
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        today = datetime.now().strftime("%Y-%m-%d")
+        days = []
+        while start_dt <= end_dt:
+            date_str = start_dt.strftime("%Y-%m-%d")
+            days.append((date_str, self.columnar_day(date_str)))
+            start_dt += timedelta(days=1)
+        
+        # 컬럼형 로그가 없는 날짜는 파싱 캐시에서 (여러 날이면 병렬 파싱)
+        # 날짜순으로 하나씩 받아 바로 열에 옮김 (_iter_days와 같이 전체 날짜를 한꺼번에 들고 있지 않음)
+        parsed_days = iter(())
+        if self.parse_cache is not None:
+            parsed_days = self._parsed_days(
+                [(date_str, self._log_file(date_str)) for date_str, day in days if day is None], today)
+        next_parsed = None
+        
+        for date_str, day in days:
+            if day is not None:
+                cols = day.read(wanted, start_ts, end_ts)
+                n = len(cols.get('Timestamp', ()))
+                for name in wanted:
+                    col = cols.get(name)
+                    if col is None:
+                        result[name].extend([None] * n)
+                    elif SCHEMA[name] == KIND_STATUS:
+                        table = day.status_values(name)
+                        result[name].extend(table[v] if v < len(table) else '' for v in col.tolist())
+                    elif SCHEMA[name] == KIND_BOOL:
+                        result[name].extend(bool(v) for v in col.tolist())
+                    else:
+                        result[name].extend(col.tolist())
+            elif self.parse_cache is not None:
+                # 파싱 캐시의 열에서 바로 (값 변환은 서로 다른 값마다 한 번)
+                # _parsed_days는 파일이 있는 날짜만 날짜순으로 반환
+                if next_parsed is None:
+                    next_parsed = next(parsed_days, None)
+                parsed = None
+                if next_parsed is not None and next_parsed[0] == date_str:
+                    parsed = next_parsed[1]
+                    next_parsed = None
+                if parsed is not None:
+                    lo, hi = parsed.index_range(math.ceil(start_ts) if start_ts is not None else None,
+                                                math.floor(end_ts) if end_ts is not None else None)
+                    result['Timestamp'].extend(parsed.epochs[lo:hi])
+                    for name in wanted[1:]:
+                        col = parsed.column(name, lambda v, kind=SCHEMA[name]: typed_value(kind, v), lo, hi)
+                        result[name].extend(col if col is not None else [typed_value(SCHEMA[name], None)] * (hi - lo))
+            else:
+                # 컬럼형 로그가 없는 날짜는 CSV로 대체 (행의 _ts를 그대로 사용, datetime을 만들지 않음)
+                for rows in self._iter_days(date_str, date_str,
+                                            datetime.fromtimestamp(start_ts) if start_ts is not None else None,
+                                            datetime.fromtimestamp(end_ts) if end_ts is not None else None):
+                    for row in rows:
+                        result['Timestamp'].append(row['_ts'])
+                        for name in wanted[1:]:
+                            result[name].append(typed_value(SCHEMA[name], row.get(name)))
+        
+        return result
     
     def get_latest_data(self, limit: int = 1) -> Optional[Dict]:
         """최신 데이터 반환"""
+        return self.get_latest_rows(limit) or None
+    
+    def get_latest_rows(self, n: int = 1) -> List[Dict]:
+        """
+        최근 n개 행 (오래된 것부터)
+        - 같은 프로세스의 로거가 채운 최신값 캐시에서 바로 반환
+        - 캐시가 비어 있으면 최신 파일 끝에서 블록 단위로 거꾸로 읽음 (파일 크기와 무관)
+        """
+        from .logger import latest_rows
+        from .csv_index import read_tail
+        
+        rows = latest_rows.get(n)
+        if rows is None:
+            log_file = self._latest_log_file()
+            if not log_file:
+                return []
+            rows = read_tail(log_file, n)
+        
+        data = []
+        for row in rows:
+            data.extend(self._with_datetime(self._iter_rows([row], row.get('Timestamp', '')[:10])))
+        return data
+    
+    def _latest_log_file(self) -> Optional[str]:
+        """최신 로그 파일 경로 (카탈로그에서 조회)"""
         dates = self.get_available_dates()
         if not dates:
             return None
-        
-        # 최신 날짜의 데이터 읽기
-        latest_date = dates[0]
-        data = self.read_log_data(latest_date, latest_date)
-        
-        if data:
-            return data[-limit:] if limit == 1 else data[-limit:]
+        return self.catalog.files(dates[0])[-1].path
+    
+    def _log_file(self, date_str: str) -> str:
+        return os.path.join(self.log_dir, date_str[:7], f'smartfarm_log_{date_str}.csv')
+    
+    def columnar_day(self, date_str: str):
+        """
+        컬럼형 로그로 읽을 수 있는 날짜면 ColumnarDay, 아니면 None (CSV로 읽음)
+        - 컬럼형 로그가 없거나 CSV보다 행이 적은 날(중간에 켜짐, 배치 기록 실패)은 None
+        """
+        from .columnar import ColumnarDay
+        day = ColumnarDay(date_str)
+        if day.exists and day.covers(self._log_file(date_str)):
+            return day
         return None
     
+    def day_signature(self, date_str: str) -> Optional[Tuple]:
+        """하루 데이터가 바뀌었는지 판단하는 값 (CSV 파일 크기, mtime). 데이터가 없으면 None"""
+        try:
+            st = os.stat(self._log_file(date_str))
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime)
+    
     def get_statistics(self, start_date: str, end_date: str) -> Dict:
-        """통계 정보 계산"""
-        data = self.read_log_data(start_date, end_date)
-        if not data:
-            return {}
-        
-        # 숫자 필드 추출
-        numeric_fields = ['Temp_C', 'Hum_Pct', 'Soil_Pct', 'Lux', 'VPD_kPa', 'DLI_mol']
-        stats = {}
-        
-        for field in numeric_fields:
-            values = []
-            for row in data:
-                try:
-                    val = float(row.get(field, 0))
-                    if val > 0:  # 유효한 값만
-                        values.append(val)
-                except (ValueError, TypeError):
-                    continue
-            
-            if values:
-                stats[field] = {
-                    'min': min(values),
-                    'max': max(values),
-                    'avg': sum(values) / len(values),
-                    'count': len(values)
-                }
-        
-        return stats
-
-# 향후 MariaDB 전환을 위한 인터페이스 (현재는 미구현)
-class MariaDBReader(DataReader):
-    """MariaDB 기반 데이터 읽기 (향후 구현)"""
-    
-    def __init__(self, connection_string: str):
-        # super().__init__()  # CSV는 사용 안 함
-        self.conn_string = connection_string
-        # TODO: MariaDB 연결 설정
-    
-    def read_log_data(self, start_date: str, end_date: str) -> List[Dict]:
-        # TODO: MariaDB 쿼리 구현
-        pass
+        """통계 정보 계산 (날짜별 부분 집계 캐시 병합, core.statistics 참고)"""
+        if self._stats_engine is None:
+            from .statistics import StatisticsEngine
+            self._stats_engine = StatisticsEngine(self)
+        return self._stats_engine.get_statistics(start_date, end_date)
 
+def create_data_reader() -> DataReader:
+    """config.DATA_BACKEND에 맞는 DataReader ('csv': 일별 CSV, 'sqlite': core.sqlite_store)"""
+    if getattr(config, 'DATA_BACKEND', 'csv') == 'sqlite':
+        from .sqlite_store import SqliteReader
+        return SqliteReader()
+    return DataReader()
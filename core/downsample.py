@@ -0,0 +1,177 @@
+"""
+차트용 서버 측 다운샘플링
+- lttb: Largest-Triangle-Three-Buckets (기준 필드 하나의 모양을 가장 잘 보존하는 점 선택)
+- minmax: 구간마다 필드별 최소/최대 행 선택 (순간 피크를 놓치지 않음)
+- 선택한 행 사이에 구동계 ON 상태가 있었으면 대표 행의 상태를 ON으로 표시
+  (dashboard.js의 sampleData와 같은 방식: 짧은 물주기가 차트에서 사라지지 않도록)
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+METHOD_LTTB = 'lttb'
+METHOD_MINMAX = 'minmax'
+METHODS = (METHOD_LTTB, METHOD_MINMAX)
+
+# 구간 안에 ON이 있으면 대표 행에 ON으로 남길 상태 필드
+ON_STATUS_FIELDS = ('Valve_Status', 'Fan_Status', 'LED_W_Status', 'LED_P_Status')
+# lttb 기준 필드 (fields 지정이 없을 때)
+DEFAULT_VALUE_FIELD = 'Temp_C'
+
+
+def lttb_indices(xs: List[float], ys: List[float], threshold: int) -> List[int]:
+    """LTTB로 고른 인덱스 (첫/마지막 점 포함, threshold개)"""
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    selected = [0]
+    for i in range(threshold - 2):
+        # 다음 구간 평균점
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        count = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / count
+        avg_y = sum(ys[avg_start:avg_end]) / count
+
+        # 현재 구간에서 (이전 선택점, 다음 구간 평균점)과 삼각형 넓이가 가장 큰 점
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        selected.append(next_a)
+        a = next_a
+    selected.append(n - 1)
+    return selected
+
+
+def minmax_indices(series: List[List[float]], max_points: int) -> List[int]:
+    """구간마다 각 필드의 최소/최대 인덱스 (첫/마지막 점 포함, 대략 max_points개 이하)"""
+    n = len(series[0]) if series else 0
+    if n <= max_points:
+        return list(range(n))
+    per_bucket = 2 * len(series)
+    buckets = max(1, (max_points - 2) // per_bucket)
+    selected = {0, n - 1}
+    for b in range(buckets):
+        start = b * n // buckets
+        end = (b + 1) * n // buckets
+        if start >= end:
+            continue
+        for ys in series:
+            window = range(start, end)
+            selected.add(min(window, key=ys.__getitem__))
+            selected.add(max(window, key=ys.__getitem__))
+    return sorted(selected)
+
+
+def _numeric_series(values) -> List[float]:
+    """값 목록을 float 목록으로 (빈 값/NaN은 직전 값으로 채움)"""
+    series = []
+    last = 0.0
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value == value:
+            last = float(value)
+        series.append(last)
+    return series
+
+
+def _select_indices(n: int, max_points: int, method: str, series: List[List[float]], xs_fn) -> List[int]:
+    """다운샘플링할 인덱스 선택 (series: 기준 필드들, xs_fn: lttb용 x축(epoch) 목록을 만드는 함수)"""
+    if not series:
+        # 숫자 필드가 없으면 균등 간격
+        step = n / max_points
+        return sorted({int(i * step) for i in range(max_points)} | {n - 1})
+    if method == METHOD_MINMAX:
+        return minmax_indices(series, max_points)
+    return lttb_indices(xs_fn(), series[0], max_points)
+
+
+def _on_within(values, start: int, end: int) -> bool:
+    return any(values[j] == 'ON' for j in range(start, end))
+
+
+def _epochs(timestamps) -> List[float]:
+    """'YYYY-MM-DD HH:MM:SS' 목록 → epoch 초 (날짜별 자정 epoch + 시분초, strptime은 날짜당 한 번)"""
+    midnights = {}
+    result = []
+    for ts in timestamps:
+        if isinstance(ts, (int, float)):
+            result.append(float(ts))
+            continue
+        ts = str(ts)
+        day = ts[:10]
+        base = midnights.get(day)
+        if base is None:
+            base = midnights[day] = datetime.strptime(day, '%Y-%m-%d').timestamp()
+        result.append(base + int(ts[11:13]) * 3600 + int(ts[14:16]) * 60 + int(ts[17:19]))
+    return result
+
+
+def downsample_rows(rows: List[Dict], max_points: int, method: str = METHOD_LTTB,
+                    value_fields: Optional[List[str]] = None) -> List[Dict]:
+    """
+    행 딕셔너리 목록(시간순)을 max_points개 안팎으로 줄이기
+    Args:
+        method: 'lttb' 또는 'minmax'
+        value_fields: 기준 숫자 필드 (lttb는 첫 번째 필드만 사용)
+    Returns:
+        선택된 행 (상태 필드는 구간 ON 보존을 위해 복사본에 반영)
+    """
+    if max_points <= 0 or len(rows) <= max_points:
+        return rows
+    value_fields = [f for f in (value_fields or [DEFAULT_VALUE_FIELD]) if f in rows[0]] or \
+        [f for f, v in rows[0].items() if isinstance(v, (int, float)) and not isinstance(v, bool)][:1]
+    series = [_numeric_series(row.get(f) for row in rows) for f in value_fields]
+    indices = _select_indices(len(rows), max_points, method, series,
+                              lambda: _epochs(row.get('Timestamp') for row in rows))
+
+    status_fields = [f for f in ON_STATUS_FIELDS if f in rows[0]]
+    result = []
+    for k, idx in enumerate(indices):
+        row = rows[idx]
+        if status_fields:
+            end = indices[k + 1] if k + 1 < len(indices) else idx + 1
+            on = [f for f in status_fields
+                  if row.get(f) != 'ON' and any(rows[j].get(f) == 'ON' for j in range(idx, end))]
+            if on:
+                row = dict(row)
+                for f in on:
+                    row[f] = 'ON'
+        result.append(row)
+    return result
+
+
+def downsample_columns(columns: Dict[str, list], max_points: int, method: str = METHOD_LTTB,
+                       value_fields: Optional[List[str]] = None) -> Dict[str, list]:
+    """
+    열 형식 {필드: 값 목록} (Timestamp는 epoch 초)을 같은 방식으로 줄이기
+    """
+    timestamps = columns.get('Timestamp', [])
+    n = len(timestamps)
+    if max_points <= 0 or n <= max_points:
+        return columns
+    value_fields = [f for f in (value_fields or [DEFAULT_VALUE_FIELD]) if f in columns] or \
+        [f for f, col in columns.items() if f != 'Timestamp' and col and isinstance(col[0], (int, float))
+         and not isinstance(col[0], bool)][:1]
+    series = [_numeric_series(columns[f]) for f in value_fields]
+    indices = _select_indices(n, max_points, method, series, lambda: [float(t) for t in timestamps])
+
+    result = {name: [col[i] for i in indices] for name, col in columns.items()}
+    for field in ON_STATUS_FIELDS:
+        col = columns.get(field)
+        if col is None:
+            continue
+        out = result[field]
+        for k, idx in enumerate(indices):
+            end = indices[k + 1] if k + 1 < len(indices) else idx + 1
+            if out[k] != 'ON' and _on_within(col, idx, end):
+                out[k] = 'ON'
+    return result
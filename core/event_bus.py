@@ -0,0 +1,228 @@
+"""
+프로세스 내부 이벤트 버스 (발행/구독)
+- 토픽: sensor.frame(센서 프레임), actuator.changed(구동계 상태 변경), emergency(비상 정지)
+- 구독자마다 크기가 제한된 큐를 가짐. 가득 차면 정책에 따라 버리거나 병합(coalesce)
+- 발행은 절대 블로킹되지 않음 (느린 구독자가 수신 루프를 막지 않도록)
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 토픽
+TOPIC_SENSOR_FRAME = 'sensor.frame'
+TOPIC_ACTUATOR_CHANGED = 'actuator.changed'
+TOPIC_EMERGENCY = 'emergency'
+
+# 큐가 가득 찼을 때의 정책
+POLICY_DROP_OLDEST = 'drop_oldest'  # 가장 오래된 이벤트를 버리고 새 이벤트 추가
+POLICY_DROP_NEWEST = 'drop_newest'  # 새 이벤트를 버림
+POLICY_COALESCE = 'coalesce'        # 같은 키(기본: 토픽)의 이벤트는 최신 것 하나만 유지
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class Event:
+    """버스로 전달되는 이벤트"""
+    __slots__ = ('topic', 'payload', 'seq', 'ts')
+
+    def __init__(self, topic: str, payload: Any, seq: int, ts: float):
+        self.topic = topic
+        self.payload = payload
+        self.seq = seq  # 버스 전체 발행 순번
+        self.ts = ts    # 발행 시각 (time.monotonic)
+
+    def __repr__(self):
+        return f"Event({self.topic}, seq={self.seq}, payload={self.payload!r})"
+
+
+class Subscription:
+    """
+    구독자별 이벤트 큐
+
+    사용 예:
+        sub = event_bus.subscribe([TOPIC_SENSOR_FRAME], policy=POLICY_COALESCE)
+        while not stop_event.is_set():
+            for event in sub.drain(timeout=1.0):
+                ...
+        sub.close()
+    """
+
+    def __init__(self, bus: 'EventBus', topics: Iterable[str], maxsize: int, policy: str,
+                 key_fn: Optional[Callable[[Event], Any]], name: Optional[str]):
+        if policy not in (POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_COALESCE):
+            raise ValueError(f"알 수 없는 큐 정책: {policy}")
+        self._bus = bus
+        self.topics = frozenset(topics)
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.name = name or ','.join(sorted(self.topics))
+        self._key_fn = key_fn or (lambda event: event.topic)
+        self._cond = threading.Condition()
+        # 병합 정책은 키별 최신 이벤트만 보관 (삽입 순서 유지)
+        self._items = OrderedDict() if policy == POLICY_COALESCE else deque()
+        self.closed = False
+
+        # 통계
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def _offer(self, event: Event) -> None:
+        """버스에서 호출 (블로킹 없음)"""
+        with self._cond:
+            if self.closed:
+                return
+            items = self._items
+            if self.policy == POLICY_COALESCE:
+                key = self._key_fn(event)
+                if key in items:
+                    # 이전 이벤트를 최신 값으로 교체하고 순서는 맨 뒤로
+                    del items[key]
+                    self.coalesced += 1
+                elif len(items) >= self.maxsize:
+                    items.popitem(last=False)
+                    self.dropped += 1
+                items[key] = event
+            else:
+                if len(items) >= self.maxsize:
+                    self.dropped += 1
+                    if self.policy == POLICY_DROP_NEWEST:
+                        return
+                    items.popleft()
+                items.append(event)
+            self.delivered += 1
+            self._cond.notify()
+
+    def _pop(self) -> Event:
+        if self.policy == POLICY_COALESCE:
+            return self._items.popitem(last=False)[1]
+        return self._items.popleft()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        이벤트 하나 꺼내기
+        Returns: 이벤트 또는 None (타임아웃/구독 종료)
+        """
+        with self._cond:
+            if not self._items and not self.closed:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            return self._pop()
+
+    def drain(self, timeout: Optional[float] = None) -> List[Event]:
+        """
+        이벤트가 올 때까지(최대 timeout초) 기다린 뒤 쌓인 이벤트를 모두 꺼내기
+        Returns: 이벤트 목록 (타임아웃 시 빈 목록)
+        """
+        with self._cond:
+            if not self._items and not self.closed:
+                self._cond.wait(timeout)
+            events = []
+            while self._items:
+                events.append(self._pop())
+            return events
+
+    @property
+    def pending(self) -> int:
+        return len(self._items)
+
+    def close(self) -> None:
+        """구독 해제 (대기 중인 get/drain은 즉시 반환)"""
+        self._bus.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._items.clear()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'pending': self.pending,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class EventBus:
+    """
+    토픽 기반 발행/구독 버스
+    - 구독자 목록은 복사 후 교체 방식이라 publish()는 락 없이 순회
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, tuple] = {}
+        self._seq = itertools.count(1)
+        self.published_counts: Dict[str, int] = {}
+
+    def subscribe(self, topics: Iterable[str], maxsize: int = DEFAULT_QUEUE_SIZE,
+                  policy: str = POLICY_DROP_OLDEST,
+                  key_fn: Optional[Callable[[Event], Any]] = None,
+                  name: Optional[str] = None) -> Subscription:
+        """
+        토픽 구독
+        Args:
+            topics: 구독할 토픽 목록
+            maxsize: 큐 최대 길이 (병합 정책에서는 최대 키 개수)
+            policy: POLICY_DROP_OLDEST / POLICY_DROP_NEWEST / POLICY_COALESCE
+            key_fn: 병합 키 함수 (기본: 토픽별 최신 이벤트 하나)
+            name: 통계 표시용 이름
+        """
+        if isinstance(topics, str):
+            topics = [topics]
+        sub = Subscription(self, topics, maxsize, policy, key_fn, name)
+        with self._lock:
+            subscribers = dict(self._subscribers)
+            for topic in sub.topics:
+                subscribers[topic] = subscribers.get(topic, ()) + (sub,)
+            self._subscribers = subscribers
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subscribers = {}
+            for topic, subs in self._subscribers.items():
+                remaining = tuple(s for s in subs if s is not sub)
+                if remaining:
+                    subscribers[topic] = remaining
+            self._subscribers = subscribers
+
+    def publish(self, topic: str, payload: Any = None) -> int:
+        """
+        이벤트 발행 (블로킹 없음)
+        Returns: 전달된 구독자 수
+        """
+        self.published_counts[topic] = self.published_counts.get(topic, 0) + 1
+        subs = self._subscribers.get(topic)
+        if not subs:
+            return 0
+        event = Event(topic, payload, next(self._seq), time.monotonic())
+        for sub in subs:
+            sub._offer(event)
+        return len(subs)
+
+    def stats(self) -> Dict:
+        """토픽별 발행 수 및 구독자별 큐 통계"""
+        seen = {}
+        for subs in self._subscribers.values():
+            for sub in subs:
+                seen[id(sub)] = sub
+        return {
+            'published': dict(self.published_counts),
+            'subscribers': [sub.stats() for sub in seen.values()],
+        }
+
+
+# 프로세스 전역 버스 (main.py, automation, 웹 서버가 공유)
+event_bus = EventBus()
@@ -0,0 +1,369 @@
+"""
+다중 보드 수신 허브
+- 포트 테이블(config.SENSOR_BOARDS / config.ACTUATOR_BOARDS)의 모든 보드를 하나의 selector 루프에서 처리
+- 포트마다 스레드를 만들지 않음
+- 보드별 수신률/오류/재연결 카운터 관리
+"""
+import selectors
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import serial
+
+from .logger import app_logger
+from .serial_reader import SerialLineReader, READ_CHUNK_BYTES
+
+ROLE_SENSOR = 'sensor'
+ROLE_ACTUATOR = 'actuator'
+
+# 아두이노는 포트를 열면 재부팅되므로 안정화 대기 (초)
+BOARD_SETTLE_SEC = 2.0
+# 보드 재연결 간격 (초)
+RECONNECT_INTERVAL_SEC = 5.0
+# 보드 통계 로그 주기 (초)
+STATS_LOG_INTERVAL_SEC = 600
+
+
+class BoardStats:
+    """보드별 수신 통계"""
+    __slots__ = ('rx_lines', 'rx_bytes', 'errors', 'handler_errors', 'reconnects',
+                 'last_rx_monotonic', 'interval_ewma')
+
+    def __init__(self):
+        self.rx_lines = 0
+        self.rx_bytes = 0
+        self.errors = 0  # 시리얼 I/O 오류
+        self.handler_errors = 0  # 줄 처리 콜백 예외
+        self.reconnects = 0
+        self.last_rx_monotonic = 0.0
+        self.interval_ewma = 0.0  # 줄 간격 지수이동평균 (초)
+
+    def on_line(self, now: float):
+        if self.last_rx_monotonic:
+            interval = now - self.last_rx_monotonic
+            if self.interval_ewma:
+                self.interval_ewma += 0.2 * (interval - self.interval_ewma)
+            else:
+                self.interval_ewma = interval
+        self.last_rx_monotonic = now
+        self.rx_lines += 1
+
+    def rx_rate(self) -> float:
+        """초당 수신 줄 수"""
+        return 1.0 / self.interval_ewma if self.interval_ewma > 0 else 0.0
+
+
+class LinkSerial:
+    """
+    보드의 현재 시리얼 포트를 가리키는 전송용 프록시 (send_cmd의 ser 인자로 사용)
+    - 허브가 재연결하면 link.ser가 새 Serial로 바뀌므로 전송 쪽은 항상 현재 포트에 씀
+    - 연결이 끊겼거나 재부팅 대기 중이면 is_open이 False (send_cmd가 전송하지 않음)
+    """
+
+    def __init__(self, link: 'BoardLink'):
+        self._link = link
+
+    @property
+    def is_open(self) -> bool:
+        return self._link.is_connected and time.monotonic() >= self._link.settle_until
+
+    def _current(self):
+        ser = self._link.ser
+        if ser is None:
+            raise serial.SerialException(f"{self._link.board_id} 연결 끊김 ({self._link.port})")
+        return ser
+
+    def write(self, data):
+        return self._current().write(data)
+
+    def flush(self):
+        self._current().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+    def __repr__(self):
+        return f"LinkSerial({self._link.board_id}, {self._link.port})"
+
+
+class BoardLink:
+    """포트 테이블의 보드 한 개"""
+
+    def __init__(self, board_id: str, port: str, zone: str, role: str, baud_rate: int):
+        self.board_id = board_id
+        self.port = port
+        self.zone = zone
+        self.role = role
+        self.baud_rate = baud_rate
+        self.ser = None
+        self.reader: Optional[SerialLineReader] = None
+        self.write_lock = threading.Lock()  # 명령 전송용 락 (send_cmd의 lock 인자로 사용)
+        self.command_port = LinkSerial(self)  # 명령 전송용 포트 (재연결 후에도 같은 객체)
+        self.stats = BoardStats()
+        self.settle_until = 0.0  # 이 시각 이후 selector에 등록
+        self.next_retry = 0.0  # 재연결 시도 시각 (0이면 재연결 불필요)
+        self.error_streak = 0  # 수신 복구 전까지 연속 I/O 오류 수 (첫 오류만 로그)
+        self.last_frame = None  # 마지막으로 파싱된 센서 프레임 (수신 처리기가 설정)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.ser is not None and self.ser.is_open
+
+    def __repr__(self):
+        return f"BoardLink({self.board_id}, {self.role}, {self.port}, zone={self.zone})"
+
+
+class IngestionHub:
+    """
+    여러 센서/액추에이터 보드를 하나의 selector 루프로 다중화하는 수신 허브
+
+    사용 예:
+        hub = IngestionHub.from_config(on_line=handle_line)
+        hub.open_all()
+        threading.Thread(target=hub.run, args=(stop_event,), daemon=True).start()
+    """
+
+    def __init__(self, sensor_boards: List[Dict], actuator_boards: List[Dict], baud_rate: int,
+                 on_line: Optional[Callable[[BoardLink, str], None]] = None):
+        """
+        Args:
+            sensor_boards: [{'id': 'A', 'port': '/dev/ttyBoardA', 'zone': 'main'}, ...]
+            actuator_boards: [{'id': 'B', 'port': '/dev/ttyBoardB', 'zone': 'main'}, ...]
+            baud_rate: 기본 통신 속도 (보드 항목에 'baud'가 있으면 우선)
+            on_line: 수신 줄 콜백 (link, line)
+        """
+        self.links: Dict[str, BoardLink] = {}
+        for role, boards in ((ROLE_SENSOR, sensor_boards), (ROLE_ACTUATOR, actuator_boards)):
+            for board in boards:
+                link = BoardLink(board['id'], board['port'], board.get('zone', 'main'), role,
+                                 board.get('baud', baud_rate))
+                self.links[link.board_id] = link
+        self.on_line = on_line
+        self._selector = selectors.DefaultSelector()
+        self._registered = set()
+
+    @classmethod
+    def from_config(cls, config, on_line=None) -> 'IngestionHub':
+        """config 모듈의 포트 테이블로 허브 생성 (테이블이 없으면 PORT_A/PORT_B 사용)"""
+        sensor_boards = getattr(config, 'SENSOR_BOARDS', None) or [{'id': 'A', 'port': config.PORT_A, 'zone': 'main'}]
+        actuator_boards = getattr(config, 'ACTUATOR_BOARDS', None) or [{'id': 'B', 'port': config.PORT_B, 'zone': 'main'}]
+        return cls(sensor_boards, actuator_boards, config.BAUD_RATE, on_line)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def sensor_links(self) -> List[BoardLink]:
+        return [link for link in self.links.values() if link.role == ROLE_SENSOR]
+
+    def actuator_links(self) -> List[BoardLink]:
+        return [link for link in self.links.values() if link.role == ROLE_ACTUATOR]
+
+    def actuator_for_zone(self, zone: str) -> Optional[BoardLink]:
+        """구역의 액추에이터 보드 (없으면 첫 번째 액추에이터 보드)"""
+        actuators = self.actuator_links()
+        for link in actuators:
+            if link.zone == zone:
+                return link
+        return actuators[0] if actuators else None
+
+    def stats(self) -> Dict[str, Dict]:
+        """보드별 통계"""
+        now = time.monotonic()
+        result = {}
+        for link in self.links.values():
+            st = link.stats
+            result[link.board_id] = {
+                'role': link.role,
+                'zone': link.zone,
+                'port': link.port,
+                'connected': link.is_connected,
+                'rx_lines': st.rx_lines,
+                'rx_bytes': st.rx_bytes,
+                'rx_rate': round(st.rx_rate(), 3),
+                'errors': st.errors,
+                'handler_errors': st.handler_errors,
+                'reconnects': st.reconnects,
+                'last_rx_age_sec': round(now - st.last_rx_monotonic, 1) if st.last_rx_monotonic else None,
+            }
+        return result
+
+    # ------------------------------------------------------------------
+    # 연결 관리
+    # ------------------------------------------------------------------
+    def _open(self, link: BoardLink) -> bool:
+        try:
+            link.ser = serial.Serial(link.port, link.baud_rate, timeout=1)
+            link.reader = SerialLineReader()
+            link.settle_until = time.monotonic() + BOARD_SETTLE_SEC
+            link.next_retry = 0.0
+            return True
+        except (serial.SerialException, OSError) as e:
+            app_logger.warning(f"[Hub] ⚠️ {link.board_id} 연결 실패 ({link.port}): {e}")
+            link.ser = None
+            return False
+
+    def open_all(self, retry_actuators: bool = True):
+        """
+        모든 보드 연결 (재부팅 대기는 보드마다가 아니라 한 번만 수행)
+        - 연결 실패: run() 루프에서 주기적으로 재연결
+        - 액추에이터 보드는 retry_actuators면 utils.reconnect_serial로 먼저 재시도 (기존 동작)
+        """
+        from .utils import reconnect_serial
+
+        for link in self.links.values():
+            if not self._open(link):
+                link.next_retry = time.monotonic() + RECONNECT_INTERVAL_SEC
+
+        if any(link.ser for link in self.links.values()):
+            time.sleep(BOARD_SETTLE_SEC)  # 아두이노 재부팅 대기
+
+        for link in self.links.values():
+            if link.ser:
+                try:
+                    link.ser.reset_input_buffer()
+                    link.ser.reset_output_buffer()
+                    app_logger.info(f"[Hub] {link.board_id} 연결 성공: {link.port} ({link.role}, zone={link.zone})")
+                except (serial.SerialException, OSError) as e:
+                    app_logger.warning(f"[Hub] ⚠️ {link.board_id} 버퍼 초기화 실패: {e}")
+            elif link.role == ROLE_ACTUATOR and retry_actuators:
+                app_logger.info(f"[Hub] {link.board_id} 재연결 시도 중...")
+                link.ser = reconnect_serial(link.port, link.baud_rate)
+                if link.ser:
+                    link.reader = SerialLineReader()
+                    link.next_retry = 0.0
+                    app_logger.info(f"[Hub] {link.board_id} 재연결 성공: {link.port}")
+                else:
+                    link.next_retry = time.monotonic() + RECONNECT_INTERVAL_SEC
+
+    def _register(self, link: BoardLink):
+        try:
+            self._selector.register(link.ser.fileno(), selectors.EVENT_READ, link)
+            self._registered.add(link.board_id)
+        except (AttributeError, NotImplementedError, OSError, ValueError, KeyError) as e:
+            app_logger.error(f"[Hub] ❌ {link.board_id} selector 등록 실패: {e}")
+
+    def _unregister(self, link: BoardLink):
+        if link.board_id in self._registered:
+            self._registered.discard(link.board_id)
+            try:
+                self._selector.unregister(link.ser.fileno())
+            except (KeyError, ValueError, OSError):
+                pass
+
+    def _on_io_error(self, link: BoardLink, error: Exception):
+        """
+        시리얼 I/O 오류 처리: 포트를 닫고 RECONNECT_INTERVAL_SEC 뒤 재연결 (센서/액추에이터 공통)
+        - 전송 쪽은 link.command_port로 현재 포트를 참조하므로 재연결된 새 포트에 바로 씀
+        - 액추에이터 포트는 전송 중일 수 있으므로 write_lock을 잡고 닫음
+        - 로그는 연속 오류의 첫 번째만 (SD 카드 보호), 수신이 복구되면 횟수와 함께 기록
+        """
+        link.stats.errors += 1
+        link.error_streak += 1
+        if link.error_streak == 1:
+            app_logger.error(f"[Hub] {link.board_id} 시리얼 통신 오류: {error} "
+                             f"({RECONNECT_INTERVAL_SEC:.0f}초 간격으로 재시도)")
+        else:
+            app_logger.debug(f"[Hub] {link.board_id} 시리얼 통신 오류 (연속 {link.error_streak}회): {error}")
+        self._unregister(link)
+        with link.write_lock:
+            try:
+                link.ser.close()
+            except Exception:
+                pass
+            link.ser = None
+        link.next_retry = time.monotonic() + RECONNECT_INTERVAL_SEC
+
+    def _service_connections(self, now: float):
+        """재연결 및 안정화 완료된 포트 등록"""
+        for link in self.links.values():
+            if link.ser is None:
+                if link.next_retry and now >= link.next_retry:
+                    if self._open(link):
+                        link.stats.reconnects += 1
+                        app_logger.info(f"[Hub] 🔄 {link.board_id} 재연결됨 ({link.port}), 안정화 대기")
+                    else:
+                        link.next_retry = now + RECONNECT_INTERVAL_SEC
+            elif link.board_id not in self._registered and now >= link.settle_until and link.ser.is_open:
+                if link.settle_until:
+                    try:
+                        link.ser.reset_input_buffer()
+                    except (serial.SerialException, OSError):
+                        pass
+                    link.settle_until = 0.0
+                self._register(link)
+
+    def _next_deadline(self, now: float) -> float:
+        """다음 연결 관리 작업까지 남은 시간 (select 타임아웃)"""
+        timeout = 0.5  # stop_event 확인 주기
+        for link in self.links.values():
+            if link.ser is None and link.next_retry > now:
+                timeout = min(timeout, link.next_retry - now)
+            elif link.ser is not None and link.settle_until > now:
+                timeout = min(timeout, link.settle_until - now)
+        return timeout
+
+    # ------------------------------------------------------------------
+    # 수신 루프
+    # ------------------------------------------------------------------
+    def _read_link(self, link: BoardLink):
+        try:
+            chunk = link.ser.read(min(max(link.ser.in_waiting, 1), READ_CHUNK_BYTES))
+        except (serial.SerialException, OSError) as e:
+            self._on_io_error(link, e)
+            return
+        if not chunk:
+            return
+        if link.error_streak:
+            app_logger.info(f"[Hub] ✅ {link.board_id} 수신 복구 (연속 오류 {link.error_streak}회)")
+            link.error_streak = 0
+
+        link.stats.rx_bytes += len(chunk)
+        lines = link.reader.feed(chunk)
+        if not lines:
+            return
+        now = time.monotonic()
+        for line in lines:
+            link.stats.on_line(now)
+            if self.on_line is None:
+                continue
+            try:
+                self.on_line(link, line)
+            except Exception as e:
+                link.stats.handler_errors += 1
+                app_logger.error(f"[Hub] {link.board_id} 수신 처리 오류: {e}, line={line}")
+
+    def run(self, stop_event):
+        """stop_event가 설정될 때까지 모든 보드를 하나의 루프에서 처리"""
+        app_logger.info(f"[Hub] 수신 허브 가동: {', '.join(repr(link) for link in self.links.values())}")
+        last_stats_log = time.monotonic()
+
+        while not stop_event.is_set():
+            now = time.monotonic()
+            self._service_connections(now)
+
+            if not self._registered:
+                stop_event.wait(max(self._next_deadline(now), 0.01))
+                continue
+
+            for key, _ in self._selector.select(self._next_deadline(now)):
+                self._read_link(key.data)
+
+            if now - last_stats_log >= STATS_LOG_INTERVAL_SEC:
+                last_stats_log = now
+                app_logger.info(f"[Hub] 📊 보드 통계: {self.stats()}")
+
+    def close_all(self):
+        """selector 해제 및 모든 포트 닫기"""
+        for link in self.links.values():
+            self._unregister(link)
+            if link.ser and link.ser.is_open:
+                try:
+                    link.ser.close()
+                    app_logger.info(f"[Hub] {link.board_id} 시리얼 포트 닫힘")
+                except Exception as e:
+                    app_logger.error(f"[Hub] {link.board_id} 닫기 오류: {e}")
+        try:
+            self._selector.close()
+        except Exception:
+            pass
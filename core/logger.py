@@ -5,6 +5,8 @@ import queue
 import time
 import logging
 import shutil
+import threading
+from collections import deque
 from datetime import datetime
 import config  # 설정 파일 불러오기
 
@@ -14,13 +16,39 @@ app_logger = logging.getLogger('smartfarm')
 # 큐 크기 제한 (메모리 보호)
 MAX_QUEUE_SIZE = 1000
 
-def get_log_path():
+# 센서 데이터 CSV 헤더 (모든 필드 포함: 센서값, 구동계, 계산값, 통계)
+CSV_HEADER = [
+    'Timestamp',
+    # 센서값
+    'Temp_C', 'Hum_Pct', 'Soil_Raw', 'Soil_Pct', 'Lux',
+    # 계산값
+    'VPD_kPa', 'DLI_mol',
+    # 구동계 상태 (ON/OFF)
+    'Valve_Status', 'Fan_Status', 'LED_W_Status', 'LED_P_Status', 'Curtain_Status',
+    # 구동계 값 (속도/밝기 %)
+    'Fan_Speed_Pct', 'LED_W_Brightness_Pct', 'LED_P_Brightness_Pct',
+    # 비상 정지
+    'Emergency_Stop',
+    # 일일 통계
+    'Watering_Count_Today', 'Water_Used_Today_L'
+]
+
+# 기록 통계 로그 주기 (초)
+WRITER_STATS_INTERVAL = 600
+
+# 최신값 캐시에 보관할 최근 행 수 (10초 간격 기준 1시간)
+LATEST_CACHE_ROWS = 360
+
+def get_log_path(date_str=None):
     """
     월별 폴더 구조로 로그 파일 경로 생성
+    Args:
+        date_str: 'YYYY-MM-DD' (None이면 오늘)
     Returns: (log_dir, filename)
     """
-    now = datetime.now()
-    month_dir = now.strftime('%Y-%m')  # YYYY-MM 형식
+    if date_str is None:
+        date_str = datetime.now().strftime('%Y-%m-%d')
+    month_dir = date_str[:7]  # YYYY-MM 형식
     log_dir = os.path.join(config.LOG_DIR, month_dir)
     
     # 월별 폴더 생성
@@ -32,8 +60,7 @@ def get_log_path():
         log_dir = config.LOG_DIR
         os.makedirs(log_dir, exist_ok=True)
     
-    today_str = now.strftime('%Y-%m-%d')
-    filename = os.path.join(log_dir, f"smartfarm_log_{today_str}.csv")
+    filename = os.path.join(log_dir, f"smartfarm_log_{date_str}.csv")
     
     return log_dir, filename
 
@@ -136,7 +163,9 @@ def cleanup_old_files():
         logs_data_size = get_folder_size(config.LOG_DIR) if os.path.exists(config.LOG_DIR) else 0
         logs_system_size = get_folder_size(config.LOG_SYSTEM_DIR) if os.path.exists(config.LOG_SYSTEM_DIR) else 0
         images_size = get_folder_size(config.IMG_DIR) if os.path.exists(config.IMG_DIR) else 0
-        storage_total_gb = (logs_data_size + logs_system_size + images_size) / (1024**3)
+        tiers_size = get_folder_size(config.TIER_DIR) if os.path.exists(config.TIER_DIR) else 0
+        columnar_size = get_folder_size(config.COLUMNAR_DIR) if os.path.exists(config.COLUMNAR_DIR) else 0
+        storage_total_gb = (logs_data_size + logs_system_size + images_size + tiers_size + columnar_size) / (1024**3)
         
         app_logger.debug(f"[Logger] 💾 디스크 상태: 여유={free_gb:.2f}GB, logs_data+logs_system+images={storage_total_gb:.2f}GB")
         
@@ -193,6 +222,32 @@ def cleanup_old_files():
                         except (OSError, IOError):
                             pass
         
+        # 계층형 기록 폴더 (원본 세그먼트 .bin, 롤업 .csv)
+        if os.path.exists(config.TIER_DIR):
+            for root, dirs, files in os.walk(config.TIER_DIR):
+                for file in files:
+                    if file.endswith(('.csv', '.bin')):
+                        filepath = os.path.join(root, file)
+                        try:
+                            mtime = os.path.getmtime(filepath)
+                            files_to_delete.append((mtime, filepath, 'tier'))
+                        except (OSError, IOError):
+                            pass
+        
+        # 컬럼형 로그 (하루 단위 폴더: 열 파일을 따로 지우면 그날 데이터가 깨지므로 폴더째 삭제)
+        if os.path.exists(config.COLUMNAR_DIR):
+            for month_dir in os.listdir(config.COLUMNAR_DIR):
+                month_path = os.path.join(config.COLUMNAR_DIR, month_dir)
+                if not os.path.isdir(month_path):
+                    continue
+                for day in os.listdir(month_path):
+                    day_path = os.path.join(month_path, day)
+                    if os.path.isdir(day_path):
+                        try:
+                            files_to_delete.append((os.path.getmtime(day_path), day_path, 'columnar'))
+                        except (OSError, IOError):
+                            pass
+        
         # images 폴더의 모든 이미지 파일
         if os.path.exists(config.IMG_DIR):
             for root, dirs, files in os.walk(config.IMG_DIR):
@@ -219,7 +274,9 @@ def cleanup_old_files():
             logs_data_size = get_folder_size(config.LOG_DIR) if os.path.exists(config.LOG_DIR) else 0
             logs_system_size = get_folder_size(config.LOG_SYSTEM_DIR) if os.path.exists(config.LOG_SYSTEM_DIR) else 0
             images_size = get_folder_size(config.IMG_DIR) if os.path.exists(config.IMG_DIR) else 0
-            storage_total_gb = (logs_data_size + logs_system_size + images_size) / (1024**3)
+            tiers_size = get_folder_size(config.TIER_DIR) if os.path.exists(config.TIER_DIR) else 0
+            columnar_size = get_folder_size(config.COLUMNAR_DIR) if os.path.exists(config.COLUMNAR_DIR) else 0
+            storage_total_gb = (logs_data_size + logs_system_size + images_size + tiers_size + columnar_size) / (1024**3)
             
             # 목표 달성: 여유공간 확보 + 저장소 용량 제한 준수
             if free_gb >= config.DISK_MIN_FREE_GB and storage_total_gb <= config.STORAGE_LIMIT_GB:
@@ -227,8 +284,16 @@ def cleanup_old_files():
             
             # 파일 삭제
             try:
-                file_size = os.path.getsize(filepath)
-                os.remove(filepath)
+                if os.path.isdir(filepath):
+                    file_size = get_folder_size(filepath)
+                    shutil.rmtree(filepath)
+                else:
+                    file_size = os.path.getsize(filepath)
+                    os.remove(filepath)
+                    # CSV 사이드카 인덱스도 함께 삭제
+                    if file_type == 'log_data' and os.path.exists(filepath + '.idx'):
+                        file_size += os.path.getsize(filepath + '.idx')
+                        os.remove(filepath + '.idx')
                 deleted_count += 1
                 deleted_size += file_size
                 app_logger.info(f"[Logger] 🗑️ 삭제: {os.path.basename(filepath)} ({file_size/(1024**2):.2f}MB)")
@@ -281,6 +346,266 @@ def cleanup_old_files():
     except Exception as e:
         app_logger.error(f"[Logger] 용량 관리 오류: {e}")
 
+def _oldest_log_date():
+    """logs_data에 남아 있는 가장 오래된 CSV 날짜 (YYYY-MM-DD, 없으면 None)"""
+    oldest = None
+    if os.path.exists(config.LOG_DIR):
+        for root, dirs, files in os.walk(config.LOG_DIR):
+            for file in files:
+                if file.startswith('smartfarm_log_') and file.endswith('.csv'):
+                    date_str = file[len('smartfarm_log_'):-len('.csv')]
+                    if oldest is None or date_str < oldest:
+                        oldest = date_str
+    return oldest
+
+def prune_sqlite_store(sqlite_store):
+    """
+    SQLite 로그를 CSV 보존 범위에 맞춤 (용량 관리 후 로거 스레드가 주기적으로 호출)
+    - 남아 있는 가장 오래된 CSV 날짜 이전의 행 삭제 (빈 페이지는 파일을 줄이지 않고 이후 기록에 재사용)
+    - WAL 체크포인트(TRUNCATE)로 WAL 파일이 계속 커지지 않게 함
+    """
+    try:
+        cutoff = _oldest_log_date()
+        if cutoff:
+            deleted = sqlite_store.delete_before(cutoff)
+            if deleted:
+                app_logger.info(f"[Logger] 🗑️ SQLite 로그 정리: {cutoff} 이전 {deleted}행 삭제")
+        sqlite_store.checkpoint()
+    except Exception as e:
+        app_logger.error(f"[Logger] SQLite 로그 정리 오류: {e}")
+
+class LatestRowCache:
+    """
+    로거가 방금 기록한 최근 행 캐시 (웹 서버의 최신값 조회용)
+    - 로거 스레드가 배치를 기록할 때마다 갱신하므로 항상 파일과 같은 시점
+    - 값은 CSV에 기록된 문자열 그대로 보관 (DictReader 결과와 동일한 형태로 반환)
+    - 같은 프로세스 안에서만 유효: 비어 있으면 호출 측이 파일 끝 읽기로 대체
+    """
+
+    def __init__(self, maxlen=LATEST_CACHE_ROWS, header=None):
+        self.header = header or CSV_HEADER
+        self._rows = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def extend(self, rows):
+        values = [tuple('' if v is None else str(v) for v in row) for row in rows]
+        with self._lock:
+            self._rows.extend(values)
+
+    def get(self, n):
+        """최근 n개 행 (오래된 것부터). 캐시에 n개가 없으면 None"""
+        with self._lock:
+            if n <= 0 or len(self._rows) < n:
+                return None
+            rows = [self._rows[-i] for i in range(n, 0, -1)]
+        return [dict(zip(self.header, row)) for row in rows]
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def __len__(self):
+        return len(self._rows)
+
+
+# 모듈 싱글톤 (logger_thread_func가 갱신, DataReader.get_latest_rows가 조회)
+latest_rows = LatestRowCache()
+
+
+class CsvLogWriter:
+    """
+    일일 CSV 로그 기록기 (파일 핸들 유지)
+    - 그날의 파일은 한 번만 열고, 날짜가 바뀔 때만 교체
+    - 배치 단위로 writerows + flush, fsync는 설정한 주기로만 수행
+    - 행의 날짜는 Timestamp 열(YYYY-MM-DD ...) 기준 (자정 직전 행이 다음날 파일로 가지 않도록)
+    """
+
+    def __init__(self, fsync_interval=None, header=None, path_fn=None, index_every=None):
+        """
+        Args:
+            fsync_interval: fsync 주기 (초). 0이면 매 배치, None이면 하지 않음
+            header: 새 파일 헤더 (기본: CSV_HEADER)
+            path_fn: 날짜 → (dir, path) 함수 (기본: get_log_path)
+            index_every: N행마다 사이드카 오프셋 인덱스(.csv.idx) 기록 (None이면 인덱스 없음)
+        """
+        self.index_every = index_every
+        self._index = None
+        self.fsync_interval = fsync_interval
+        self.header = header or CSV_HEADER
+        self.path_fn = path_fn or get_log_path
+        self._file = None
+        self._writer = None
+        self._date = None
+        self.path = None
+        self._last_fsync = time.monotonic()
+
+        # 통계
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.batches_written = 0
+        self.started_at = time.monotonic()
+        self._window_start = self.started_at
+        self._window_rows = 0
+        self._window_bytes = 0
+
+    def _open(self, date_str):
+        """해당 날짜의 파일을 추가 모드로 열기 (새 파일이면 헤더 기록)"""
+        self.close()
+        _, path = self.path_fn(date_str)
+        f = open(path, 'a', newline='', encoding='utf-8')
+        try:
+            writer = csv.writer(f)
+            if f.tell() == 0:
+                writer.writerow(self.header)
+        except Exception:
+            f.close()
+            raise
+        self._file = f
+        self._writer = writer
+        self._date = date_str
+        self.path = path
+        if self.index_every:
+            from .csv_index import CsvIndexWriter
+            try:
+                self._index = CsvIndexWriter(path, self.index_every)
+            except (OSError, IOError) as e:
+                # 인덱스는 보조 정보이므로 실패해도 CSV 기록은 계속 (읽는 쪽이 스캔으로 대체)
+                app_logger.error(f"[Logger] 인덱스 열기 실패: {e}")
+                self._index = None
+        app_logger.info(f"[Logger] 📝 로그 파일 열기: {path}")
+
+    def write_rows(self, rows):
+        """
+        여러 행 기록 (날짜별로 묶어서 writerows 한 번씩)
+        Returns: 기록한 바이트 수
+        """
+        if not rows:
+            return 0
+        written = 0
+        start = 0
+        n = len(rows)
+        while start < n:
+            date_str = str(rows[start][0])[:10]
+            end = start + 1
+            while end < n and str(rows[end][0])[:10] == date_str:
+                end += 1
+            if date_str != self._date or self._file is None:
+                self._open(date_str)
+            pos = self._file.tell()
+            if self._index is None:
+                self._writer.writerows(rows[start:end])
+            else:
+                self._write_indexed(rows[start:end])
+            self._file.flush()  # 웹 서버(DataReader)가 바로 읽을 수 있도록 OS까지는 매 배치 전달
+            if self._index is not None:
+                self._index.flush()  # CSV 내용이 먼저 반영된 뒤 인덱스 반영
+            written += self._file.tell() - pos
+            start = end
+
+        if self.fsync_interval is not None:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+        self.rows_written += n
+        self.bytes_written += written
+        self.batches_written += 1
+        self._window_rows += n
+        self._window_bytes += written
+        return written
+
+    def _write_indexed(self, rows):
+        """인덱스 경계(N행마다)에서만 오프셋을 기록하며 writerows"""
+        index = self._index
+        i = 0
+        while i < len(rows):
+            k = index.rows_until_mark()
+            if k == 0:
+                self._file.flush()
+                index.mark(rows[i][0], self._file.buffer.tell())
+                k = index.every
+            chunk = rows[i:i + k]
+            self._writer.writerows(chunk)
+            index.advance(len(chunk))
+            i += len(chunk)
+
+    def sync(self):
+        """버퍼를 디스크까지 강제 기록"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._last_fsync = time.monotonic()
+
+    def close(self):
+        """현재 파일 닫기 (닫기 전 fsync)"""
+        if self._file is None:
+            return
+        try:
+            self.sync()
+        except (OSError, IOError) as e:
+            app_logger.error(f"[Logger] fsync 실패: {e}")
+        finally:
+            try:
+                self._file.close()
+            except (OSError, IOError):
+                pass
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+            self._file = None
+            self._writer = None
+            self._date = None
+
+    def stats(self, reset_window=True):
+        """
+        기록 통계 (rows/s, bytes/s는 마지막 stats() 호출 이후 구간 기준)
+        """
+        now = time.monotonic()
+        window = max(now - self._window_start, 1e-6)
+        result = {
+            'rows_written': self.rows_written,
+            'bytes_written': self.bytes_written,
+            'batches_written': self.batches_written,
+            'rows_per_sec': round(self._window_rows / window, 3),
+            'bytes_per_sec': round(self._window_bytes / window, 1),
+            'avg_rows_per_batch': round(self.rows_written / self.batches_written, 2) if self.batches_written else 0,
+            'path': self.path,
+        }
+        if reset_window:
+            self._window_start = now
+            self._window_rows = 0
+            self._window_bytes = 0
+        return result
+
+
+def drain_batch(data_queue, max_rows, max_wait_sec, first_timeout=1.0):
+    """
+    큐에서 한 배치 꺼내기
+    - 첫 항목은 first_timeout까지 대기, 이후 max_rows개가 찰 때까지 또는 max_wait_sec가 지날 때까지 수집
+    Returns: 항목 목록 (타임아웃 시 빈 목록)
+    """
+    try:
+        batch = [data_queue.get(timeout=first_timeout)]
+    except queue.Empty:
+        return []
+    deadline = time.monotonic() + max_wait_sec
+    while len(batch) < max_rows:
+        try:
+            batch.append(data_queue.get_nowait())
+            continue
+        except queue.Empty:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(data_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
 def logger_thread_func(data_queue, stop_event):
     try:
         if not os.path.exists(config.LOG_DIR):
@@ -299,13 +624,37 @@ def logger_thread_func(data_queue, stop_event):
     last_cleanup_time = time.time()
     CLEANUP_INTERVAL = 3600  # 1시간
     
+    # 배치 기록 설정
+    batch_max_rows = getattr(config, 'LOG_BATCH_MAX_ROWS', 50)
+    batch_max_wait = getattr(config, 'LOG_BATCH_MAX_WAIT_MS', 500) / 1000.0
+    writer = CsvLogWriter(fsync_interval=getattr(config, 'LOG_FSYNC_INTERVAL_SEC', 60),
+                          index_every=getattr(config, 'LOG_INDEX_EVERY_ROWS', None))
+    # 컬럼형 로그는 보조 기록이므로 실패해도 CSV 기록은 계속
+    columnar_writer = None
+    if getattr(config, 'LOG_COLUMNAR', False):
+        from .columnar import ColumnarLogWriter
+        columnar_writer = ColumnarLogWriter()
+    # SQLite 백엔드: 같은 배치를 한 트랜잭션으로 기록 (실패해도 CSV 기록은 계속)
+    sqlite_store = None
+    if getattr(config, 'DATA_BACKEND', 'csv') == 'sqlite':
+        from .sqlite_store import SqliteLogStore
+        sqlite_store = SqliteLogStore()
+    last_stats_time = time.time()
+    
     while not stop_event.is_set():
         try:
             # 주기적 용량 관리
             if time.time() - last_cleanup_time > CLEANUP_INTERVAL:
                 cleanup_old_files()
+                if sqlite_store is not None:
+                    prune_sqlite_store(sqlite_store)
                 last_cleanup_time = time.time()
             
+            # 주기적 기록 통계
+            if time.time() - last_stats_time > WRITER_STATS_INTERVAL:
+                app_logger.info(f"[Logger] 📊 기록 통계: {writer.stats()}")
+                last_stats_time = time.time()
+            
             # 큐 크기 체크 (메모리 보호)
             if data_queue.qsize() > MAX_QUEUE_SIZE:
                 print(f"[Logger] ⚠️ 큐가 가득 참 ({data_queue.qsize()}개). 오래된 데이터 버림.")
@@ -318,45 +667,32 @@ def logger_thread_func(data_queue, stop_event):
                     pass
                 continue
             
-            # 큐에서 데이터 꺼내기 (1초 대기)
-            log_item = data_queue.get(timeout=1)
-            
-            # 월별 폴더 구조로 경로 생성
-            log_dir, filename = get_log_path()
-            file_exists = os.path.isfile(filename)
+            # 큐에서 한 배치 꺼내기 (첫 항목은 1초 대기)
+            batch = drain_batch(data_queue, batch_max_rows, batch_max_wait)
+            if not batch:
+                continue
             
             # 파일 쓰기 (에러 처리 강화)
             try:
-                with open(filename, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    # 헤더가 없으면 생성
-                    if not file_exists:
-                        # 모든 필드 포함: 센서값, 구동계, 계산값, 통계
-                        writer.writerow([
-                            'Timestamp',
-                            # 센서값
-                            'Temp_C', 'Hum_Pct', 'Soil_Raw', 'Soil_Pct', 'Lux',
-                            # 계산값
-                            'VPD_kPa', 'DLI_mol',
-                            # 구동계 상태 (ON/OFF)
-                            'Valve_Status', 'Fan_Status', 'LED_W_Status', 'LED_P_Status', 'Curtain_Status',
-                            # 구동계 값 (속도/밝기 %)
-                            'Fan_Speed_Pct', 'LED_W_Brightness_Pct', 'LED_P_Brightness_Pct',
-                            # 비상 정지
-                            'Emergency_Stop',
-                            # 일일 통계
-                            'Watering_Count_Today', 'Water_Used_Today_L'
-                        ])
-                    writer.writerow(log_item)
-                    f.flush()  # 즉시 디스크에 쓰기
-                
+                writer.write_rows(batch)
+                latest_rows.extend(batch)
                 consecutive_errors = 0  # 성공 시 에러 카운터 리셋
-                data_queue.task_done()
+                if columnar_writer is not None:
+                    try:
+                        columnar_writer.write_rows(batch)
+                    except (OSError, IOError) as e:
+                        app_logger.error(f"[Logger] 컬럼형 로그 기록 실패: {e}")
+                        columnar_writer.close()  # 다음 배치에서 다시 열기
+                if sqlite_store is not None:
+                    try:
+                        sqlite_store.insert_rows(batch)
+                    except Exception as e:
+                        app_logger.error(f"[Logger] SQLite 기록 실패: {e}")
                 
             except (OSError, IOError) as e:
                 consecutive_errors += 1
-                print(f"[Logger Error] 파일 쓰기 실패 (연속 {consecutive_errors}회): {e}")
-                data_queue.task_done()  # 실패해도 task_done 호출
+                print(f"[Logger Error] 파일 쓰기 실패 (연속 {consecutive_errors}회, {len(batch)}행): {e}")
+                writer.close()  # 다음 배치에서 다시 열기
                 
                 if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
                     print(f"[Logger] ⚠️ 연속 {MAX_CONSECUTIVE_ERRORS}회 오류 발생. 로깅 일시 중지.")
@@ -364,9 +700,10 @@ def logger_thread_func(data_queue, stop_event):
                     consecutive_errors = 0
                 else:
                     time.sleep(1)  # 짧은 대기 후 재시도
+            finally:
+                for _ in batch:
+                    data_queue.task_done()  # 실패해도 task_done 호출
                     
-        except queue.Empty:
-            continue
         except Exception as e:
             consecutive_errors += 1
             print(f"[Logger Error] 예상치 못한 오류 (연속 {consecutive_errors}회): {e}")
@@ -374,3 +711,28 @@ def logger_thread_func(data_queue, stop_event):
                 print(f"[Logger] ⚠️ 심각한 오류로 인해 로깅 일시 중지.")
                 time.sleep(60)
                 consecutive_errors = 0
+    
+    # 종료 시 남은 데이터 기록 후 파일 닫기
+    try:
+        remaining = []
+        while True:
+            try:
+                remaining.append(data_queue.get_nowait())
+                data_queue.task_done()
+            except queue.Empty:
+                break
+        if remaining:
+            writer.write_rows(remaining)
+            if columnar_writer is not None:
+                columnar_writer.write_rows(remaining)
+            if sqlite_store is not None:
+                sqlite_store.insert_rows(remaining)
+    except Exception as e:
+        print(f"[Logger Error] 종료 시 남은 데이터 기록 실패: {e}")
+    finally:
+        app_logger.info(f"[Logger] 📊 기록 통계 (종료): {writer.stats()}")
+        writer.close()
+        if columnar_writer is not None:
+            columnar_writer.close()
+        if sqlite_store is not None:
+            sqlite_store.close()
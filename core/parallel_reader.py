@@ -0,0 +1,110 @@
+"""
+여러 날짜 CSV를 작업 프로세스 풀에서 나눠 파싱 (긴 기간 조회용)
+- CSV 파싱은 GIL에 묶여 스레드로는 빨라지지 않으므로 ProcessPoolExecutor 사용
+- 작업 프로세스는 파일 하나를 core.parse_cache.ParsedLog(열별 사전 인코딩 배열)로 만들어 돌려줌
+  (행 딕셔너리보다 전달량이 훨씬 작음, 받은 쪽은 파싱 캐시에 넣어 재사용)
+- 결과는 요청한 순서대로 반환, 동시에 처리 중인 파일은 작업 수 × 2개까지 (메모리 제한)
+- 풀은 처음 쓸 때 forkserver로 생성 (스레드가 많은 제어/웹 프로세스를 fork하지 않음)
+  · 작업 프로세스는 시작할 때 실행 중인 메인 모듈을 한 번 다시 import함 (__main__ 가드 필요)
+  · 작업 프로세스가 죽으면 풀을 버리고 남은 파일은 현재 프로세스에서 파싱
+- 파일 수가 READ_PARALLEL_MIN_FILES 미만이거나 READ_WORKERS <= 1이면 현재 프로세스에서 순서대로 파싱
+"""
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
+
+import config
+from .logger import app_logger
+from .parse_cache import ParsedLog
+
+WORKERS = getattr(config, 'READ_WORKERS', 2)
+MIN_FILES = getattr(config, 'READ_PARALLEL_MIN_FILES', 4)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def parse_file(path: str) -> Optional[tuple]:
+    """(작업 프로세스) CSV 파일 하나 전체 파싱 → ParsedLog.to_parts() (파일이 없으면 None)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    entry = ParsedLog(path, st.st_ino)
+    entry.consume(st.st_size)
+    entry.compact()
+    return entry.to_parts()
+
+
+def get_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """공용 프로세스 풀 (작업 수가 바뀌면 새로 만듦, 만들 수 없으면 None)"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers == workers:
+            return _pool
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+        try:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            _pool_workers = workers
+        except (OSError, ValueError) as e:
+            app_logger.warning(f"[Reader] ⚠️ 파싱 프로세스 풀 생성 실패, 순차 파싱으로 대체: {e}")
+            _pool = None
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def parse_files(paths: List[str], workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[ParsedLog]]]:
+    """파일별 (경로, ParsedLog 또는 None)을 paths 순서대로 반환"""
+    workers = WORKERS if workers is None else workers
+    pool = get_pool(workers) if workers > 1 and len(paths) >= MIN_FILES else None
+    if pool is None:
+        for path in paths:
+            parts = parse_file(path)
+            yield path, ParsedLog.from_parts(parts) if parts else None
+        return
+
+    window = deque()
+    todo = iter(paths)
+    for path in todo:
+        window.append((path, pool.submit(parse_file, path)))
+        if len(window) >= workers * 2:
+            break
+    while window:
+        path, future = window.popleft()
+        try:
+            parts = future.result()
+        except BrokenProcessPool as e:
+            # 작업 프로세스가 죽음 (메모리 부족 등) → 풀을 버리고 남은 파일은 현재 프로세스에서
+            app_logger.warning(f"[Reader] ⚠️ 파싱 프로세스 풀 중단, 순차 파싱으로 대체: {e}")
+            _discard_pool(pool)
+            for rest in [path] + [p for p, _ in window] + list(todo):
+                parts = parse_file(rest)
+                yield rest, ParsedLog.from_parts(parts) if parts else None
+            return
+        next_path = next(todo, None)
+        if next_path is not None:
+            window.append((next_path, pool.submit(parse_file, next_path)))
+        yield path, ParsedLog.from_parts(parts) if parts else None
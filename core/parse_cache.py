@@ -0,0 +1,284 @@
+"""
+CSV 로그 파싱 결과 캐시 (프로세스 전체에서 하나)
+- 파일 경로마다 지금까지 파싱한 바이트 위치(워터마크)와 파싱된 행을 보관
+- 다음 조회 때 파일이 커졌으면 늘어난 끝부분만 파싱 (로거가 쓰는 오늘 파일)
+  · 기록 중인 마지막 줄(줄바꿈 전)은 다음 조회로 미룸
+  · 크기가 줄었거나 inode가 바뀌면(잘림/교체) 처음부터 다시 파싱
+- 행은 열별 사전 인코딩으로 보관: 열마다 값 목록(CSV 문자열 그대로) + 행별 코드 배열(uint16)
+  · Timestamp 열은 행마다 값이 달라 사전 없이 epoch 배열만 보관 (문자열은 조회 시 epoch에서 다시 만듦)
+  · 크기(nbytes)는 새로 추가된 값만 더해 갱신 (조회마다 전체 값을 다시 세지 않음)
+  · 하루(10초 간격 8640행) 약 1MB (행 딕셔너리로 보관할 때의 수십분의 1)
+  · 지난 날짜는 값 → 코드 사전을 버려 더 줄임 (파일이 다시 커지면 값 목록에서 다시 만듦)
+- 최근 사용 순 LRU, 전체 크기가 LOG_PARSE_CACHE_BYTES를 넘으면 오래된 파일부터 제거
+- 배열은 덧붙이기만 하므로 읽는 쪽은 잠금 없이 조회 시점의 행 수까지만 사용
+"""
+import csv
+import io
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import config
+from .csv_index import parse_ts
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def format_ts(epoch: int) -> str:
+    """epoch 초 → 'YYYY-MM-DD HH:MM:SS' (로컬 시각, 로거가 기록하는 형식)"""
+    return '%04d-%02d-%02d %02d:%02d:%02d' % time.localtime(epoch)[:6]
+
+
+class ParsedLog:
+    """CSV 파일 하나의 파싱 결과 (워터마크까지, 열별 사전 인코딩)"""
+
+    def __init__(self, path: str, inode: int):
+        self.path = path
+        self.inode = inode
+        self.offset = 0                # 파싱을 마친 바이트 위치 (완성된 줄의 끝)
+        self.header: List[str] = []
+        self.epochs = array('q')       # 행별 Timestamp (epoch 초)
+        self.tables: List[list] = []   # 열별 값 목록 (CSV 문자열, 빠진 열은 None)
+        self.codes: List[array] = []   # 열별 행 코드 (tables 인덱스)
+        self._lookup: Optional[List[Dict]] = None  # 열별 값 → 코드 (지난 날짜는 None)
+        self._typed: Dict[str, Tuple[int, list]] = {}  # 열 → (값 수, 형식 변환한 값 목록)
+        self.ts_index: Optional[int] = None  # Timestamp 열 위치 (이 열은 tables/codes를 비워 둠)
+        self._value_bytes = 0          # tables에 든 값 문자열 크기 합 (추가할 때마다 누적)
+        self.nbytes = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def consume(self, size: int) -> int:
+        """offset부터 size까지 완성된 줄만 파싱해 추가 (파싱한 바이트 수 반환)"""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            return 0
+        data = data[:cut + 1]
+
+        reader = csv.reader(io.StringIO(data.decode('utf-8', errors='replace'), newline=''))
+        if self.offset == 0:
+            self.header = next(reader, None) or []
+            self.tables = [[] for _ in self.header]
+            self.codes = [array('H') for _ in self.header]
+            self._lookup = [{} for _ in self.header]
+            self.ts_index = self.header.index('Timestamp') if 'Timestamp' in self.header else None
+        elif self._lookup is None:
+            self._lookup = [{v: i for i, v in enumerate(table)} for table in self.tables]
+
+        width = len(self.header)
+        ts_index = self.ts_index
+        columns = [c for c in range(width) if c != ts_index]
+        epochs = []
+        new_codes = [[] for _ in range(width)]
+        added = 0
+        for raw in reader:
+            if ts_index is None or ts_index >= len(raw):
+                continue
+            try:
+                ts = parse_ts(raw[ts_index])
+            except ValueError:
+                continue
+            epochs.append(ts)
+            for c in columns:
+                value = raw[c] if c < len(raw) else None  # csv.DictReader와 같이 빠진 열은 None
+                lookup = self._lookup[c]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(self.tables[c])
+                    self.tables[c].append(value)
+                    added += sys.getsizeof(value)
+                new_codes[c].append(code)
+
+        # 코드 먼저, epoch 마지막 (읽는 쪽은 epoch 수를 행 수로 사용)
+        for c in range(width):
+            if len(self.tables[c]) > 0xFFFF and self.codes[c].typecode == 'H':
+                self.codes[c] = array('I', self.codes[c])
+            self.codes[c].extend(new_codes[c])
+        self.epochs.extend(epochs)
+        self.offset += len(data)
+        self._value_bytes += added
+        self._measure()
+        return len(data)
+
+    def to_parts(self) -> tuple:
+        """프로세스 간 전달용 (잠금 제외, 배열/값 목록 그대로)"""
+        return self.path, self.inode, self.offset, self.header, self.epochs, self.tables, self.codes
+
+    @classmethod
+    def from_parts(cls, parts: tuple) -> 'ParsedLog':
+        path, inode, offset, header, epochs, tables, codes = parts
+        entry = cls(path, inode)
+        entry.offset, entry.header, entry.epochs, entry.tables, entry.codes = offset, header, epochs, tables, codes
+        entry.ts_index = header.index('Timestamp') if 'Timestamp' in header else None
+        entry._value_bytes = sum(sys.getsizeof(v) for table in tables for v in table)  # 받을 때 한 번만
+        entry._measure()
+        return entry
+
+    def compact(self) -> None:
+        """지난 날짜: 값 → 코드 사전 제거 (더 이상 덧붙이지 않음)"""
+        if self._lookup is not None:
+            self._lookup = None
+            self._measure()
+
+    def _measure(self) -> None:
+        """nbytes 갱신 (열 수에 비례, 값 문자열 크기는 누적값 사용)"""
+        size = self.epochs.itemsize * len(self.epochs)
+        size += sum(codes.itemsize * len(codes) for codes in self.codes)
+        size += sum(sys.getsizeof(table) for table in self.tables) + self._value_bytes
+        if self._lookup is not None:
+            size += sum(sys.getsizeof(lookup) for lookup in self._lookup)
+        self.nbytes = size
+
+    # ------------------------------------------------------------------
+    def index_range(self, start_ts: Optional[float], end_ts: Optional[float]) -> Tuple[int, int]:
+        """start_ts <= epoch <= end_ts 인 행 구간 [lo, hi) (파일은 시간순 기록)"""
+        n = len(self.epochs)
+        lo = 0 if start_ts is None else bisect_left(self.epochs, start_ts, 0, n)
+        hi = n if end_ts is None else bisect_right(self.epochs, end_ts, lo, n)
+        return lo, hi
+
+    def iter_values(self, lo: int, hi: int):
+        """행별 (epoch, 값 튜플) (헤더 순서, Timestamp는 epoch에서 만든 문자열)"""
+        tables = self.tables
+        codes = self.codes
+        epochs = self.epochs
+        ts_index = self.ts_index
+        width = len(tables)
+        minute = prefix = None
+        for i in range(lo, hi):
+            epoch = epochs[i]
+            if epoch // 60 != minute:
+                # 같은 분 안의 행은 'YYYY-MM-DD HH:MM:' 부분을 재사용
+                minute = epoch // 60
+                prefix = format_ts(minute * 60)[:-2]
+            text = prefix + '%02d' % (epoch % 60)
+            yield epoch, tuple(text if c == ts_index else tables[c][codes[c][i]] for c in range(width))
+
+    def column(self, name: str, convert, lo: int, hi: int) -> Optional[list]:
+        """열 하나를 convert(문자열)로 변환한 목록 (변환은 서로 다른 값마다 한 번). 열이 없으면 None"""
+        if name not in self.header:
+            return None
+        c = self.header.index(name)
+        if c == self.ts_index:
+            return [convert(format_ts(epoch)) for epoch in self.epochs[lo:hi]]
+        table = self.tables[c]
+        cached = self._typed.get(name)
+        if cached is None or cached[0] != len(table):
+            cached = self._typed[name] = (len(table), [convert(v) for v in table])
+        typed = cached[1]
+        return [typed[code] for code in self.codes[c][lo:hi]]
+
+
+class LogParseCache:
+    """경로 → ParsedLog (LRU, 전체 크기 max_bytes 이하)"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ParsedLog]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.incremental_parses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.bytes_parsed = 0
+
+    def get(self, path: str, closed: bool = False) -> Optional[ParsedLog]:
+        """
+        파일 끝까지 갱신한 파싱 결과 (파일이 없으면 None)
+        Args:
+            closed: 더 이상 기록되지 않는 파일 (지난 날짜) → 압축 보관
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and (entry.inode != st.st_ino or st.st_size < entry.offset):
+                self.invalidations += 1  # 잘리거나 교체됨
+                entry = None
+            if entry is None:
+                entry = self._entries[path] = ParsedLog(path, st.st_ino)
+            self._entries.move_to_end(path)
+
+        with entry.lock:
+            first = entry.offset == 0
+            parsed = entry.consume(st.st_size) if st.st_size > entry.offset else 0
+            if closed:
+                entry.compact()
+
+        with self._lock:
+            if parsed and first:
+                self.misses += 1
+            elif parsed:
+                self.incremental_parses += 1
+            else:
+                self.hits += 1
+            self.bytes_parsed += parsed
+            self._evict(keep=path)
+        return entry
+
+    def contains(self, path: str) -> bool:
+        with self._lock:
+            return path in self._entries
+
+    def put(self, entry: ParsedLog, parsed_bytes: int = 0) -> None:
+        """다른 곳(작업 프로세스)에서 파싱한 결과 추가 (이미 있으면 그대로 둠)"""
+        with self._lock:
+            if entry.path in self._entries:
+                return
+            self._entries[entry.path] = entry
+            self.misses += 1
+            self.bytes_parsed += parsed_bytes
+            self._evict(keep=entry.path)
+
+    def _evict(self, keep: str) -> None:
+        total = sum(e.nbytes for e in self._entries.values())
+        for path in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue  # 방금 조회한 파일은 예산보다 커도 반환 후 다음 조회 때 제거
+            total -= self._entries.pop(path).nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = list(self._entries.values())
+            lookups = self.hits + self.misses + self.incremental_parses
+            return {
+                'files': len(entries),
+                'rows': sum(len(e) for e in entries),
+                'bytes': sum(e.nbytes for e in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'incremental_parses': self.incremental_parses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'bytes_parsed': self.bytes_parsed,
+            }
+
+
+# 프로세스 전체 공용 (LOG_PARSE_CACHE_BYTES = 0이면 사용 안 함)
+_max_bytes = getattr(config, 'LOG_PARSE_CACHE_BYTES', DEFAULT_MAX_BYTES)
+parse_cache = LogParseCache(_max_bytes) if _max_bytes else None
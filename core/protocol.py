@@ -0,0 +1,113 @@
+"""
+Board A 시리얼 프로토콜 파서
+- DATA,Temp,Hum,SoilRaw,SoilPct,ADC[,VPD] 프레임을 한 번만 파싱하여 SensorFrame으로 변환
+- 상태 업데이트와 로그 기록이 같은 SensorFrame 객체를 재사용
+"""
+import time
+from typing import Dict, Optional
+
+DATA_PREFIX = "DATA,"
+
+# 필드 최소/최대 개수 (VPD는 구버전 펌웨어에서 생략될 수 있음)
+DATA_MIN_FIELDS = 6
+DATA_MAX_FIELDS = 7
+
+# 유한값 판별 한계 (nan/inf 거부용)
+_LIMIT = 1e9
+
+# 거부 사유 코드
+REJECT_PREFIX = 'prefix'            # DATA, 로 시작하지 않음
+REJECT_FIELD_COUNT = 'field_count'  # 필드 개수 불일치
+REJECT_VALUE = 'value'              # 숫자 변환 실패
+REJECT_NAN = 'nan'                  # DHT 센서 읽기 실패 (nan/inf)
+
+
+class SensorFrame:
+    """Board A 센서 프레임 (파싱 완료된 값)"""
+    __slots__ = ('temp', 'hum', 'soil_raw', 'soil_pct', 'adc', 'vpd', 'rx_monotonic', 'board_id', 'zone')
+
+    def __init__(self, temp: float, hum: float, soil_raw: int, soil_pct: int, adc: int,
+                 vpd: Optional[float], rx_monotonic: float,
+                 board_id: Optional[str] = None, zone: Optional[str] = None):
+        self.temp = temp
+        self.hum = hum
+        self.soil_raw = soil_raw
+        self.soil_pct = soil_pct
+        self.adc = adc
+        self.vpd = vpd  # None이면 프레임에 VPD 필드 없음
+        self.rx_monotonic = rx_monotonic
+        self.board_id = board_id  # 수신 보드 ID (다중 보드 구성 시)
+        self.zone = zone  # 구역 ID
+
+    def __repr__(self):
+        return (f"SensorFrame(board={self.board_id}, zone={self.zone}, temp={self.temp}, hum={self.hum}, "
+                f"soil_raw={self.soil_raw}, soil_pct={self.soil_pct}, adc={self.adc}, vpd={self.vpd})")
+
+
+class FrameParser:
+    """
+    DATA 프레임 파서 (거부 사유별 카운터 포함)
+
+    사용 예:
+        parser = FrameParser()
+        frame = parser.parse(line)
+        if frame is None:
+            print(parser.last_reject)
+    """
+
+    def __init__(self):
+        self.parsed_count = 0
+        self.reject_counts: Dict[str, int] = {}
+        self.last_reject: Optional[str] = None
+
+    def _reject(self, reason: str) -> None:
+        self.reject_counts[reason] = self.reject_counts.get(reason, 0) + 1
+        self.last_reject = reason
+        return None
+
+    def parse(self, line: str, rx_monotonic: Optional[float] = None,
+              board_id: Optional[str] = None, zone: Optional[str] = None) -> Optional[SensorFrame]:
+        """
+        DATA 프레임 한 줄을 SensorFrame으로 변환
+        Args:
+            line: 개행이 제거된 수신 문자열
+            rx_monotonic: 수신 시각 (time.monotonic). None이면 현재 시각
+            board_id, zone: 프레임에 붙일 보드/구역 태그
+        Returns:
+            SensorFrame 또는 None (거부 시 reject_counts 증가)
+        """
+        if not line.startswith(DATA_PREFIX):
+            return self._reject(REJECT_PREFIX)
+
+        # 접두어를 포함해 한 번만 split
+        parts = line.split(',', DATA_MAX_FIELDS)
+        n = len(parts)
+        if n < DATA_MIN_FIELDS or n > DATA_MAX_FIELDS:
+            return self._reject(REJECT_FIELD_COUNT)
+
+        try:
+            temp = float(parts[1])
+            hum = float(parts[2])
+            soil_raw = int(parts[3])
+            soil_pct = int(parts[4])
+            adc = int(parts[5])
+            vpd = float(parts[6]) if n > 6 else None
+        except ValueError:
+            return self._reject(REJECT_VALUE)
+
+        # nan/inf는 범위 비교가 항상 False이므로 한 번의 비교로 걸러냄
+        if not (-_LIMIT < temp < _LIMIT and -_LIMIT < hum < _LIMIT) or (vpd is not None and not -_LIMIT < vpd < _LIMIT):
+            return self._reject(REJECT_NAN)
+
+        self.parsed_count += 1
+        self.last_reject = None
+        return SensorFrame(temp, hum, soil_raw, soil_pct, adc, vpd,
+                           time.monotonic() if rx_monotonic is None else rx_monotonic,
+                           board_id, zone)
+
+    def stats(self) -> Dict:
+        """파싱/거부 통계 반환"""
+        return {
+            'parsed': self.parsed_count,
+            'rejected': dict(self.reject_counts),
+        }
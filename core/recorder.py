@@ -0,0 +1,545 @@
+"""
+계층형 센서 기록 (원본 프레임 + 롤업)
+- 원본: Board A가 2초마다 보내는 프레임 전체를 메모리 링과 일별 바이너리 세그먼트에 저장
+- 롤업: 10초/1분/10분 구간별 min/max/mean/last + 구동계 ON 비율(샘플 기준)
+- CSV 로그(10초 간격)는 그대로 두고, 짧은 VPD 급변 분석과 대시보드 구간 조회에 사용
+"""
+import bisect
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import config
+from .event_bus import TOPIC_SENSOR_FRAME, POLICY_DROP_OLDEST
+from .logger import app_logger, CsvLogWriter
+
+# 기록 필드 (CSV 열 이름과 동일하게 사용)
+NUMERIC_FIELDS = ('Temp_C', 'Hum_Pct', 'Soil_Raw', 'Soil_Pct', 'Lux', 'VPD_kPa', 'DLI_mol')
+ACTUATOR_FIELDS = ('Valve_Status', 'Fan_Status', 'LED_W_Status', 'LED_P_Status', 'Curtain_Status')
+# 상태 저장소 키 (ACTUATOR_FIELDS와 같은 순서)
+ACTUATOR_STATE_KEYS = ('valve_status', 'fan_status', 'led_w_status', 'led_p_status', 'curtain_status')
+# 구동계별 (ON일 때 값, OFF일 때 값)
+ACTUATOR_LABELS = (('ON', 'OFF'), ('ON', 'OFF'), ('ON', 'OFF'), ('ON', 'OFF'), ('OPEN', 'CLOSED'))
+
+TIER_RAW = 'raw'
+
+# 원본 세그먼트 레코드: epoch(float64) + 숫자 필드(float32 x7) + 구동계 비트마스크(uint8)
+RAW_RECORD = struct.Struct('<d7fB')
+RAW_FLUSH_SEC = 10.0
+
+_NF = len(NUMERIC_FIELDS)
+_NA = len(ACTUATOR_FIELDS)
+
+
+def actuator_bits(state) -> int:
+    """상태(스냅샷/딕셔너리)에서 구동계 ON 비트마스크 생성"""
+    bits = 0
+    for i, key in enumerate(ACTUATOR_STATE_KEYS):
+        if state.get(key) in ('ON', 'OPEN'):
+            bits |= 1 << i
+    return bits
+
+
+def format_ts(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _tier_path(name: str, date_str: str):
+    """계층 파일 경로 (TIER_DIR/<이름>/YYYY-MM/<이름>_YYYY-MM-DD.<ext>)"""
+    folder = name if name == TIER_RAW else f"rollup_{name}"
+    ext = 'bin' if name == TIER_RAW else 'csv'
+    tier_dir = os.path.join(config.TIER_DIR, folder, date_str[:7])
+    os.makedirs(tier_dir, exist_ok=True)
+    return tier_dir, os.path.join(tier_dir, f"{folder}_{date_str}.{ext}")
+
+
+def rollup_header() -> List[str]:
+    """롤업 CSV 헤더: 숫자 필드는 평균값이 기본 열, 구동계 상태는 구간 내 한 번이라도 ON이면 ON"""
+    header = ['Timestamp', 'Samples']
+    for field in NUMERIC_FIELDS:
+        header.extend([field, f"{field}_Min", f"{field}_Max", f"{field}_Last"])
+    for field in ACTUATOR_FIELDS:
+        header.extend([field, f"{field}_Duty"])
+    return header
+
+
+ROLLUP_HEADER = rollup_header()
+
+
+# ==========================================
+# 원본 프레임 링 버퍼
+# ==========================================
+class RawRing:
+    """고정 크기 원본 프레임 링 (필드별 array로 보관하여 객체 생성 없음)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._ts = array('d', bytes(8 * self.capacity))
+        self._values = [array('d', bytes(8 * self.capacity)) for _ in range(_NF)]
+        self._bits = array('B', bytes(self.capacity))
+        self._head = 0   # 다음 기록 위치
+        self.size = 0
+
+    def append(self, ts: float, values, bits: int) -> None:
+        i = self._head
+        self._ts[i] = ts
+        for col, value in zip(self._values, values):
+            col[i] = value
+        self._bits[i] = bits
+        self._head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _index(self, n: int) -> int:
+        """n번째(오래된 순) 샘플의 실제 위치"""
+        return (self._head - self.size + n) % self.capacity
+
+    @property
+    def oldest_ts(self) -> Optional[float]:
+        return self._ts[self._index(0)] if self.size else None
+
+    def range(self, start_ts: float, end_ts: float) -> List[tuple]:
+        """[start_ts, end_ts] 구간 샘플 (ts, values, bits) 목록"""
+        if not self.size:
+            return []
+        # 시간순으로 정렬되어 있으므로 이진 탐색으로 시작 위치 찾기
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._index(mid)] < start_ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        samples = []
+        for n in range(lo, self.size):
+            i = self._index(n)
+            ts = self._ts[i]
+            if ts > end_ts:
+                break
+            samples.append((ts, tuple(col[i] for col in self._values), self._bits[i]))
+        return samples
+
+
+# ==========================================
+# 원본 프레임 디스크 세그먼트
+# ==========================================
+class RawSegmentWriter:
+    """일별 원본 세그먼트 파일 기록 (고정 길이 레코드, 버퍼링 후 주기적으로 flush)"""
+
+    def __init__(self, flush_interval: float = RAW_FLUSH_SEC):
+        self.flush_interval = flush_interval
+        self._file = None
+        self._date = None
+        self._buf = bytearray()
+        self._last_flush = time.monotonic()
+        self.records_written = 0
+
+    def append(self, ts: float, values, bits: int) -> None:
+        date_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+        if date_str != self._date:
+            self.flush()
+            self._open(date_str)
+        self._buf += RAW_RECORD.pack(ts, *values, bits)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _open(self, date_str: str) -> None:
+        self.close()
+        _, path = _tier_path(TIER_RAW, date_str)
+        self._file = open(path, 'ab')
+        # 이전 실행이 레코드 중간에 끊긴 경우 잘린 꼬리를 무시하도록 레코드 경계로 맞춤
+        tail = self._file.tell() % RAW_RECORD.size
+        if tail:
+            self._file.truncate(self._file.tell() - tail)
+        self._date = date_str
+
+    def flush(self) -> None:
+        if self._file is not None and self._buf:
+            self._file.write(self._buf)
+            self._file.flush()
+            self.records_written += len(self._buf) // RAW_RECORD.size
+            self._buf.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+            self._date = None
+
+
+def read_raw_segment(date_str: str, start_ts: float, end_ts: float) -> List[tuple]:
+    """
+    일별 원본 세그먼트에서 [start_ts, end_ts] 구간 읽기
+    - 레코드가 고정 길이·시간순이므로 이진 탐색으로 시작 레코드를 찾아 그 위치부터만 읽음
+    """
+    folder = os.path.join(config.TIER_DIR, TIER_RAW, date_str[:7])
+    path = os.path.join(folder, f"{TIER_RAW}_{date_str}.bin")
+    if not os.path.exists(path):
+        return []
+    size = RAW_RECORD.size
+    samples = []
+    with open(path, 'rb') as f:
+        count = os.fstat(f.fileno()).st_size // size
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid * size)
+            if RAW_RECORD.unpack(f.read(size))[0] < start_ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        f.seek(lo * size)
+        while True:
+            chunk = f.read(size * 1024)
+            if len(chunk) < size:
+                break
+            for rec in RAW_RECORD.iter_unpack(chunk[:len(chunk) - len(chunk) % size]):
+                if rec[0] > end_ts:
+                    return samples
+                samples.append((rec[0], rec[1:1 + _NF], rec[-1]))
+    return samples
+
+
+# ==========================================
+# 롤업
+# ==========================================
+class RollupBucket:
+    """한 구간의 누적값"""
+    __slots__ = ('start', 'count', 'mins', 'maxs', 'sums', 'lasts', 'on_counts', 'last_bits')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.count = 0
+        self.mins = [float('inf')] * _NF
+        self.maxs = [float('-inf')] * _NF
+        self.sums = [0.0] * _NF
+        self.lasts = [0.0] * _NF
+        self.on_counts = [0] * _NA
+        self.last_bits = 0
+
+    def add(self, values, bits: int) -> None:
+        self.count += 1
+        mins, maxs, sums = self.mins, self.maxs, self.sums
+        for i, v in enumerate(values):
+            if v < mins[i]:
+                mins[i] = v
+            if v > maxs[i]:
+                maxs[i] = v
+            sums[i] += v
+        self.lasts = list(values)
+        for i in range(_NA):
+            if bits & (1 << i):
+                self.on_counts[i] += 1
+        self.last_bits = bits
+
+    def to_row(self) -> list:
+        """ROLLUP_HEADER 순서의 행"""
+        n = self.count
+        row = [format_ts(self.start), n]
+        for i in range(_NF):
+            row.extend([round(self.sums[i] / n, 4), round(self.mins[i], 4),
+                        round(self.maxs[i], 4), round(self.lasts[i], 4)])
+        for i, (on_label, off_label) in enumerate(ACTUATOR_LABELS):
+            on = self.on_counts[i]
+            row.extend([on_label if on else off_label, round(on / n, 4)])
+        return row
+
+
+class RollupTier:
+    """고정 폭 구간 롤업 (닫힌 구간은 메모리 링에 보관, 필요 시 파일로 저장)"""
+
+    def __init__(self, name: str, width_sec: int, capacity: int, writer: Optional[CsvLogWriter] = None):
+        self.name = name
+        self.width = width_sec
+        self.closed = deque(maxlen=capacity)  # (start, row) 목록
+        self.current: Optional[RollupBucket] = None
+        self.writer = writer
+
+    def add(self, ts: float, values, bits: int) -> None:
+        start = ts - ts % self.width
+        if self.current is not None and self.current.start != start:
+            self.close_current()
+        if self.current is None:
+            self.current = RollupBucket(start)
+        self.current.add(values, bits)
+
+    def close_current(self) -> None:
+        bucket = self.current
+        self.current = None
+        if bucket is None or not bucket.count:
+            return
+        row = bucket.to_row()
+        self.closed.append((bucket.start, row))
+        if self.writer is not None:
+            try:
+                self.writer.write_rows([row])
+            except (OSError, IOError) as e:
+                app_logger.error(f"[Recorder] {self.name} 롤업 저장 실패: {e}")
+                self.writer.close()
+
+    def close_expired(self, now: float) -> None:
+        """프레임이 끊겨도 끝난 구간은 닫기"""
+        if self.current is not None and now >= self.current.start + self.width:
+            self.close_current()
+
+    @property
+    def oldest_ts(self) -> Optional[float]:
+        return self.closed[0][0] if self.closed else None
+
+    def range(self, start_ts: float, end_ts: float, include_open: bool = True) -> List[list]:
+        """[start_ts, end_ts]에 걸친 구간 행 목록 (진행 중인 구간 포함 가능)"""
+        starts = [s for s, _ in self.closed]
+        lo = bisect.bisect_left(starts, start_ts - self.width + 1e-9)
+        rows = [row for s, row in list(self.closed)[lo:] if s <= end_ts]
+        current = self.current
+        if include_open and current is not None and current.count and start_ts - self.width < current.start <= end_ts:
+            rows.append(current.to_row())
+        return rows
+
+
+def rollup_csv_rows(rows: List[Dict], width_sec: int) -> List[list]:
+    """
+    CSV 로그 행(DataReader 형식)으로 롤업 행 생성 (계층 기록 이전 기간 조회용)
+    """
+    buckets = []
+    current = None
+    for row in rows:
+        ts = row.get('_ts')
+        if ts is None:
+            continue
+        try:
+            values = [float(row.get(field) or 0) for field in NUMERIC_FIELDS]
+        except (TypeError, ValueError):
+            continue
+        bits = 0
+        for i, field in enumerate(ACTUATOR_FIELDS):
+            if str(row.get(field, '')).upper() in ('ON', 'OPEN'):
+                bits |= 1 << i
+        start = ts - ts % width_sec
+        if current is None or current.start != start:
+            current = RollupBucket(start)
+            buckets.append(current)
+        current.add(values, bits)
+    return [bucket.to_row() for bucket in buckets]
+
+
+# ==========================================
+# 기록기
+# ==========================================
+class TieredRecorder:
+    """
+    원본 링/세그먼트 + 롤업 계층 관리
+
+    사용 예:
+        recorder = TieredRecorder()
+        recorder.record(time.time(), values, bits)
+        rows = recorder.query('1m', start_ts, end_ts)
+    """
+
+    def __init__(self, tiers: Optional[Dict[str, int]] = None, capacities: Optional[Dict[str, int]] = None,
+                 persist: Optional[List[str]] = None, raw_ring_size: Optional[int] = None,
+                 raw_segments: Optional[bool] = None):
+        tiers = tiers if tiers is not None else config.RECORDER_TIERS
+        capacities = capacities if capacities is not None else config.RECORDER_TIER_CAPACITY
+        persist = persist if persist is not None else config.RECORDER_PERSIST_TIERS
+        raw_ring_size = raw_ring_size if raw_ring_size is not None else config.RECORDER_RAW_RING_SIZE
+        raw_segments = raw_segments if raw_segments is not None else config.RECORDER_RAW_SEGMENTS
+
+        self._lock = threading.Lock()  # 기록(수신 스레드)과 조회(웹 스레드) 사이
+        self.raw = RawRing(raw_ring_size)
+        self.segments = RawSegmentWriter() if raw_segments else None
+        self.tiers: Dict[str, RollupTier] = {}
+        for name, width in sorted(tiers.items(), key=lambda item: item[1]):
+            writer = None
+            if name in persist:
+                writer = CsvLogWriter(fsync_interval=None, header=ROLLUP_HEADER,
+                                      path_fn=lambda date_str, _name=name: _tier_path(_name, date_str))
+            self.tiers[name] = RollupTier(name, width, capacities.get(name, 1440), writer)
+        self.samples_recorded = 0
+
+    def record(self, ts: float, values, bits: int) -> None:
+        """원본 샘플 하나 기록 (모든 계층 갱신)"""
+        with self._lock:
+            self.raw.append(ts, values, bits)
+            for tier in self.tiers.values():
+                tier.add(ts, values, bits)
+            self.samples_recorded += 1
+        if self.segments is not None:
+            try:
+                self.segments.append(ts, values, bits)
+            except (OSError, IOError) as e:
+                app_logger.error(f"[Recorder] 원본 세그먼트 기록 실패: {e}")
+                self.segments.close()
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """끝난 구간 닫기 + 세그먼트 버퍼 flush (프레임이 없을 때 주기적으로 호출)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.close_expired(now)
+        if self.segments is not None:
+            try:
+                self.segments.flush()
+            except (OSError, IOError) as e:
+                app_logger.error(f"[Recorder] 원본 세그먼트 flush 실패: {e}")
+
+    def oldest_ts(self, tier: str) -> Optional[float]:
+        """메모리에 보관 중인 가장 오래된 시각"""
+        if tier == TIER_RAW:
+            return self.raw.oldest_ts
+        return self.tiers[tier].oldest_ts
+
+    def query(self, tier: str, start_ts: float, end_ts: float) -> List[Dict]:
+        """메모리에 있는 구간 조회 (행 딕셔너리 목록)"""
+        with self._lock:
+            if tier == TIER_RAW:
+                return [raw_sample_to_dict(s) for s in self.raw.range(start_ts, end_ts)]
+            return [dict(zip(ROLLUP_HEADER, row)) for row in self.tiers[tier].range(start_ts, end_ts)]
+
+    def close(self) -> None:
+        with self._lock:
+            for tier in self.tiers.values():
+                tier.close_current()
+                if tier.writer is not None:
+                    tier.writer.close()
+        if self.segments is not None:
+            self.segments.close()
+
+    def stats(self) -> Dict:
+        return {
+            'samples_recorded': self.samples_recorded,
+            'raw_in_memory': self.raw.size,
+            'raw_written': self.segments.records_written if self.segments else 0,
+            'tiers': {name: len(tier.closed) for name, tier in self.tiers.items()},
+        }
+
+
+def raw_sample_to_dict(sample) -> Dict:
+    ts, values, bits = sample
+    row = {'Timestamp': format_ts(ts)}
+    for field, value in zip(NUMERIC_FIELDS, values):
+        row[field] = round(value, 4)
+    for i, (field, (on_label, off_label)) in enumerate(zip(ACTUATOR_FIELDS, ACTUATOR_LABELS)):
+        row[field] = on_label if bits & (1 << i) else off_label
+    return row
+
+
+def read_rollup_file(tier: str, date_str: str) -> List[Dict]:
+    """저장된 롤업 CSV 한 날짜 읽기"""
+    import csv
+    folder = os.path.join(config.TIER_DIR, f"rollup_{tier}", date_str[:7])
+    path = os.path.join(folder, f"rollup_{tier}_{date_str}.csv")
+    if not os.path.exists(path):
+        return []
+    rows = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            for key, value in row.items():
+                if key not in ('Timestamp',) and key not in ACTUATOR_FIELDS:
+                    try:
+                        row[key] = float(value)
+                    except (TypeError, ValueError):
+                        pass
+            rows.append(row)
+    return rows
+
+
+class RecorderThread(threading.Thread):
+    """sensor.frame 이벤트를 받아 계층형 기록 (수신 루프와 분리)"""
+
+    def __init__(self, recorder: TieredRecorder, state_store, bus, zone=None, stop_event=None):
+        threading.Thread.__init__(self, daemon=True)
+        self.recorder = recorder
+        self.state_store = state_store
+        self.zone = zone  # None이면 모든 구역
+        self.stop_event = stop_event or threading.Event()
+        # 프레임은 순서대로 모두 기록해야 하므로 병합하지 않고, 밀리면 가장 오래된 것부터 버림
+        self.sub = bus.subscribe([TOPIC_SENSOR_FRAME], maxsize=256, policy=POLICY_DROP_OLDEST, name='recorder')
+
+    def run(self):
+        app_logger.info("[Recorder] 계층형 기록 시작 (원본 + 롤업)")
+        try:
+            while not self.stop_event.is_set():
+                events = self.sub.drain(timeout=1.0)
+                for event in events:
+                    frame = event.payload
+                    if self.zone is not None and frame.zone != self.zone:
+                        continue
+                    self.recorder.record(*self._sample(frame))
+                self.recorder.tick()
+        except Exception as e:
+            app_logger.error(f"[Recorder] 기록 스레드 오류: {e}")
+        finally:
+            self.sub.close()
+            self.recorder.close()
+            app_logger.info(f"[Recorder] 종료: {self.recorder.stats()}")
+
+    def _sample(self, frame):
+        # 수신 시각(monotonic)을 벽시계 시각으로 변환
+        ts = time.time() - (time.monotonic() - frame.rx_monotonic)
+        snap = self.state_store.snapshot()
+        vpd = frame.vpd if frame.vpd is not None else snap.get('vpd', 0.0)
+        values = (frame.temp, frame.hum, frame.soil_raw, frame.soil_pct,
+                  snap.get('lux', 0), vpd, snap.get('dli', 0.0))
+        return ts, values, actuator_bits(snap)
+
+
+def read_tier(tier: str, start_ts: float, end_ts: float,
+              recorder: Optional[TieredRecorder] = None, data_reader=None) -> List[Dict]:
+    """
+    계층 구간 조회 (메모리 → 저장 파일 → CSV 순으로 채움)
+    - 메모리에 전체 구간이 있으면 메모리만 사용
+    - 롤업 파일/원본 세그먼트가 있으면 그 뒤에 메모리의 최신 구간을 이어 붙임
+    - 계층 기록 이전 기간은 CSV 로그로 같은 롤업을 계산 (data_reader가 주어진 경우)
+    """
+    if tier != TIER_RAW and tier not in config.RECORDER_TIERS:
+        raise ValueError(f"알 수 없는 계층: {tier}")
+    width = config.RECORDER_TIERS.get(tier, 0)
+
+    if recorder is not None:
+        oldest = recorder.oldest_ts(tier)
+        if oldest is not None and oldest <= start_ts:
+            return recorder.query(tier, start_ts, end_ts)
+
+    # 1. 저장된 파일
+    rows: List[Dict] = []
+    lo_str, hi_str = format_ts(start_ts - width), format_ts(end_ts)
+    day = datetime.fromtimestamp(start_ts - width).date()
+    last_day = datetime.fromtimestamp(end_ts).date()
+    while day <= last_day:
+        date_str = day.strftime('%Y-%m-%d')
+        if tier == TIER_RAW:
+            rows.extend(raw_sample_to_dict(s) for s in read_raw_segment(date_str, start_ts, end_ts))
+        elif tier in config.RECORDER_PERSIST_TIERS:
+            rows.extend(r for r in read_rollup_file(tier, date_str) if lo_str < r['Timestamp'] <= hi_str)
+        day += timedelta(days=1)
+
+    # 2. 메모리의 최신 구간 (파일보다 새로운 것만)
+    if recorder is not None:
+        last = rows[-1]['Timestamp'] if rows else ''
+        rows.extend(r for r in recorder.query(tier, start_ts, end_ts) if r['Timestamp'] > last)
+
+    # 3. 앞부분이 비어 있으면 CSV 로그로 롤업 계산
+    if data_reader is not None and tier != TIER_RAW:
+        first_ts = datetime.strptime(rows[0]['Timestamp'], '%Y-%m-%d %H:%M:%S').timestamp() if rows else end_ts + width
+        if first_ts - start_ts >= width:
+            gap_start = start_ts - start_ts % width
+            gap_end = min(first_ts, end_ts)
+            csv_rows = data_reader.read_log_data(datetime.fromtimestamp(gap_start).strftime('%Y-%m-%d'),
+                                                 datetime.fromtimestamp(gap_end).strftime('%Y-%m-%d'),
+                                                 start_time=datetime.fromtimestamp(gap_start),
+                                                 end_time=datetime.fromtimestamp(gap_end))
+            csv_rows = [r for r in csv_rows if gap_start <= r['_ts'] < first_ts]
+            rows = [dict(zip(ROLLUP_HEADER, row)) for row in rollup_csv_rows(csv_rows, width)] + rows
+
+    return rows
@@ -0,0 +1,79 @@
+"""
+시리얼 수신 바이트 → 줄 단위 프레임 분리
+- 내부 bytearray 버퍼에서 줄 단위 프레임 분리 (청크당 한 번만 버퍼 정리)
+- 읽기/대기는 core.ingest_hub의 selector 루프가 담당하고, 읽은 청크를 feed()로 전달
+"""
+import time
+from typing import List
+
+from .logger import app_logger
+
+# 한 줄 최대 길이 (개행 없이 이 길이를 넘으면 쓰레기 데이터로 간주하고 버림)
+MAX_LINE_BYTES = 512
+# 한 번에 읽을 최대 바이트 수
+READ_CHUNK_BYTES = 4096
+
+
+class SerialLineReader:
+    """
+    보드 하나의 수신 버퍼 (줄 단위 프레임 분리)
+
+    사용 예:
+        reader = SerialLineReader()
+        for line in reader.feed(ser.read(n)):
+            handle(line)
+    """
+
+    def __init__(self, max_line_bytes: int = MAX_LINE_BYTES):
+        """
+        Args:
+            max_line_bytes: 한 줄 최대 길이 (초과 시 버림)
+        """
+        self.max_line_bytes = max_line_bytes
+        self._buf = bytearray()
+
+        # 통계
+        self.rx_bytes = 0
+        self.rx_lines = 0
+        self.dropped_bytes = 0
+        self.last_rx_monotonic = 0.0
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """
+        수신 청크를 버퍼에 추가하고 완성된 줄 목록 반환
+        - 줄 분리는 find()로 인덱스만 이동하고, 버퍼 앞부분 삭제는 청크당 한 번만 수행
+        """
+        if not chunk:
+            return []
+
+        buf = self._buf
+        buf.extend(chunk)
+        self.rx_bytes += len(chunk)
+        self.last_rx_monotonic = time.monotonic()
+
+        lines = []
+        start = 0
+        while True:
+            idx = buf.find(b'\n', start)
+            if idx < 0:
+                break
+            end = idx
+            if end > start and buf[end - 1] == 0x0D:  # '\r' 제거
+                end -= 1
+            if end > start:
+                line = buf[start:end].decode('utf-8', errors='ignore').strip()
+                if line:
+                    lines.append(line)
+            start = idx + 1
+
+        if start:
+            del buf[:start]
+
+        # 개행 없이 너무 긴 데이터는 버림 (보드 리셋 중 노이즈 등)
+        if len(buf) > self.max_line_bytes:
+            self.dropped_bytes += len(buf)
+            app_logger.warning(f"[SerialReader] ⚠️ 개행 없는 데이터 {len(buf)}바이트 버림")
+            buf.clear()
+
+        self.rx_lines += len(lines)
+        return lines
@@ -0,0 +1,306 @@
+"""
+SQLite 로그 저장소 (config.DATA_BACKEND = 'sqlite')
+- 파일 하나(SQLITE_LOG_FILE), WAL 모드: 로거가 쓰는 동안 웹 서버가 막힘 없이 읽음
+- log 테이블: (zone, ts) 기본 키 + WITHOUT ROWID → 같은 구역의 행이 시간순으로 붙어 저장 (범위 조회 = 인덱스 구간 읽기)
+  · 열은 CSV_HEADER와 같은 이름, 형식은 core.columnar.SCHEMA (숫자 REAL/INTEGER, 상태 TEXT, 불리언 INTEGER)
+- days 테이블: 구역·날짜별 행 수와 마지막 ts (날짜 목록, 통계 캐시 서명용)
+- 기록: 로거 배치 하나 = 트랜잭션 하나 (CSV와 함께 기록)
+- 보존: 로거의 용량 관리 주기마다 남은 CSV보다 오래된 행 삭제 + WAL 체크포인트 (logger.prune_sqlite_store)
+- 기존 CSV 적재: scripts/load_csv_to_sqlite.py
+- SqliteReader: DataReader와 같은 인터페이스 (웹 서버/통계/요약은 그대로 사용)
+"""
+import csv
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import config
+from .logger import CSV_HEADER
+from .csv_index import parse_ts
+from .columnar import SCHEMA, KIND_FLOAT, KIND_INT, KIND_BOOL, KIND_STATUS
+from .data_reader import DataReader
+
+SQL_TYPES = {KIND_FLOAT: 'REAL', KIND_INT: 'INTEGER', KIND_BOOL: 'INTEGER', KIND_STATUS: 'TEXT'}
+VALUE_COLUMNS = [name for name in CSV_HEADER if name != 'Timestamp']
+# 적재 시 한 번에 넣는 행 수
+LOAD_CHUNK_ROWS = 5000
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+def _db_path(path: Optional[str] = None) -> str:
+    return path or getattr(config, 'SQLITE_LOG_FILE', os.path.join(config.BASE_DIR, 'logs_db', 'smartfarm.db'))
+
+
+def _default_zone() -> str:
+    from .daily_summary import primary_zone
+    return primary_zone()
+
+
+class _Clock:
+    """'YYYY-MM-DD HH:MM:SS' ↔ epoch 초 (날짜별 자정 epoch 캐시, 시각 → epoch는 csv_index.parse_ts)"""
+
+    def __init__(self):
+        self._midnights = {}
+
+    def midnight(self, date_str: str) -> int:
+        base = self._midnights.get(date_str)
+        if base is None:
+            base = self._midnights[date_str] = int(datetime.strptime(date_str, '%Y-%m-%d').timestamp())
+        return base
+
+    @staticmethod
+    def epoch(ts) -> int:
+        return parse_ts(str(ts))
+
+    @staticmethod
+    def date_of(epoch: int) -> str:
+        return datetime.fromtimestamp(epoch).strftime('%Y-%m-%d')
+
+
+def _sql_value(kind: str, value):
+    """CSV 값 → SQLite 값 (빈 값은 NULL)"""
+    if kind == KIND_STATUS:
+        return value if value not in (None, '') else None
+    if kind == KIND_BOOL:
+        return 1 if str(value).strip().lower() in ('true', '1') else 0
+    if value in (None, ''):
+        return None
+    try:
+        return int(float(value)) if kind == KIND_INT else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _csv_value(kind: str, value) -> str:
+    """SQLite 값 → CSV와 같은 문자열 (DataReader 행 형식)"""
+    if value is None:
+        return ''
+    if kind == KIND_BOOL:
+        return 'True' if value else 'False'
+    return str(value)
+
+
+class SqliteLogStore:
+    """SQLite 로그 테이블 (스레드마다 연결 하나)"""
+
+    def __init__(self, path: Optional[str] = None, zone: Optional[str] = None):
+        self.path = _db_path(path)
+        self.zone = zone or _default_zone()
+        self._local = threading.local()
+        self._clock = _Clock()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self.rows_written = 0
+
+    # ------------------------------------------------------------------
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=10.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')  # WAL에서는 체크포인트 때만 fsync
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-8000')    # 8MB
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            columns = ', '.join(f'{_quote(name)} {SQL_TYPES[SCHEMA[name]]}' for name in VALUE_COLUMNS)
+            conn.execute(f'CREATE TABLE IF NOT EXISTS log (zone TEXT NOT NULL, ts INTEGER NOT NULL, {columns}, '
+                         f'PRIMARY KEY (zone, ts)) WITHOUT ROWID')
+            conn.execute('CREATE TABLE IF NOT EXISTS days (zone TEXT NOT NULL, date TEXT NOT NULL, '
+                         'row_count INTEGER NOT NULL, last_ts INTEGER NOT NULL, PRIMARY KEY (zone, date)) WITHOUT ROWID')
+            self._schema_ready = True
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    def insert_rows(self, rows: List[list], zone: Optional[str] = None) -> int:
+        """CSV_HEADER 순서의 행 목록을 한 트랜잭션으로 기록 (같은 (zone, ts)는 교체)"""
+        zone = zone or self.zone
+        records = []
+        dates = set()
+        for row in rows:
+            try:
+                ts = self._clock.epoch(row[0])
+            except (ValueError, IndexError):
+                continue
+            dates.add(str(row[0])[:10])
+            records.append((zone, ts) + tuple(_sql_value(SCHEMA[name], row[i + 1] if i + 1 < len(row) else None)
+                                              for i, name in enumerate(VALUE_COLUMNS)))
+        if not records:
+            return 0
+        placeholders = ', '.join('?' * (len(VALUE_COLUMNS) + 2))
+        conn = self.connect()
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(f'INSERT OR REPLACE INTO log VALUES ({placeholders})', records)
+            for date_str in dates:
+                self._refresh_day(conn, zone, date_str)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self.rows_written += len(records)
+        return len(records)
+
+    def _refresh_day(self, conn: sqlite3.Connection, zone: str, date_str: str) -> None:
+        start = self._clock.midnight(date_str)
+        conn.execute('INSERT OR REPLACE INTO days SELECT ?, ?, n, last_ts FROM '
+                     '(SELECT count(*) AS n, max(ts) AS last_ts FROM log WHERE zone = ? AND ts >= ? AND ts < ?) '
+                     'WHERE n > 0', (zone, date_str, zone, start, start + 86400))
+
+    def delete_before(self, date_str: str) -> int:
+        """date_str 자정 이전 행을 모든 구역에서 삭제 (CSV 보존 기간과 맞춤). 삭제한 행 수 반환"""
+        cutoff = self._clock.midnight(date_str)
+        conn = self.connect()
+        zones = [r[0] for r in conn.execute('SELECT DISTINCT zone FROM days')]
+        deleted = 0
+        conn.execute('BEGIN')
+        try:
+            # 구역별로 나눠야 (zone, ts) 기본 키 구간 삭제가 됨
+            for zone in zones:
+                deleted += conn.execute('DELETE FROM log WHERE zone = ? AND ts < ?', (zone, cutoff)).rowcount
+            conn.execute('DELETE FROM days WHERE date < ?', (date_str,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return deleted
+
+    def checkpoint(self):
+        """WAL 내용을 DB 파일에 반영하고 WAL 파일을 비움 (읽는 쪽이 잡고 있으면 가능한 만큼만). (busy, WAL 페이지, 반영 페이지)"""
+        return self.connect().execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+
+    def load_csv(self, csv_path: str, zone: Optional[str] = None) -> int:
+        """일별 CSV 파일 하나 적재 (LOAD_CHUNK_ROWS행씩 트랜잭션)"""
+        total = 0
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return 0
+            # 헤더 순서가 다른 옛 파일도 CSV_HEADER 순서로 맞춤
+            order = [header.index(name) if name in header else None for name in CSV_HEADER]
+            chunk = []
+            for raw in reader:
+                chunk.append([raw[i] if i is not None and i < len(raw) else '' for i in order])
+                if len(chunk) >= LOAD_CHUNK_ROWS:
+                    total += self.insert_rows(chunk, zone)
+                    chunk = []
+            if chunk:
+                total += self.insert_rows(chunk, zone)
+        return total
+
+    # ------------------------------------------------------------------
+    def dates(self, zone: Optional[str] = None) -> List[str]:
+        cur = self.connect().execute('SELECT date FROM days WHERE zone = ? ORDER BY date DESC', (zone or self.zone,))
+        return [r[0] for r in cur]
+
+    def day_info(self, date_str: str, zone: Optional[str] = None):
+        """(행 수, 마지막 ts) 또는 None"""
+        return self.connect().execute('SELECT row_count, last_ts FROM days WHERE zone = ? AND date = ?',
+                                      (zone or self.zone, date_str)).fetchone()
+
+    def select(self, start_ts: int, end_ts: int, fields: Optional[List[str]] = None,
+               zone: Optional[str] = None, descending: bool = False, limit: Optional[int] = None):
+        """(ts, 필드...) 튜플 커서 (ts 범위는 양 끝 포함)"""
+        names = fields or VALUE_COLUMNS
+        sql = (f"SELECT ts{''.join(', ' + _quote(n) for n in names)} FROM log "
+               f"WHERE zone = ? AND ts >= ? AND ts <= ? ORDER BY ts {'DESC' if descending else 'ASC'}")
+        params = [zone or self.zone, int(start_ts), int(end_ts)]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return self.connect().execute(sql, params)
+
+    def day_range(self, start_date: str, end_date: str):
+        """날짜 범위 → (시작 epoch, 끝 epoch) (끝 날짜 23:59:59 포함)"""
+        return self._clock.midnight(start_date), self._clock.midnight(end_date) + 86399
+
+
+class SqliteReader(DataReader):
+    """SQLite 기반 DataReader (범위/최신 행/날짜 목록을 인덱스로 조회)"""
+
+    def __init__(self, path: Optional[str] = None, zone: Optional[str] = None):
+        super().__init__()
+        self.store = SqliteLogStore(path, zone)
+
+    def get_available_dates(self) -> List[str]:
+        return self.store.dates()
+
+    def read_log_data(self, start_date: str, end_date: str,
+                      start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Dict]:
+        return list(self.iter_log_data(start_date, end_date, start_time, end_time))  # 이미 시간순
+
+    def iter_log_data(self, start_date: str, end_date: str,
+                      start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> Iterator[Dict]:
+        start_ts, end_ts = self.store.day_range(start_date, end_date)
+        if start_time is not None:
+            start_ts = max(start_ts, int(start_time.timestamp()))
+        if end_time is not None:
+            end_ts = min(end_ts, int(end_time.timestamp()))
+        yield from self._rows(self.store.select(start_ts, end_ts))
+
+    def _rows(self, cursor) -> Iterator[Dict]:
+        """SQL 행 → CSV 행과 같은 딕셔너리 (_ts/_timestamp/_date 포함)"""
+        kinds = [SCHEMA[name] for name in VALUE_COLUMNS]
+        midnight = None
+        date_str = None
+        for record in cursor:
+            ts = record[0]
+            if midnight is None or not (midnight <= ts < midnight + 86400):
+                date_str = self.store._clock.date_of(ts)
+                midnight = self.store._clock.midnight(date_str)
+            seconds = ts - midnight
+            timestamp = f"{date_str} {seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+            row = {'Timestamp': timestamp}
+            for name, kind, value in zip(VALUE_COLUMNS, kinds, record[1:]):
+                row[name] = _csv_value(kind, value)
+            row['_ts'] = ts
+            row['_timestamp'] = datetime.fromtimestamp(ts)
+            row['_date'] = date_str
+            yield row
+
+    def read_columns(self, start_date: str, end_date: str, fields: Optional[List[str]] = None,
+                     start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> Dict[str, list]:
+        wanted = [f for f in (fields or VALUE_COLUMNS) if f in SCHEMA and f != 'Timestamp']
+        lo, hi = self.store.day_range(start_date, end_date)
+        if start_ts is not None:
+            lo = max(lo, int(start_ts))
+        if end_ts is not None:
+            hi = min(hi, int(end_ts))
+        records = self.store.select(lo, hi, wanted).fetchall()
+        result = {'Timestamp': [r[0] for r in records]}
+        for i, name in enumerate(wanted, start=1):
+            kind = SCHEMA[name]
+            if kind == KIND_STATUS:
+                result[name] = [r[i] or '' for r in records]
+            elif kind == KIND_BOOL:
+                result[name] = [bool(r[i]) for r in records]
+            else:
+                result[name] = [r[i] for r in records]
+        return result
+
+    def get_latest_rows(self, n: int = 1) -> List[Dict]:
+        rows = list(self._rows(self.store.select(0, 2 ** 62, descending=True, limit=n)))
+        rows.reverse()
+        return rows
+
+    def day_signature(self, date_str: str):
+        info = self.store.day_info(date_str)
+        return tuple(info) if info else None
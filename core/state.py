@@ -0,0 +1,157 @@
+"""
+시스템 상태 저장소 (불변 스냅샷 + 버전)
+- 쓰기: 복사 후 변경(copy-on-write) → 참조 교체 (쓰기끼리만 락으로 직렬화)
+- 읽기: 현재 스냅샷 참조를 가져오기만 하므로 락 없이 일관된 상태를 봄
+- 버전: 변경될 때마다 1씩 증가 ("버전 N 이후 변경되었는가?" 확인용)
+- 이벤트: bus가 주어지면 구동계/비상 정지 키가 바뀔 때 actuator.changed / emergency 발행
+"""
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
+
+from .event_bus import TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY
+
+# 변경 시 actuator.changed 이벤트를 발행하는 키
+ACTUATOR_KEYS = (
+    'valve_status', 'fan_status', 'fan_speed_pct',
+    'led_w_status', 'led_w_brightness_pct',
+    'led_p_status', 'led_p_brightness_pct',
+    'curtain_status',
+)
+EMERGENCY_KEY = 'emergency_stop'
+
+
+class StateSnapshot(Mapping):
+    """특정 버전의 읽기 전용 상태"""
+    __slots__ = ('_data', 'version', 'updated_at')
+
+    def __init__(self, data: Dict[str, Any], version: int, updated_at: float):
+        self._data = data
+        self.version = version
+        self.updated_at = updated_at  # 마지막 변경 시각 (time.time)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """수정 가능한 사본 반환"""
+        return dict(self._data)
+
+    def __repr__(self):
+        return f"StateSnapshot(version={self.version}, {self._data!r})"
+
+
+class StateStore:
+    """
+    버전 관리되는 상태 저장소
+
+    사용 예:
+        store = StateStore({'temp': 0.0})
+        store.update(temp=23.5, hum=40.0)
+        snap = store.snapshot()          # 락 없이 읽기
+        snap.get('temp'), snap.version
+        store.modify(lambda s: s.update(valve_status='ON' if s['valve_status'] == 'OFF' else 'OFF'))
+    """
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None, bus=None):
+        """
+        Args:
+            initial: 초기 상태
+            bus: 변경 알림을 발행할 EventBus (None이면 발행 안 함)
+        """
+        self.bus = bus
+        self._write_lock = threading.Lock()
+        self._changed = threading.Condition(self._write_lock)
+        self._snapshot = StateSnapshot(dict(initial or {}), 0, time.time())
+
+    # ------------------------------------------------------------------
+    # 읽기 (락 없음)
+    # ------------------------------------------------------------------
+    def snapshot(self) -> StateSnapshot:
+        """현재 스냅샷 (참조 읽기는 원자적이므로 락 불필요)"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def get(self, key, default=None):
+        """단일 값 읽기 (여러 값을 함께 읽을 때는 snapshot() 사용)"""
+        return self._snapshot.get(key, default)
+
+    def changed_since(self, version: int) -> bool:
+        """주어진 버전 이후 변경이 있었는지"""
+        return self._snapshot.version != version
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> StateSnapshot:
+        """
+        버전이 바뀔 때까지 대기 후 스냅샷 반환 (타임아웃 시 현재 스냅샷)
+        """
+        with self._changed:
+            if self._snapshot.version == version:
+                self._changed.wait(timeout)
+            return self._snapshot
+
+    # ------------------------------------------------------------------
+    # 쓰기 (쓰기끼리만 직렬화)
+    # ------------------------------------------------------------------
+    def _commit(self, data: Dict[str, Any]) -> StateSnapshot:
+        # 호출자가 _write_lock을 보유한 상태
+        old = self._snapshot._data
+        snap = StateSnapshot(data, self._snapshot.version + 1, time.time())
+        self._snapshot = snap
+        self._changed.notify_all()
+        if self.bus is not None:
+            # 락 안에서 발행하여 이벤트 순서 = 버전 순서 보장 (publish는 블로킹 없음)
+            self._publish_changes(old, data, snap.version)
+        return snap
+
+    def _publish_changes(self, old: Dict[str, Any], new: Dict[str, Any], version: int) -> None:
+        changes = {key: new.get(key) for key in ACTUATOR_KEYS if old.get(key) != new.get(key)}
+        if changes:
+            self.bus.publish(TOPIC_ACTUATOR_CHANGED, {'changes': changes, 'version': version})
+        if old.get(EMERGENCY_KEY) != new.get(EMERGENCY_KEY):
+            self.bus.publish(TOPIC_EMERGENCY, {'active': bool(new.get(EMERGENCY_KEY)), 'version': version})
+
+    def update(self, changes: Optional[Dict[str, Any]] = None, **kwargs) -> StateSnapshot:
+        """
+        여러 키를 한 번에 변경 (값이 모두 같으면 버전을 올리지 않음)
+        Returns: 변경 후 스냅샷
+        """
+        if changes:
+            kwargs.update(changes)
+        with self._write_lock:
+            current = self._snapshot
+            data = current._data
+            if all(key in data and data[key] == value for key, value in kwargs.items()):
+                return current
+            new_data = dict(data)
+            new_data.update(kwargs)
+            return self._commit(new_data)
+
+    def modify(self, fn: Callable[[Dict[str, Any]], Any]) -> StateSnapshot:
+        """
+        읽기-수정-쓰기 (토글 등): fn이 사본 dict를 직접 수정
+        - fn은 쓰기 락 안에서 실행되므로 시리얼 통신 등 느린 작업을 하면 안 됨
+        Returns: 변경 후 스냅샷
+        """
+        with self._write_lock:
+            current = self._snapshot
+            new_data = dict(current._data)
+            fn(new_data)
+            if new_data == current._data:
+                return current
+            return self._commit(new_data)
@@ -0,0 +1,225 @@
+"""
+기간 통계 계산 (최소/최대/평균/개수/표준편차/백분위수)
+- 하루 단위로 필드별 부분 집계를 계산해 캐시, 여러 날 통계는 부분 집계를 병합
+- 하루 집계: 유효값(0 초과) 배열에서 한 번에 계산 (numpy가 있으면 벡터 연산, 없으면 순수 파이썬)
+- 병합: 평균/분산은 개수 가중 병합(Chan 방식), 백분위수는 날짜별 분위 격자(0~100%)를 합친 분포에서 근사
+- 캐시 키: 날짜 + DataReader.day_signature (CSV는 파일 크기, mtime) → 기록 중인 오늘만 바뀔 때마다 다시 계산
+"""
+import math
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+# numpy는 선택적 (없으면 순수 파이썬)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 통계 대상 숫자 필드
+STAT_FIELDS = ['Temp_C', 'Hum_Pct', 'Soil_Pct', 'Lux', 'VPD_kPa', 'DLI_mol']
+# 응답에 포함할 백분위수
+PERCENTILES = (5, 25, 50, 75, 95)
+# 하루 집계에 보관하는 분위 격자 (0, 1, ..., 100%)
+QUANTILE_GRID = [float(q) for q in range(101)]
+# 캐시할 최대 날짜 수
+MAX_CACHED_DAYS = 400
+
+
+class FieldAggregate:
+    """필드 하나의 부분 집계 (하루 또는 병합 결과)"""
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'grid', 'parts')
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min_value=None, max_value=None, grid=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2            # 편차 제곱합
+        self.min = min_value
+        self.max = max_value
+        self.grid = grid or []  # QUANTILE_GRID 위치의 값
+        self.parts = None       # 병합 결과: 백분위수 계산용 원본 부분 집계
+
+    @classmethod
+    def from_values(cls, values) -> 'FieldAggregate':
+        """유효값 배열(numpy 배열 또는 리스트)로 집계"""
+        if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+            n = int(values.size)
+            if n == 0:
+                return cls()
+            mean = float(values.mean())
+            m2 = float(((values - mean) ** 2).sum())
+            grid = np.percentile(values, QUANTILE_GRID).tolist()
+            return cls(n, mean, m2, float(values.min()), float(values.max()), grid)
+
+        n = len(values)
+        if n == 0:
+            return cls()
+        ordered = sorted(values)
+        mean = math.fsum(ordered) / n
+        m2 = math.fsum((v - mean) ** 2 for v in ordered)
+        grid = [_percentile_sorted(ordered, q) for q in QUANTILE_GRID]
+        return cls(n, mean, m2, ordered[0], ordered[-1], grid)
+
+    @classmethod
+    def merge(cls, parts: List['FieldAggregate']) -> 'FieldAggregate':
+        parts = [p for p in parts if p.count]
+        if not parts:
+            return cls()
+        if len(parts) == 1:
+            return parts[0]
+        total = cls()
+        for p in parts:
+            n = total.count + p.count
+            delta = p.mean - total.mean
+            total.m2 += p.m2 + delta * delta * total.count * p.count / n
+            total.mean += delta * p.count / n
+            total.count = n
+        total.min = min(p.min for p in parts)
+        total.max = max(p.max for p in parts)
+        total.parts = parts
+        return total
+
+    def percentile(self, q: float) -> Optional[float]:
+        if self.parts:
+            return _merged_percentile(self.parts, q)
+        if not self.grid:
+            return None
+        return _percentile_sorted(self.grid, q)
+
+    def to_dict(self) -> dict:
+        result = {
+            'min': self.min,
+            'max': self.max,
+            'avg': self.mean,
+            'count': self.count,
+            'std': math.sqrt(self.m2 / self.count) if self.count else None,
+        }
+        for q in PERCENTILES:
+            result[f'p{q}'] = self.percentile(q)
+        return result
+
+
+def _percentile_sorted(ordered, q: float) -> float:
+    """정렬된 값의 q% 위치 값 (선형 보간, numpy.percentile 기본 방식과 동일)"""
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _grid_cdf(grid, x: float) -> float:
+    """분위 격자를 구간 선형 분포로 보고 x 이하 비율"""
+    if x < grid[0]:
+        return 0.0
+    if x >= grid[-1]:
+        return 1.0
+    i = bisect_right(grid, x) - 1  # grid[i] <= x < grid[i+1]
+    frac = (x - grid[i]) / (grid[i + 1] - grid[i])
+    return (i + frac) / (len(grid) - 1)
+
+
+def _merged_percentile(parts: List[FieldAggregate], q: float) -> float:
+    """날짜별 분포를 개수 가중으로 합친 분포의 q% 값 (후보값 위에서 이진 탐색 후 보간)"""
+    target = q / 100.0
+    total = sum(p.count for p in parts)
+    candidates = sorted({v for p in parts for v in p.grid})
+
+    def cdf(x):
+        return sum(p.count * _grid_cdf(p.grid, x) for p in parts) / total
+
+    lo, hi = 0, len(candidates) - 1
+    if cdf(candidates[0]) >= target:
+        return candidates[0]
+    # cdf(candidates[lo]) < target <= cdf(candidates[hi])
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if cdf(candidates[mid]) >= target:
+            hi = mid
+        else:
+            lo = mid
+    f_lo, f_hi = cdf(candidates[lo]), cdf(candidates[hi])
+    if f_hi <= f_lo:
+        return candidates[hi]
+    return candidates[lo] + (candidates[hi] - candidates[lo]) * (target - f_lo) / (f_hi - f_lo)
+
+
+def _valid_values(column):
+    """숫자 열(배열 또는 None 포함 리스트)에서 유효값(유한, 0 초과)만 (기존 통계와 같은 기준)"""
+    if NUMPY_AVAILABLE:
+        if isinstance(column, list):
+            column = [np.nan if v is None else v for v in column]
+        arr = np.asarray(column, dtype=np.float64)
+        return arr[np.isfinite(arr) & (arr > 0)]
+    return [v for v in column if v is not None and 0 < v < math.inf]
+
+
+class StatisticsEngine:
+    """
+    DataReader 위의 통계 계산기 (날짜별 부분 집계 캐시)
+    """
+
+    def __init__(self, data_reader, fields: Optional[List[str]] = None, max_days: int = MAX_CACHED_DAYS):
+        self.data_reader = data_reader
+        self.fields = fields or STAT_FIELDS
+        self.max_days = max_days
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # 날짜 → (파일 서명, {필드: FieldAggregate})
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self, start_date: str, end_date: str) -> Dict[str, dict]:
+        """기간 통계 {필드: {min, max, avg, count, std, p5, ...}} (데이터 없으면 {})"""
+        per_field = {name: [] for name in self.fields}
+        current = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        while current <= end:
+            day = self.day_aggregates(current.strftime('%Y-%m-%d'))
+            if day:
+                for name, agg in day.items():
+                    per_field[name].append(agg)
+            current += timedelta(days=1)
+
+        stats = {}
+        for name, parts in per_field.items():
+            merged = FieldAggregate.merge(parts)
+            if merged.count:
+                stats[name] = merged.to_dict()
+        return stats
+
+    def day_aggregates(self, date_str: str) -> Optional[Dict[str, FieldAggregate]]:
+        """하루 부분 집계 (데이터가 바뀌지 않았으면 캐시)"""
+        signature = self.data_reader.day_signature(date_str)
+        if signature is None:
+            return None
+
+        with self._lock:
+            cached = self._cache.get(date_str)
+            if cached and cached[0] == signature:
+                self._cache.move_to_end(date_str)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # 컬럼형 로그가 CSV와 같은 행을 담고 있으면 열 배열을 그대로 사용 (numpy면 memmap), 아니면 CSV 파싱
+        day = self.data_reader.columnar_day(date_str)
+        columns = day.read(self.fields) if day is not None else {}
+        if not columns:
+            columns = self.data_reader.read_columns(date_str, date_str, self.fields)
+        aggregates = {name: FieldAggregate.from_values(_valid_values(columns.get(name, [])))
+                      for name in self.fields}
+
+        with self._lock:
+            self._cache[date_str] = (signature, aggregates)
+            self._cache.move_to_end(date_str)
+            while len(self._cache) > self.max_days:
+                self._cache.popitem(last=False)
+        return aggregates
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'cached_days': len(self._cache), 'hits': self.hits, 'misses': self.misses,
+                    'numpy': NUMPY_AVAILABLE}
@@ -56,6 +56,16 @@ def validate_config():
     if not hasattr(config, 'BAUD_RATE') or config.BAUD_RATE <= 0:
         errors.append("BAUD_RATE가 유효하지 않습니다.")
     
+    # 다중 보드 포트 테이블
+    board_ids = []
+    for table_name in ('SENSOR_BOARDS', 'ACTUATOR_BOARDS'):
+        for board in getattr(config, table_name, None) or []:
+            if not board.get('id') or not board.get('port'):
+                errors.append(f"{table_name} 항목에 id/port가 없습니다. ({board})")
+            board_ids.append(board.get('id'))
+    if len(board_ids) != len(set(board_ids)):
+        errors.append(f"보드 ID가 중복되었습니다. ({board_ids})")
+    
     # 자동 급수 설정
     if hasattr(config, 'SOIL_TRIGGER_PCT'):
         if not (0 <= config.SOIL_TRIGGER_PCT <= 100):
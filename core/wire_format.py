@@ -0,0 +1,82 @@
+"""
+대시보드용 열 형식 전송 포맷 (/api/data?format=columnar|binary)
+- columnar: {"timestamps": [epoch 초...], "Temp_C": [...], ...} - 행마다 키 이름을 반복하지 않음
+  · 상태/불리언 열은 런 길이 인코딩: {"rle": [[값, 개수], ...]} (ON/OFF는 대부분 길게 이어짐)
+- binary: 타입 배열 그대로 (브라우저에서 Float32Array 등으로 바로 읽음)
+  · 'SFC1' + uint32 헤더 길이(LE) + JSON 헤더 + 8바이트 정렬된 열 버퍼
+  · timestamps: uint32 epoch 초, 숫자 열: float32 (빈 값 NaN), 상태 열: 헤더 안 rle
+"""
+import json
+import struct
+from array import array
+from typing import Dict, List
+
+from .columnar import SCHEMA, KIND_STATUS, KIND_BOOL, KIND_TIME
+
+BINARY_MAGIC = b'SFC1'
+BINARY_ALIGN = 8
+
+
+def rle_encode(values: List) -> List[list]:
+    """[a, a, b] → [[a, 2], [b, 1]]"""
+    runs = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1][1] += 1
+        else:
+            runs.append([value, 1])
+    return runs
+
+
+def _is_rle(name: str) -> bool:
+    return SCHEMA.get(name) in (KIND_STATUS, KIND_BOOL)
+
+
+def columnar_payload(columns: Dict[str, list], meta: Dict) -> Dict:
+    """read_columns() 결과 → JSON 직렬화할 열 형식 딕셔너리"""
+    payload = dict(meta)
+    payload['format'] = 'columnar'
+    payload['count'] = len(columns.get('Timestamp', ()))
+    payload['timestamps'] = [int(t) for t in columns.get('Timestamp', ())]
+    for name, values in columns.items():
+        if name == 'Timestamp':
+            continue
+        if _is_rle(name):
+            payload[name] = {'rle': rle_encode(values)}
+        else:
+            payload[name] = [None if v is None or v != v else v for v in values]  # NaN → null
+    return payload
+
+
+def binary_payload(columns: Dict[str, list], meta: Dict) -> bytes:
+    """read_columns() 결과 → 바이너리 열 형식"""
+    count = len(columns.get('Timestamp', ()))
+    buffers = []
+    fields = []
+    offset = 0
+
+    def add(name, dtype, data):
+        nonlocal offset
+        raw = data.tobytes()
+        fields.append({'name': name, 'dtype': dtype, 'offset': offset, 'length': len(data)})
+        pad = (-len(raw)) % BINARY_ALIGN
+        buffers.append(raw + b'\0' * pad)
+        offset += len(raw) + pad
+
+    add('timestamps', 'uint32', array('I', (int(t) for t in columns.get('Timestamp', ()))))
+    header = dict(meta)
+    header.update({'format': 'binary', 'count': count, 'fields': fields, 'rle': {}})
+    nan = float('nan')
+    for name, values in columns.items():
+        if SCHEMA.get(name) == KIND_TIME:
+            continue
+        if _is_rle(name):
+            header['rle'][name] = rle_encode(values)
+        else:
+            add(name, 'float32', array('f', (nan if v is None else v for v in values)))
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # 열 버퍼가 8바이트 경계에서 시작하도록 헤더 뒤를 채움
+    pad = (-(len(BINARY_MAGIC) + 4 + len(header_bytes))) % BINARY_ALIGN
+    header_bytes += b' ' * pad
+    return BINARY_MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes + b''.join(buffers)
@@ -1,292 +1,276 @@
 import time
 import threading
 import queue  # 큐 모듈 추가
-import serial
 import os
 from datetime import datetime
 
 # 사용자 모듈 임포트
 import config
 from core import automation, camera, logger, utils
+from core.event_bus import (
+    event_bus, POLICY_COALESCE,
+    TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY,
+)
+from core.control_channel import ControlServer
+from core.ingest_hub import IngestionHub
+from core.protocol import FrameParser
+from core.recorder import TieredRecorder, RecorderThread
+from core.state import StateStore
 import logging  # 로깅 시스템
 
 # ==========================================
 # 📡 스레드: Board A (센서 수신 -> 큐 전송)
 # ==========================================
-# main.py 내부의 serial_thread_A 함수 수정
-
-# main.py 내부의 serial_thread_A 함수를 이것으로 덮어씌우세요.
-
-def serial_thread_A(ser_a, ser_b, ser_b_lock, stop_event, sys_state, state_lock, data_queue, camera_thread, app_logger):
-    import time
-    last_log_time = 0  # 마지막 로그 기록 시간
-    LOG_INTERVAL = 10  # 로그 기록 간격 (초)
+def make_board_a_handler(hub, state_store, data_queue, camera_thread, app_logger):
     """
-    Board A 통신 리스너 스레드
+    센서 보드(Board A) 수신 줄 처리기 생성 (IngestionHub의 on_line 콜백)
     - DATA... : 센서 데이터 처리
-    - CMD_M0~5: 수동 테스트 메뉴 (Board B로 전달, 자동화 스위치와 무관)
+    - CMD_M0~5: 수동 테스트 메뉴 (같은 구역의 Board B로 전달, 자동화 스위치와 무관)
     - CMD_M6  : 카메라 촬영 (메뉴 7번째)
     - CMD_M7  : 시스템 종료 (메뉴 8번째)
-    """
-    app_logger.info(f"[Thread A] Board A 통신 리스너 가동 (ser_a={ser_a}, is_open={ser_a.is_open if ser_a else 'N/A'})")
-    
-    if not ser_a:
-        app_logger.warning("[Thread A] ⚠️ Board A 시리얼 포트가 연결되지 않았습니다.")
-        return
     
-    if not ser_a.is_open:
-        app_logger.error("[Thread A] ⚠️ Board A 시리얼 포트가 열려있지 않습니다.")
-        return
+    상태 저장소와 CSV 로그는 주 구역(첫 번째 센서 보드의 구역) 기준이며,
+    다른 구역의 프레임은 보드별 last_frame에만 보관됩니다.
+    """
+    last_log_time = 0  # 마지막 로그 기록 시간
+    LOG_INTERVAL = 10  # 로그 기록 간격 (초)
+    frame_parser = FrameParser()
+    sensor_links = hub.sensor_links()
+    primary_zone = sensor_links[0].zone if sensor_links else None
     
-    while not stop_event.is_set():
-        try:
-            # CPU 사용 최적화: 데이터가 없을 때는 짧게 대기
-            if not ser_a.in_waiting:
-                time.sleep(0.1)  # 데이터 없을 때 CPU 부하 감소
-                continue
-                
-            # 데이터 읽기 및 공백 제거
-            raw_line = ser_a.readline()
-            try:
-                line = raw_line.decode('utf-8', errors='ignore').strip()
-            except (UnicodeDecodeError, AttributeError) as e:
-                app_logger.warning(f"[Thread A] 디코딩 오류: {e}")
-                continue 
-
-            if not line: 
-                continue
-                
-            # 디버깅: 실제로 뭐가 들어오는지 눈으로 확인
-            app_logger.debug(f"[RX] {line}") 
+    def handle_line(link, line):
+        nonlocal last_log_time
+        
+        # 같은 구역의 액추에이터 보드 (명령 전달 대상)
+        actuator = hub.actuator_for_zone(link.zone)
+        ser_b = actuator.command_port if actuator else None
+        ser_b_lock = actuator.write_lock if actuator else None
+        
+        # 디버깅: 실제로 뭐가 들어오는지 눈으로 확인
+        app_logger.debug(f"[RX:{link.board_id}] {line}") 
 
-            # ==========================================
-            # [Case 1] 카메라 테스트 (Menu Index 6)
-            # 아두이노 코드: Serial.print("CMD_M"); Serial.println(6);
-            # ==========================================
-            if line == "CMD_M6":
-                app_logger.info("[Thread A] 📸 사용자 수동 촬영 요청(CMD_M6) 수신!")
+        # ==========================================
+        # [Case 1] 카메라 테스트 (Menu Index 6)
+        # 아두이노 코드: Serial.print("CMD_M"); Serial.println(6);
+        # ==========================================
+        if line == "CMD_M6":
+            app_logger.info("[Thread A] 📸 사용자 수동 촬영 요청(CMD_M6) 수신!")
                 
-                # camera_thread가 살아있는지 확인 후 '방아쇠'만 당김
-                if camera_thread and camera_thread.is_alive():
-                    app_logger.info("[Thread A] 카메라 스레드 활성 상태 확인, 촬영 트리거")
-                    camera_thread.trigger_manual_capture() 
-                else:
-                    app_logger.warning(f"[Thread A] 카메라 스레드 응답 없음 (camera_thread={camera_thread}, is_alive={camera_thread.is_alive() if camera_thread else 'N/A'})")
+            # camera_thread가 살아있는지 확인 후 '방아쇠'만 당김
+            if camera_thread and camera_thread.is_alive():
+                app_logger.info("[Thread A] 카메라 스레드 활성 상태 확인, 촬영 트리거")
+                camera_thread.trigger_manual_capture() 
+            else:
+                app_logger.warning(f"[Thread A] 카메라 스레드 응답 없음 (camera_thread={camera_thread}, is_alive={camera_thread.is_alive() if camera_thread else 'N/A'})")
 
-            # ==========================================
-            # [Case 2] 시스템 종료 (Menu Index 7)
-            # 아두이노 코드: Serial.println("SYS_OFF");
-            # ==========================================
-            elif line == "SYS_OFF":
-                app_logger.info("[Thread A] 🛑 시스템 종료 요청 수신. 라즈베리파이 종료 중...")
+        # ==========================================
+        # [Case 2] 시스템 종료 (Menu Index 7)
+        # 아두이노 코드: Serial.println("SYS_OFF");
+        # ==========================================
+        elif line == "SYS_OFF":
+            app_logger.info("[Thread A] 🛑 시스템 종료 요청 수신. 라즈베리파이 종료 중...")
                 
-                # 라즈베리파이 자체를 종료
-                os.system("sudo shutdown -h now")
+            # 라즈베리파이 자체를 종료
+            os.system("sudo shutdown -h now")
 
-            # ==========================================
-            # [Case 3] 센서 데이터 (DATA로 시작)
-            # ==========================================
-            elif line.startswith("DATA"):
-                parts = line.split(',')
-                if len(parts) >= 6:
-                    with state_lock:
-                        try:
-                            sys_state['temp'] = float(parts[1])
-                            sys_state['hum'] = float(parts[2])
-                            sys_state['soil_pct'] = int(parts[4])
-                            # ADC 값을 Lux로 변환 (parts[5]는 ADC raw 값)
-                            adc_raw = int(parts[5])
-                            lux_value = automation.adc_to_lux(adc_raw)
-                            sys_state['lux'] = int(lux_value)
-                            # 변환된 Lux 값을 나중에 로그에 사용하기 위해 저장
-                            converted_lux = lux_value
-                            # VPD 값 추가 (parts[6]에 있음)
-                            if len(parts) > 6:
-                                sys_state['vpd'] = float(parts[6])
-                            current_valve = sys_state.get('valve_status', 'OFF')
-                        except ValueError as ve:
-                            app_logger.warning(f"[Thread A] 센서 데이터 파싱 오류: {ve}, line={line}")
-                            continue
-                        except Exception as e:
-                            app_logger.warning(f"[Thread A] ADC->Lux 변환 오류: {e}, ADC={parts[5]}")
-                            # 변환 실패 시 ADC 값을 그대로 사용 (하위 호환성)
-                            sys_state['lux'] = int(parts[5])
-                            converted_lux = float(parts[5])
-                            continue
+        # ==========================================
+        # [Case 3] 센서 데이터 (DATA로 시작)
+        # ==========================================
+        elif line.startswith("DATA"):
+            # 한 번만 파싱하여 상태 업데이트와 로그 기록에 재사용
+            frame = frame_parser.parse(line, board_id=link.board_id, zone=link.zone)
+            if frame is None:
+                app_logger.warning(f"[Thread A] 센서 데이터 파싱 오류 ({frame_parser.last_reject}): line={line}")
+                return
+            link.last_frame = frame
+            
+            # 주 구역이 아닌 보드는 보드별 최신 프레임만 보관
+            if link.zone != primary_zone:
+                event_bus.publish(TOPIC_SENSOR_FRAME, frame)
+                return
+                    
+            # ADC 값을 Lux로 변환
+            try:
+                lux_value = automation.adc_to_lux(frame.adc)
+            except Exception as e:
+                app_logger.warning(f"[Thread A] ADC->Lux 변환 오류: {e}, ADC={frame.adc}")
+                # 변환 실패 시 ADC 값을 그대로 사용 (하위 호환성)
+                state_store.update(lux=frame.adc)
+                event_bus.publish(TOPIC_SENSOR_FRAME, frame)
+                return
                     
-                    # 로그 큐 전송 (10초마다만 기록)
-                    current_time = time.time()
-                    if current_time - last_log_time >= LOG_INTERVAL:
-                        last_log_time = current_time
+            changes = {
+                'temp': frame.temp,
+                'hum': frame.hum,
+                'soil_pct': frame.soil_pct,
+                'lux': int(lux_value),
+            }
+            # VPD 값 (구버전 펌웨어는 생략 가능)
+            if frame.vpd is not None:
+                changes['vpd'] = frame.vpd
+            state_store.update(changes)
+            # 상태 저장소 반영 후 발행 (구독자가 스냅샷에서 새 값을 보도록)
+            event_bus.publish(TOPIC_SENSOR_FRAME, frame)
+                    
+            # 로그 큐 전송 (10초마다만 기록)
+            current_time = time.time()
+            if current_time - last_log_time >= LOG_INTERVAL:
+                last_log_time = current_time
                         
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        # parts 인덱스 에러 방지용 안전 장치
-                        p3 = parts[3] if len(parts)>3 else "0"
-                        p6 = parts[6] if len(parts)>6 else "0"
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                         
-                        # sys_state에서 모든 값 가져오기 (웹 UI와 동일한 방식)
-                        with state_lock:
-                            current_temp = sys_state.get('temp', 0.0)
-                            current_hum = sys_state.get('hum', 0.0)
-                            current_soil_pct = sys_state.get('soil_pct', 0)
-                            current_lux = sys_state.get('lux', 0)
-                            current_vpd = sys_state.get('vpd', 0.0)
-                            current_dli = sys_state.get('dli', 0.0)
-                            # 구동계 상태는 웹 UI와 동일하게 직접 읽기 (키 존재 확인 후 읽기)
-                            current_valve = sys_state['valve_status'] if 'valve_status' in sys_state else 'OFF'
-                            current_fan = sys_state['fan_status'] if 'fan_status' in sys_state else 'OFF'
-                            current_fan_speed = sys_state.get('fan_speed_pct', 0.0)
-                            current_led_w = sys_state['led_w_status'] if 'led_w_status' in sys_state else 'OFF'
-                            current_led_w_brightness = sys_state.get('led_w_brightness_pct', 0.0)
-                            current_led_p = sys_state['led_p_status'] if 'led_p_status' in sys_state else 'OFF'
-                            current_led_p_brightness = sys_state.get('led_p_brightness_pct', 0.0)
-                            current_curtain = sys_state['curtain_status'] if 'curtain_status' in sys_state else config.CURTAIN_INITIAL_STATE
-                            current_emergency = sys_state.get('emergency_stop', False)
-                            # automation.py에서 관리하는 통계값
-                            watering_count = sys_state.get('watering_count_today', 0)
-                            water_used = sys_state.get('water_used_today', 0.0)
+                # 한 스냅샷에서 모든 값 가져오기 (웹 UI와 동일한 방식, 락 없음)
+                snap = state_store.snapshot()
+                current_lux = snap.get('lux', 0)
+                current_dli = snap.get('dli', 0.0)
+                current_valve = snap.get('valve_status', 'OFF')
+                current_fan = snap.get('fan_status', 'OFF')
+                current_fan_speed = snap.get('fan_speed_pct', 0.0)
+                current_led_w = snap.get('led_w_status', 'OFF')
+                current_led_w_brightness = snap.get('led_w_brightness_pct', 0.0)
+                current_led_p = snap.get('led_p_status', 'OFF')
+                current_led_p_brightness = snap.get('led_p_brightness_pct', 0.0)
+                current_curtain = snap.get('curtain_status', config.CURTAIN_INITIAL_STATE)
+                current_emergency = snap.get('emergency_stop', False)
+                # automation.py에서 관리하는 통계값
+                watering_count = snap.get('watering_count_today', 0)
+                water_used = snap.get('water_used_today', 0.0)
                         
-                        # 소수점 자리 제한 (유효숫자 3자리)
-                        # Temp: 소수점 1자리 (예: 23.5)
-                        temp_str = f"{float(parts[1]):.1f}" if parts[1] else "0.0"
-                        # Hum: 소수점 1자리 (예: 32.0)
-                        hum_str = f"{float(parts[2]):.1f}" if parts[2] else "0.0"
-                        # VPD: 소수점 2자리 (예: 1.97)
-                        vpd_str = f"{float(p6):.2f}" if p6 and p6 != "0" else "0.00"
-                        # DLI: 소수점 4자리 (예: 0.0016) - 매우 작은 값이므로 4자리
-                        dli_str = f"{current_dli:.4f}" if current_dli > 0 else "0.0000"
-                        # Water Used: 소수점 2자리 (예: 0.00)
-                        water_used_str = f"{water_used:.2f}" if water_used > 0 else "0.00"
+                # 소수점 자리 제한 (유효숫자 3자리)
+                # Temp: 소수점 1자리 (예: 23.5)
+                temp_str = f"{frame.temp:.1f}"
+                # Hum: 소수점 1자리 (예: 32.0)
+                hum_str = f"{frame.hum:.1f}"
+                # VPD: 소수점 2자리 (예: 1.97)
+                vpd_str = f"{frame.vpd:.2f}" if frame.vpd else "0.00"
+                # DLI: 소수점 4자리 (예: 0.0016) - 매우 작은 값이므로 4자리
+                dli_str = f"{current_dli:.4f}" if current_dli > 0 else "0.0000"
+                # Water Used: 소수점 2자리 (예: 0.00)
+                water_used_str = f"{water_used:.2f}" if water_used > 0 else "0.00"
                         
-                        # Lux 값은 변환된 값 사용 (current_lux는 이미 변환된 값)
-                        lux_str = f"{current_lux:.0f}"
+                # Lux 값은 변환된 값 사용 (current_lux는 이미 변환된 값)
+                lux_str = f"{current_lux:.0f}"
                         
-                        log_data = [
-                            timestamp,
-                            # 센서값
-                            temp_str, hum_str, p3, parts[4], lux_str,
-                            # 계산값
-                            vpd_str, dli_str,
-                            # 구동계 상태 (ON/OFF)
-                            current_valve, current_fan, current_led_w, current_led_p, current_curtain,
-                            # 구동계 값 (속도/밝기 %)
-                            f"{current_fan_speed:.1f}",  # 팬 속도 (%)
-                            f"{current_led_w_brightness:.1f}",  # White LED 밝기 (%)
-                            f"{current_led_p_brightness:.1f}",  # Purple LED 밝기 (%)
-                            # 비상 정지
-                            current_emergency,
-                            # 일일 통계 (automation.py에서 업데이트)
-                            watering_count, water_used_str
-                        ]
-                        data_queue.put(log_data)
-                        app_logger.debug(f"[Thread A] 센서 데이터 큐에 추가: Temp={parts[1]}, Hum={parts[2]}, Soil={parts[4]}%")
+                log_data = [
+                    timestamp,
+                    # 센서값
+                    temp_str, hum_str, str(frame.soil_raw), str(frame.soil_pct), lux_str,
+                    # 계산값
+                    vpd_str, dli_str,
+                    # 구동계 상태 (ON/OFF)
+                    current_valve, current_fan, current_led_w, current_led_p, current_curtain,
+                    # 구동계 값 (속도/밝기 %)
+                    f"{current_fan_speed:.1f}",  # 팬 속도 (%)
+                    f"{current_led_w_brightness:.1f}",  # White LED 밝기 (%)
+                    f"{current_led_p_brightness:.1f}",  # Purple LED 밝기 (%)
+                    # 비상 정지
+                    current_emergency,
+                    # 일일 통계 (automation.py에서 업데이트)
+                    watering_count, water_used_str
+                ]
+                data_queue.put(log_data)
+                app_logger.debug(f"[Thread A] 센서 데이터 큐에 추가: Temp={temp_str}, Hum={hum_str}, Soil={frame.soil_pct}%")
 
-            # ==========================================
-            # [Case 4] 비상 정지 명령
-            # ==========================================
-            elif line == "EMERGENCY_STOP":
-                app_logger.warning("[Thread A] 🛑 비상 정지 명령 수신 - 모든 구동계 일시정지")
-                if ser_b and ser_b.is_open:
-                    with ser_b_lock:
-                        try:
-                            ser_b.write(b"EMERGENCY_STOP\n")
-                            ser_b.flush()
-                            app_logger.info("[Thread A] ✅ Board B로 비상 정지 명령 전송")
-                            with state_lock:
-                                sys_state['emergency_stop'] = True
-                                sys_state['fan_status'] = 'OFF'
-                                sys_state['fan_speed_pct'] = 0.0
-                                sys_state['valve_status'] = 'OFF'
-                                sys_state['led_w_status'] = 'OFF'
-                                sys_state['led_w_brightness_pct'] = 0.0
-                                sys_state['led_p_status'] = 'OFF'
-                                sys_state['led_p_brightness_pct'] = 0.0
-                        except Exception as e:
-                            app_logger.error(f"[Thread A] ❌ 비상 정지 명령 전송 실패: {e}")
+        # ==========================================
+        # [Case 4] 비상 정지 명령
+        # ==========================================
+        elif line == "EMERGENCY_STOP":
+            app_logger.warning("[Thread A] 🛑 비상 정지 명령 수신 - 모든 구동계 일시정지")
+            if ser_b and ser_b.is_open:
+                with ser_b_lock:
+                    try:
+                        ser_b.write(b"EMERGENCY_STOP\n")
+                        ser_b.flush()
+                        app_logger.info("[Thread A] ✅ Board B로 비상 정지 명령 전송")
+                        state_store.update(
+                            emergency_stop=True,
+                            fan_status='OFF',
+                            fan_speed_pct=0.0,
+                            valve_status='OFF',
+                            led_w_status='OFF',
+                            led_w_brightness_pct=0.0,
+                            led_p_status='OFF',
+                            led_p_brightness_pct=0.0,
+                        )
+                    except Exception as e:
+                        app_logger.error(f"[Thread A] ❌ 비상 정지 명령 전송 실패: {e}")
             
-            elif line == "EMERGENCY_RESUME":
-                app_logger.info("[Thread A] ▶️ 비상 정지 해제 명령 수신")
-                if ser_b and ser_b.is_open:
-                    with ser_b_lock:
-                        try:
-                            ser_b.write(b"EMERGENCY_RESUME\n")
-                            ser_b.flush()
-                            app_logger.info("[Thread A] ✅ Board B로 비상 정지 해제 명령 전송")
-                            with state_lock:
-                                sys_state['emergency_stop'] = False
-                        except Exception as e:
-                            app_logger.error(f"[Thread A] ❌ 비상 정지 해제 명령 전송 실패: {e}")
+        elif line == "EMERGENCY_RESUME":
+            app_logger.info("[Thread A] ▶️ 비상 정지 해제 명령 수신")
+            if ser_b and ser_b.is_open:
+                with ser_b_lock:
+                    try:
+                        ser_b.write(b"EMERGENCY_RESUME\n")
+                        ser_b.flush()
+                        app_logger.info("[Thread A] ✅ Board B로 비상 정지 해제 명령 전송")
+                        state_store.update(emergency_stop=False)
+                    except Exception as e:
+                        app_logger.error(f"[Thread A] ❌ 비상 정지 해제 명령 전송 실패: {e}")
 
-            # ==========================================
-            # [Case 5] 그 외 메뉴 명령 (CMD_M0 ~ CMD_M7)
-            # 수동 테스트 메뉴: config.py의 자동화 스위치와 무관하게 항상 동작
-            # ==========================================
-            elif line.startswith("CMD_M"):
-                cmd_idx = line.replace("CMD_M", "")
-                app_logger.info(f"[Thread A] 📱 수동 테스트 메뉴 명령 수신: {cmd_idx}번")
+        # ==========================================
+        # [Case 5] 그 외 메뉴 명령 (CMD_M0 ~ CMD_M7)
+        # 수동 테스트 메뉴: config.py의 자동화 스위치와 무관하게 항상 동작
+        # ==========================================
+        elif line.startswith("CMD_M"):
+            cmd_idx = line.replace("CMD_M", "")
+            app_logger.info(f"[Thread A] 📱 수동 테스트 메뉴 명령 수신: {cmd_idx}번")
                 
-                try:
-                    menu_idx = int(cmd_idx)
+            try:
+                menu_idx = int(cmd_idx)
                     
-                    # 특수 메뉴 처리 (카메라, 시스템 종료는 이미 처리됨)
-                    if menu_idx == 6:  # Camera Test
-                        # 이미 위에서 처리됨
-                        pass
-                    elif menu_idx == 7:  # System Off
-                        # 이미 위에서 처리됨
-                        pass
-                    else:
-                        # 일반 제어 명령: Board B로 전달 (M0~M5)
-                        # 자동화 스위치와 무관하게 수동 테스트는 항상 동작
-                        if ser_b and ser_b.is_open:
-                            cmd = f"M{menu_idx}"
-                            with ser_b_lock:
-                                try:
-                                    ser_b.write((cmd + '\n').encode())
-                                    ser_b.flush()
-                                    app_logger.info(f"[Thread A] ✅ Board B로 명령 전송: {cmd} (수동 테스트 모드)")
+                # 특수 메뉴 처리 (카메라, 시스템 종료는 이미 처리됨)
+                if menu_idx == 6:  # Camera Test
+                    # 이미 위에서 처리됨
+                    pass
+                elif menu_idx == 7:  # System Off
+                    # 이미 위에서 처리됨
+                    pass
+                else:
+                    # 일반 제어 명령: Board B로 전달 (M0~M5)
+                    # 자동화 스위치와 무관하게 수동 테스트는 항상 동작
+                    if ser_b and ser_b.is_open:
+                        cmd = f"M{menu_idx}"
+                        with ser_b_lock:
+                            try:
+                                ser_b.write((cmd + '\n').encode())
+                                ser_b.flush()
+                                app_logger.info(f"[Thread A] ✅ Board B로 명령 전송: {cmd} (수동 테스트 모드)")
                                     
-                                    # 상태 업데이트 (메뉴에 따라)
-                                    with state_lock:
-                                        if menu_idx == 0:  # EMERGENCY STOP (비상 정지)
-                                            # 비상 정지 상태는 EMERGENCY_STOP 명령으로 처리됨
-                                            pass
-                                        elif menu_idx == 1:  # Water Valve On/Off
-                                            current = sys_state.get('valve_status', 'OFF')
-                                            sys_state['valve_status'] = 'ON' if current == 'OFF' else 'OFF'
-                                        elif menu_idx == 5:  # LED 밝기 순환 (30%-50%-100%-OFF)
-                                            # board_b에서 밝기 레벨을 순환하므로, 
-                                            # 현재 밝기 값을 순환 (30% -> 50% -> 100% -> 0%)
-                                            current = sys_state.get('led_w_status', 'OFF')
-                                            current_brightness = sys_state.get('led_w_brightness_pct', 0.0)
-                                            if current == 'OFF' or current_brightness == 0.0:
-                                                sys_state['led_w_status'] = 'ON'
-                                                sys_state['led_w_brightness_pct'] = 30.0  # 30%
-                                            elif current_brightness == 30.0:
-                                                sys_state['led_w_brightness_pct'] = 50.0  # 50%
-                                            elif current_brightness == 50.0:
-                                                sys_state['led_w_brightness_pct'] = 100.0  # 100%
-                                            else:  # 100%
-                                                sys_state['led_w_status'] = 'OFF'
-                                                sys_state['led_w_brightness_pct'] = 0.0  # OFF
+                                # 상태 업데이트 (메뉴에 따라)
+                                def apply_menu(s):
+                                    if menu_idx == 0:  # EMERGENCY STOP (비상 정지)
+                                        # 비상 정지 상태는 EMERGENCY_STOP 명령으로 처리됨
+                                        pass
+                                    elif menu_idx == 1:  # Water Valve On/Off
+                                        current = s.get('valve_status', 'OFF')
+                                        s['valve_status'] = 'ON' if current == 'OFF' else 'OFF'
+                                    elif menu_idx == 5:  # LED 밝기 순환 (30%-50%-100%-OFF)
+                                        # board_b에서 밝기 레벨을 순환하므로, 
+                                        # 현재 밝기 값을 순환 (30% -> 50% -> 100% -> 0%)
+                                        current = s.get('led_w_status', 'OFF')
+                                        current_brightness = s.get('led_w_brightness_pct', 0.0)
+                                        if current == 'OFF' or current_brightness == 0.0:
+                                            s['led_w_status'] = 'ON'
+                                            s['led_w_brightness_pct'] = 30.0  # 30%
+                                        elif current_brightness == 30.0:
+                                            s['led_w_brightness_pct'] = 50.0  # 50%
+                                        elif current_brightness == 50.0:
+                                            s['led_w_brightness_pct'] = 100.0  # 100%
+                                        else:  # 100%
+                                            s['led_w_status'] = 'OFF'
+                                            s['led_w_brightness_pct'] = 0.0  # OFF
+                                state_store.modify(apply_menu)
                                     
-                                except Exception as e:
-                                    app_logger.error(f"[Thread A] ❌ Board B 명령 전송 실패 ({cmd}): {e}")
-                        else:
-                            app_logger.warning(f"[Thread A] ⚠️ Board B 연결 안됨 - 명령 전송 불가")
+                            except Exception as e:
+                                app_logger.error(f"[Thread A] ❌ Board B 명령 전송 실패 ({cmd}): {e}")
+                    else:
+                        app_logger.warning(f"[Thread A] ⚠️ Board B 연결 안됨 - 명령 전송 불가")
                             
-                except ValueError:
-                    app_logger.warning(f"[Thread A] 잘못된 메뉴 인덱스: {cmd_idx}")
+            except ValueError:
+                app_logger.warning(f"[Thread A] 잘못된 메뉴 인덱스: {cmd_idx}")
 
-        except serial.SerialException as e:
-            app_logger.error(f"[Thread A] 시리얼 통신 오류: {e}")
-            time.sleep(2)  # 재연결 대기 시간 증가
-        except (OSError, IOError) as e:
-            app_logger.error(f"[Thread A] I/O 오류: {e}")
-            time.sleep(2)
-        except Exception as e:
-            app_logger.error(f"[Thread A] 예상치 못한 오류: {e}")
-            time.sleep(1)
+    
+    return handle_line
 
 # ==========================================
 # 🎮 메인 실행 로직
@@ -326,8 +310,8 @@ def main():
     # 1. 데이터 통신용 큐 생성
     log_queue = queue.Queue()
     
-    # 2. 공유 데이터 저장소
-    sys_state = {
+    # 2. 공유 데이터 저장소 (불변 스냅샷 + 버전, 읽기는 락 없음)
+    state_store = StateStore({
         'temp': 0.0, 'hum': 0.0, 'soil_pct': 0, 'lux': 0, 'vpd': 0.0, 'dli': 0.0,
         'valve_status': 'OFF',
         'fan_status': 'OFF',
@@ -340,45 +324,18 @@ def main():
         'emergency_stop': False,  # 비상 정지 상태
         'watering_count_today': 0,  # 일일 급수 횟수 (automation.py에서 업데이트)
         'water_used_today': 0.0  # 일일 사용 물량 (L) (automation.py에서 업데이트)
-    }
-    state_lock = threading.Lock()
+    }, bus=event_bus)  # 구동계/비상 정지 변경 시 이벤트 발행
     stop_event = threading.Event()
 
-    # 3. 시리얼 연결
-    ser_a = None
-    ser_b = None
-
-    # Board A (센서/OLED) - 재연결 로직 포함
-    ser_a = None
-    try:
-        ser_a = serial.Serial(config.PORT_A, config.BAUD_RATE, timeout=1)
-        time.sleep(2)  # 아두이노 재부팅 대기
-        ser_a.reset_input_buffer()  # 버퍼 초기화
-        ser_a.reset_output_buffer()
-        app_logger.info(f"[Main] Board A 연결 성공: {config.PORT_A}")
-    except Exception as e:
-        app_logger.warning(f"[Main] ⚠️ Board A 연결 실패: {e}")
-        app_logger.info("재연결 시도 중...")
-        ser_a = utils.reconnect_serial(config.PORT_A, config.BAUD_RATE)
-        if ser_a:
-            app_logger.info(f"[Main] Board A 재연결 성공: {config.PORT_A}")
-
-    # Board B (제어) - 재연결 로직 포함
-    ser_b = None
-    try:
-        ser_b = serial.Serial(config.PORT_B, config.BAUD_RATE, timeout=1)
-        time.sleep(2)  # 아두이노 재부팅 대기
-        ser_b.reset_input_buffer()  # 버퍼 초기화
-        ser_b.reset_output_buffer()
-        app_logger.info(f"[Main] Board B 연결 성공: {config.PORT_B}")
-    except Exception as e:
-        app_logger.warning(f"[Main] ⚠️ Board B 연결 실패: {e}")
-        app_logger.info("재연결 시도 중...")
-        ser_b = utils.reconnect_serial(config.PORT_B, config.BAUD_RATE)
-        if ser_b:
-            app_logger.info(f"[Main] Board B 재연결 성공: {config.PORT_B}")
+    # 3. 시리얼 연결 (포트 테이블의 모든 보드를 하나의 수신 허브에서 관리)
+    hub = IngestionHub.from_config(config)
+    hub.open_all()
 
-    ser_b_lock = threading.Lock()
+    # 주 구역의 액추에이터 보드 (자동화/웹/카메라가 공유)
+    sensor_links = hub.sensor_links()
+    primary_actuator = hub.actuator_for_zone(sensor_links[0].zone) if sensor_links else None
+    ser_b = primary_actuator.command_port if primary_actuator else None
+    ser_b_lock = primary_actuator.write_lock if primary_actuator else threading.Lock()
 
     # 4. 스레드 시작
     threads = []
@@ -389,23 +346,28 @@ def main():
     threads.append(t_logger)
 
     # (B) 카메라 스레드 (먼저 생성하여 다른 스레드에 전달 가능하도록)
-    t_cam = camera.CameraThread(sys_state, state_lock, ser_b, ser_b_lock)
+    t_cam = camera.CameraThread(state_store, ser_b, ser_b_lock)
     t_cam.daemon = True  # 메인 프로세스 종료 시 함께 종료
     t_cam.start()
     threads.append(t_cam)
     app_logger.info(f"[Main] 카메라 스레드 시작됨 (is_alive={t_cam.is_alive()})")
 
-    # (C) 센서 수신 스레드 (큐 전달, camera_thread 전달, ser_b 전달)
-    if ser_a:
-        t_sensor = threading.Thread(target=serial_thread_A, args=(ser_a, ser_b, ser_b_lock, stop_event, sys_state, state_lock, log_queue, t_cam, app_logger), daemon=True)
-        t_sensor.start()
-        threads.append(t_sensor)
-    else:
-        app_logger.warning("[Main] ⚠️ Board A 미연결: 센서 수신 스레드 시작 안 함")
+    # (C) 수신 허브 스레드 (모든 보드를 하나의 selector 루프에서 처리)
+    hub.on_line = make_board_a_handler(hub, state_store, log_queue, t_cam, app_logger)
+    t_hub = threading.Thread(target=hub.run, args=(stop_event,), daemon=True)
+    t_hub.start()
+    threads.append(t_hub)
+
+    # (C-2) 계층형 기록 스레드 (모든 프레임 → 원본 링/세그먼트 + 10초/1분/10분 롤업)
+    recorder = TieredRecorder()
+    t_rec = RecorderThread(recorder, state_store, event_bus,
+                           zone=sensor_links[0].zone if sensor_links else None, stop_event=stop_event)
+    t_rec.start()
+    threads.append(t_rec)
 
     # (D) 자동화 스레드
     if ser_b:
-        t_auto = threading.Thread(target=automation.automation_loop, args=(stop_event, sys_state, ser_b, ser_b_lock, state_lock), daemon=True)
+        t_auto = threading.Thread(target=automation.automation_loop, args=(stop_event, state_store, ser_b, ser_b_lock), daemon=True)
         t_auto.start()
         threads.append(t_auto)
     else:
@@ -414,62 +376,82 @@ def main():
     app_logger.info("=== System Running. (Logging via Queue) ===")
 
     # 4-1. 웹 서버 초기화 및 실행 (구동계 제어를 위해)
+    # - 'process': 별도 프로세스 + 제어 채널 (대시보드 조회가 제어 루프와 GIL을 다투지 않음)
+    # - 'wsgi'/'dev': 이 프로세스의 스레드에서 실행
+    control_server = None
+    web_proc = None
+    web_mode = getattr(config, 'WEB_SERVER_MODE', 'wsgi')
     try:
-        from web_ui import web_server
-        web_server.init_web_server(sys_state, ser_b, ser_b_lock, state_lock, t_cam)
-        app_logger.info("[Main] 웹 서버 초기화 완료 (구동계 제어 활성화)")
-        
-        # 웹 서버를 별도 스레드에서 실행 (main.py와 함께 실행)
-        def run_web_server():
-            web_server.app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
-        
-        t_web = threading.Thread(target=run_web_server, daemon=True)
-        t_web.start()
-        threads.append(t_web)
-        app_logger.info("[Main] 웹 서버 스레드 시작 (포트 5000)")
+        from web_ui import serving
+        if web_mode == serving.MODE_PROCESS:
+            control_server = ControlServer(state_store, ser_b, ser_b_lock, t_cam)
+            control_server.start()
+            web_proc = serving.spawn_process()
+            app_logger.info(f"[Main] 웹 서버 프로세스 시작 (pid {web_proc.pid}, 포트 {serving.server_settings()['port']})")
+        else:
+            from web_ui import web_server
+            web_server.init_web_server(state_store, ser_b, ser_b_lock, t_cam, recorder)
+            app_logger.info("[Main] 웹 서버 초기화 완료 (구동계 제어 활성화)")
+            threads.append(serving.start_in_thread(web_server.app, web_mode))
+            app_logger.info(f"[Main] 웹 서버 스레드 시작 ({web_mode}, 포트 {serving.server_settings()['port']})")
     except Exception as e:
         app_logger.warning(f"[Main] 웹 서버 초기화 실패 (구동계 제어 비활성화): {e}")
 
     # 5. 메인 루프 (OLED 업데이트 담당)
+    # 구동계 상태 변경 이벤트가 오면 즉시, 그 외에는 분이 바뀔 때(시계 표시)와 하트비트 주기마다 전송
+    ui_sub = event_bus.subscribe([TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY], maxsize=4,
+                                 policy=POLICY_COALESCE, name='oled')
     try:
         last_ui_update = 0
+        last_ui_minute = None
         app_logger.info("[Main] 메인 루프 시작 (Time Sync 가동)")
 
         while True:
-            # 2초마다 (5초는 좀 깁니다, 2초 추천) Board A로 상태(시간) 전송
-            # 아두이노는 이 신호가 끊기면 멈춘 것으로 간주할 수도 있습니다.
-            if time.time() - last_ui_update > 2.0:
-                now = datetime.now()
-                
-                # state_lock이 있다면 사용, 없다면 그냥 가져옴
-                # (Queue 방식이라면 sys_state 딕셔너리가 전역변수인지 확인 필요)
-                v = sys_state.get('valve_status', 'OFF')
-                f = sys_state.get('fan_status', 'OFF')
-                w = sys_state.get('led_w_status', 'OFF')
-                p = sys_state.get('led_p_status', 'OFF')
+            # 다음 하트비트 또는 다음 분 경계까지 대기 (그 사이 변경 이벤트가 오면 바로 깨어남)
+            now = datetime.now()
+            until_heartbeat = config.OLED_HEARTBEAT_SEC - (time.time() - last_ui_update)
+            until_next_minute = 60 - now.second - now.microsecond / 1e6
+            events = ui_sub.drain(timeout=max(0.0, min(until_heartbeat, until_next_minute)))
+
+            now = datetime.now()
+            if (events or now.minute != last_ui_minute
+                    or time.time() - last_ui_update >= config.OLED_HEARTBEAT_SEC):
+                # 한 스냅샷에서 일관된 구동계 상태 읽기 (락 없음)
+                snap = state_store.snapshot()
+                v = snap.get('valve_status', 'OFF')
+                f = snap.get('fan_status', 'OFF')
+                w = snap.get('led_w_status', 'OFF')
+                p = snap.get('led_p_status', 'OFF')
                 
                 # 프로토콜: STATE,Valve,Fan,LedW,LedP,Hour,Min
                 msg = f"STATE,{v},{f},{w},{p},{now.hour},{now.minute}\n"
                 
-                # Board A로 상태 전송
-                if ser_a and ser_a.is_open:
-                    try:
-                        ser_a.write(msg.encode())
-                        ser_a.flush()  # 버퍼 강제 전송
-                        app_logger.debug(f"[Tx] {msg.strip()}") # 디버깅용
-                    except Exception as e:
-                        app_logger.error(f"[Main] UI 전송 실패: {e}")
-                else:
-                    # 연결이 안 되어 있다면 로그 찍기
-                    app_logger.warning(f"[Main] Board A 연결 안됨 (ser_a={ser_a}, is_open={ser_a.is_open if ser_a else 'N/A'}), 시간 전송 불가")
+                # 모든 센서 보드(OLED)로 상태 전송
+                for link in hub.sensor_links():
+                    if link.is_connected:
+                        try:
+                            link.ser.write(msg.encode())
+                            link.ser.flush()  # 버퍼 강제 전송
+                            app_logger.debug(f"[Tx:{link.board_id}] {msg.strip()}") # 디버깅용
+                        except Exception as e:
+                            app_logger.error(f"[Main] {link.board_id} UI 전송 실패: {e}")
+                    else:
+                        # 연결이 안 되어 있다면 로그 찍기 (허브가 재연결 시도 중)
+                        app_logger.warning(f"[Main] {link.board_id} 연결 안됨 ({link.port}), 시간 전송 불가")
                 
                 last_ui_update = time.time()
-
-            time.sleep(0.1)
+                last_ui_minute = now.minute
             
     except KeyboardInterrupt:
         app_logger.info("\n[Main] 종료 요청! 정리 중...")
         stop_event.set()
+        ui_sub.close()
+        
+        # 웹 서버 프로세스/제어 채널 정리
+        if web_proc:
+            serving.stop_process(web_proc)
+        if control_server:
+            control_server.stop()
         
         # 카메라 스레드 정리
         if t_cam and t_cam.is_alive():
@@ -482,19 +464,9 @@ def main():
                 app_logger.warning(f"[Main] ⚠️ 스레드 {t.name}가 정상 종료되지 않았습니다.")
             
         # 시리얼 포트 안전하게 닫기
-        if ser_a and ser_a.is_open:
-            try:
-                ser_a.close()
-                app_logger.info("[Main] Board A 시리얼 포트 닫힘")
-            except Exception as e:
-                app_logger.error(f"[Main] Board A 닫기 오류: {e}")
-                
-        if ser_b and ser_b.is_open:
-            try:
-                ser_b.close()
-                app_logger.info("[Main] Board B 시리얼 포트 닫힘")
-            except Exception as e:
-                app_logger.error(f"[Main] Board B 닫기 오류: {e}")
+        app_logger.info(f"[Main] 보드 통계: {hub.stats()}")
+        app_logger.info(f"[Main] 이벤트 버스 통계: {event_bus.stats()}")
+        hub.close_all()
                 
         app_logger.info("[Main] 종료 완료.")
 
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+기존 CSV 로그로 일별 요약(DAILY_SUMMARY_FILE) 채우기
+- 요약이 없는 지난 날짜만 계산 (--force: 모두 다시 계산)
+사용법: python3 scripts/backfill_daily_summary.py [--force] [시작일 [종료일]]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.data_reader import create_data_reader
+from core.daily_summary import DailySummaryStore, backfill
+
+
+def main():
+    args = sys.argv[1:]
+    force = '--force' in args
+    dates = [a for a in args if not a.startswith('--')]
+    start_date = dates[0] if dates else None
+    end_date = dates[1] if len(dates) > 1 else None
+
+    started = time.time()
+    store = DailySummaryStore()
+    filled = backfill(create_data_reader(), store, start_date, end_date, overwrite=force)
+    print(f"총 {filled}일 요약 기록 ({time.time() - started:.1f}초)")
+    print(f"저장 위치: {config.DAILY_SUMMARY_FILE}")
+
+
+if __name__ == '__main__':
+    main()
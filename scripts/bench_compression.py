@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+대시보드 전송량 측정 (압축 전/후 바이트, 휴대폰 회선 기준 예상 전송 시간)
+- 정적 파일: web_ui/static의 원본 vs .gz/.br 사본 (web_ui.compression.precompress_static과 같은 수준)
+- 7일 보기 /api/data 응답: 행 형식 / format=columnar 각각 원본 vs gzip/br (웹 서버 동적 압축 수준)
+사용법: python3 scripts/bench_compression.py [종료 날짜 YYYY-MM-DD] [일수=7] [max_points=2000]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_reader import DataReader
+from core.columnar import typed_row
+from core.downsample import downsample_columns
+from core.wire_format import columnar_payload
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web_ui', 'static')
+# 예상 전송 시간 계산용 회선 속도 (Mbps)
+LINKS = {'LTE 5Mbps': 5.0, '3G 1Mbps': 1.0}
+
+
+def sizes(data: bytes, static: bool = False) -> dict:
+    """원본/gzip/br 크기와 압축 시간(ms)"""
+    result = {'raw': len(data)}
+    t0 = time.perf_counter()
+    result['gzip'] = len(gzip.compress(data, compresslevel=9 if static else 6, mtime=0))
+    result['gzip_ms'] = (time.perf_counter() - t0) * 1000
+    if BROTLI_AVAILABLE:
+        t0 = time.perf_counter()
+        result['br'] = len(brotli.compress(data, quality=11 if static else 5))
+        result['br_ms'] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+def report(name: str, result: dict) -> None:
+    line = f"  {name:<28} {result['raw']:>10,}B  gzip {result['gzip']:>9,}B ({result['gzip_ms']:6.1f}ms)"
+    if 'br' in result:
+        line += f"  br {result['br']:>9,}B ({result['br_ms']:6.1f}ms)"
+    print(line)
+    best = min(v for k, v in result.items() if k in ('gzip', 'br'))
+    for link, mbps in LINKS.items():
+        print(f"    {link:<12} 원본 {result['raw'] * 8 / mbps / 1e6:6.2f}s → 압축 {best * 8 / mbps / 1e6:6.2f}s")
+
+
+def main():
+    end_date = sys.argv[1] if len(sys.argv) > 1 else datetime.now().strftime('%Y-%m-%d')
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    max_points = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    start_date = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+    print(f"brotli: {'사용 가능' if BROTLI_AVAILABLE else '없음 (gzip만)'}")
+    print("[정적 파일]")
+    for dirpath, _, filenames in os.walk(STATIC_DIR):
+        for name in sorted(filenames):
+            if name.endswith(('.js', '.css', '.html')):
+                with open(os.path.join(dirpath, name), 'rb') as f:
+                    report(name, sizes(f.read(), static=True))
+
+    print(f"[/api/data {start_date} ~ {end_date}]")
+    reader = DataReader()
+    t0 = time.perf_counter()
+    rows = [typed_row(row) for row in reader.read_log_data(start_date, end_date)]
+    read_ms = (time.perf_counter() - t0) * 1000
+    if not rows:
+        print("  로그 데이터 없음")
+        return
+    body = json.dumps({'data': rows, 'start_date': start_date, 'end_date': end_date}).encode('utf-8')
+    print(f"  행 {len(rows):,}개 읽기 {read_ms:.0f}ms")
+    report('rows (전체)', sizes(body))
+
+    columns = reader.read_columns(start_date, end_date)
+    total = len(columns.get('Timestamp', ()))
+    columns = downsample_columns(columns, max_points)
+    meta = {'start_date': start_date, 'end_date': end_date, 'total_rows': total}
+    report(f'columnar (max_points={max_points})', sizes(json.dumps(columnar_payload(columns, meta)).encode('utf-8')))
+
+
+if __name__ == "__main__":
+    main()
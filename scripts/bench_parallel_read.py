@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+여러 날짜 조회의 병렬 파싱 효과 측정 (합성 데이터, 작업 프로세스 1~4개)
+- 임시 폴더에 일별 CSV를 만들고(기본 90일, 10초 간격) 매번 파싱 캐시를 비운 뒤 측정
+  · 파싱: core.parallel_reader.parse_files (작업 프로세스 → 열별 배열)
+  · read_log_data: 파싱 + 행 딕셔너리 생성 (웹 API가 쓰는 경로)
+  · read_columns: 파싱 + 필드별 목록 (통계/다운샘플 경로)
+- 병합 비교: 날짜별로 시간순인 행을 이어 붙이기(read_log_data가 쓰는 방식) vs Timsort vs heapq k-way 병합
+- 실제 로그(LOG_DIR)는 건드리지 않음
+사용법: python3 scripts/bench_parallel_read.py [--days N] [--interval 초] [--max-workers N]
+"""
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import itemgetter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from bench_sqlite import write_synthetic_logs, _option
+
+
+def main():
+    args = sys.argv[1:]
+    days = _option(args, '--days', 90)
+    interval = _option(args, '--interval', 10)
+    max_workers = _option(args, '--max-workers', 4)
+
+    work_dir = tempfile.mkdtemp(prefix='smartfarm_bench_')
+    config.LOG_DIR = os.path.join(work_dir, 'logs_data')
+    config.COLUMNAR_DIR = os.path.join(work_dir, 'logs_columnar')  # 없음 → CSV 경로만 측정
+    config.LOG_PARSE_CACHE_BYTES = 1024 * 1024 * 1024               # 측정 중 제거 없음
+
+    from core import parallel_reader
+    from core.data_reader import DataReader
+
+    try:
+        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        t0 = time.perf_counter()
+        rows = write_synthetic_logs(config.LOG_DIR, end, days, interval)
+        print(f"합성 CSV: {days}일, {rows:,}행 ({time.perf_counter() - t0:.1f}초), CPU {os.cpu_count()}개")
+
+        start_date = (end - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        end_date = end.strftime('%Y-%m-%d')
+        reader = DataReader()
+        cache = reader.parse_cache
+        cache.max_bytes = config.LOG_PARSE_CACHE_BYTES
+        paths = [reader._log_file((end - timedelta(days=d)).strftime('%Y-%m-%d')) for d in range(days - 1, -1, -1)]
+
+        print(f"\n{'작업 수':<8}{'파싱':>12}{'read_log_data':>16}{'read_columns':>15}{'배율(파싱)':>12}")
+        base = None
+        for workers in range(1, max_workers + 1):
+            parallel_reader.WORKERS = workers
+            if workers > 1:
+                list(parallel_reader.parse_files(paths[:workers], workers))  # 풀 시작 비용 제외
+
+            t0 = time.perf_counter()
+            list(parallel_reader.parse_files(paths, workers))
+            parse_sec = time.perf_counter() - t0
+
+            cache.clear()
+            t0 = time.perf_counter()
+            data = reader.read_log_data(start_date, end_date)
+            rows_sec = time.perf_counter() - t0
+
+            cache.clear()
+            t0 = time.perf_counter()
+            reader.read_columns(start_date, end_date, ['Temp_C', 'Hum_Pct', 'Lux'])
+            cols_sec = time.perf_counter() - t0
+            cache.clear()
+
+            base = base or parse_sec
+            print(f"{workers:<8}{parse_sec:>11.2f}s{rows_sec:>15.2f}s{cols_sec:>14.2f}s{base / parse_sec:>11.2f}x")
+        parallel_reader.shutdown()
+
+        # 날짜별로 이미 시간순이고 서로 겹치지 않는 행: 이어 붙이기 vs 전체 정렬 vs k-way 병합
+        per_day = {}
+        for row in data:
+            per_day.setdefault(row['_date'], []).append(row)
+        chunks = list(per_day.values())
+        t0 = time.perf_counter()
+        list(chain.from_iterable(chunks))
+        chain_sec = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        sorted([row for chunk in chunks for row in chunk], key=itemgetter('_ts'))
+        sort_sec = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        list(heapq.merge(*chunks, key=itemgetter('_ts')))
+        merge_sec = time.perf_counter() - t0
+        print(f"\n{len(data):,}행 {len(chunks)}개 날짜: 이어 붙이기 {chain_sec * 1000:.0f}ms, "
+              f"Timsort {sort_sec * 1000:.0f}ms, heapq 병합 {merge_sec * 1000:.0f}ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+DATA 프레임 파싱 마이크로벤치마크
+- 기존 방식 (split + float/int 이중 변환) vs core.protocol.FrameParser
+사용법: python3 scripts/bench_protocol.py [반복 횟수]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.protocol import FrameParser
+
+SAMPLE_LINE = "DATA,23.40,45.10,512,48,612,1.57"
+
+
+def legacy_parse(line):
+    """기존 serial_thread_A 방식 (상태 업데이트 + 로그 문자열 생성 시 재변환)"""
+    parts = line.split(',')
+    if len(parts) < 6:
+        return None
+    state = {
+        'temp': float(parts[1]),
+        'hum': float(parts[2]),
+        'soil_pct': int(parts[4]),
+        'adc': int(parts[5]),
+        'vpd': float(parts[6]) if len(parts) > 6 else 0.0,
+    }
+    p6 = parts[6] if len(parts) > 6 else "0"
+    strings = (f"{float(parts[1]):.1f}", f"{float(parts[2]):.1f}",
+               f"{float(p6):.2f}" if p6 and p6 != "0" else "0.00")
+    return state, strings
+
+
+def frame_parse(parser, line):
+    """FrameParser 방식 (한 번 파싱한 SensorFrame 재사용)"""
+    frame = parser.parse(line)
+    strings = (f"{frame.temp:.1f}", f"{frame.hum:.1f}",
+               f"{frame.vpd:.2f}" if frame.vpd else "0.00")
+    return frame, strings
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    parser = FrameParser()
+
+    results = {
+        'legacy': min(timeit.repeat(lambda: legacy_parse(SAMPLE_LINE), number=number, repeat=5)),
+        'frame_parser': min(timeit.repeat(lambda: frame_parse(parser, SAMPLE_LINE), number=number, repeat=5)),
+        'frame_parser (parse only)': min(timeit.repeat(lambda: parser.parse(SAMPLE_LINE), number=number, repeat=5)),
+    }
+
+    print(f"반복 횟수: {number:,}")
+    for name, total in results.items():
+        print(f"  {name:<28} {total / number * 1e6:7.3f} µs/frame")
+    print(f"파서 통계: {parser.stats()}")
+
+
+if __name__ == "__main__":
+    main()
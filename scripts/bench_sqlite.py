@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+CSV DataReader vs SqliteReader 조회 시간 비교 (합성 데이터)
+- 임시 폴더에 일별 CSV를 만들고(기본 1년, 60초 간격) 같은 데이터를 SQLite로 적재
+- 1일/7일 범위 조회, 최신 행, 30일 통계(캐시 없음/있음), 날짜 목록 시간 측정
+- 실제 로그(LOG_DIR)와 저장소 파일은 건드리지 않음
+사용법: python3 scripts/bench_sqlite.py [--days N] [--interval 초] [--repeat N]
+"""
+import csv
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+def _option(args, name, default):
+    if name in args:
+        return int(args[args.index(name) + 1])
+    return default
+
+
+def write_synthetic_logs(log_dir: str, end: datetime, days: int, interval: int) -> int:
+    """CSV_HEADER 형식의 일별 CSV 생성 (하루 주기 온도/조도 + 잡음)"""
+    from core.logger import CSV_HEADER
+    rng = random.Random(42)
+    total = 0
+    for d in range(days):
+        day = end - timedelta(days=days - 1 - d)
+        date_str = day.strftime('%Y-%m-%d')
+        month_dir = os.path.join(log_dir, day.strftime('%Y-%m'))
+        os.makedirs(month_dir, exist_ok=True)
+        with open(os.path.join(month_dir, f'smartfarm_log_{date_str}.csv'), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            watering = 0
+            for sec in range(0, 86400, interval):
+                phase = math.sin((sec / 86400 - 0.25) * 2 * math.pi)
+                lux = max(0, int(20000 * phase + rng.uniform(-500, 500)))
+                fan = 'ON' if phase > 0.5 else 'OFF'
+                if sec % 21600 == 0:
+                    watering += 1
+                writer.writerow([
+                    f"{date_str} {sec // 3600:02d}:{sec % 3600 // 60:02d}:{sec % 60:02d}",
+                    round(22 + 6 * phase + rng.uniform(-0.5, 0.5), 1), round(60 - 15 * phase, 1),
+                    rng.randint(400, 700), rng.randint(30, 60), lux,
+                    round(0.8 + 0.6 * phase, 2), round(max(0.0, sec / 86400 * 12), 2),
+                    'OFF', fan, 'ON' if lux < 5000 else 'OFF', 'OFF', 'OPEN' if phase > 0 else 'CLOSED',
+                    60 if fan == 'ON' else 0, 80 if lux < 5000 else 0, 0,
+                    'False', watering, round(watering * 0.5, 1),
+                ])
+                total += 1
+    return total
+
+
+def timed(fn, repeat: int) -> float:
+    """repeat회 평균 (ms)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    args = sys.argv[1:]
+    days = _option(args, '--days', 365)
+    interval = _option(args, '--interval', 60)
+    repeat = _option(args, '--repeat', 3)
+
+    work_dir = tempfile.mkdtemp(prefix='smartfarm_bench_')
+    config.LOG_DIR = os.path.join(work_dir, 'logs_data')
+    config.COLUMNAR_DIR = os.path.join(work_dir, 'logs_columnar')  # 없음 → CSV 경로만 측정
+    config.SQLITE_LOG_FILE = os.path.join(work_dir, 'smartfarm.db')
+
+    from core.data_reader import DataReader
+    from core.sqlite_store import SqliteLogStore, SqliteReader
+
+    try:
+        end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        t0 = time.perf_counter()
+        rows = write_synthetic_logs(config.LOG_DIR, end, days, interval)
+        print(f"합성 CSV: {days}일, {rows:,}행 ({time.perf_counter() - t0:.1f}초)")
+
+        t0 = time.perf_counter()
+        store = SqliteLogStore()
+        for name in sorted(os.listdir(config.LOG_DIR)):
+            month_dir = os.path.join(config.LOG_DIR, name)
+            for filename in sorted(os.listdir(month_dir)):
+                store.load_csv(os.path.join(month_dir, filename))
+        store.close()
+        print(f"SQLite 적재: {time.perf_counter() - t0:.1f}초, "
+              f"{os.path.getsize(config.SQLITE_LOG_FILE) / 1e6:.1f}MB "
+              f"(CSV {sum(os.path.getsize(os.path.join(dp, f)) for dp, _, fs in os.walk(config.LOG_DIR) for f in fs) / 1e6:.1f}MB)")
+
+        last = end.strftime('%Y-%m-%d')
+        week = (end - timedelta(days=6)).strftime('%Y-%m-%d')
+        month = (end - timedelta(days=29)).strftime('%Y-%m-%d')
+        cases = [
+            ('1일 조회', lambda r: r.read_log_data(last, last)),
+            ('7일 조회', lambda r: r.read_log_data(week, last)),
+            ('7일 열 조회 (2필드)', lambda r: r.read_columns(week, last, ['Temp_C', 'Hum_Pct'])),
+            ('최신 행 10개', lambda r: r.get_latest_rows(10)),
+            ('날짜 목록', lambda r: r.get_available_dates()),
+        ]
+
+        readers = {'CSV': DataReader(), 'SQLite': SqliteReader()}
+        print(f"\n{'':<24}{'CSV':>12}{'SQLite':>12}{'배율':>8}")
+        for name, fn in cases:
+            times = {label: timed(lambda: fn(reader), repeat) for label, reader in readers.items()}
+            print(f"{name:<24}{times['CSV']:>10.1f}ms{times['SQLite']:>10.1f}ms{times['CSV'] / max(times['SQLite'], 1e-6):>7.1f}x")
+
+        # 통계: 새 리더(캐시 없음) 한 번 → 같은 리더 다시 (날짜별 집계 캐시)
+        cold = {}
+        warm = {}
+        for label, cls in (('CSV', DataReader), ('SQLite', SqliteReader)):
+            reader = cls()
+            cold[label] = timed(lambda: reader.get_statistics(month, last), 1)
+            warm[label] = timed(lambda: reader.get_statistics(month, last), repeat)
+        for name, times in (('30일 통계 (캐시 없음)', cold), ('30일 통계 (캐시)', warm)):
+            print(f"{name:<24}{times['CSV']:>10.1f}ms{times['SQLite']:>10.1f}ms{times['CSV'] / max(times['SQLite'], 1e-6):>7.1f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
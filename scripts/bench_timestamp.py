@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Timestamp 파싱 방법별 속도 비교 (하루치 CSV 한 파일)
+- strptime(기존) / 자정 epoch + 슬라이싱 / core.csv_index.parse_ts(고정 형식 → datetime.fromisoformat)
+- 파일 전체 파싱(core.parse_cache.ParsedLog)을 기존 strptime과 parse_ts로 각각 측정
+- CSV를 지정하지 않으면 임시 폴더에 합성 하루치(10초 간격, 8640행) 생성
+사용법: python3 scripts/bench_timestamp.py [CSV 파일] [--repeat N]
+"""
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_sqlite import write_synthetic_logs, _option
+from core import csv_index, parse_cache
+from core.csv_index import parse_ts, TS_FORMAT
+
+
+def strptime_epoch(text: str) -> int:
+    return int(datetime.strptime(text, TS_FORMAT).timestamp())
+
+
+def make_midnight_epoch():
+    midnights = {}
+
+    def midnight_epoch(text: str) -> int:
+        base = midnights.get(text[:10])
+        if base is None:
+            base = midnights[text[:10]] = int(datetime.strptime(text[:10], '%Y-%m-%d').timestamp())
+        return base + int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+    return midnight_epoch
+
+
+def timed(fn, values, repeat: int) -> float:
+    """값 하나당 평균 시간 (µs)"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for value in values:
+            fn(value)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(values) * 1e6
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = _option(args, '--repeat', 5)
+    paths = [a for a in args if not a.startswith('--') and not a.isdigit()]
+
+    work_dir = None
+    if paths:
+        csv_path = paths[0]
+    else:
+        work_dir = tempfile.mkdtemp(prefix='smartfarm_bench_')
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        write_synthetic_logs(work_dir, day, 1, 10)
+        csv_path = os.path.join(work_dir, day.strftime('%Y-%m'), f"smartfarm_log_{day.strftime('%Y-%m-%d')}.csv")
+
+    try:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            timestamps = [row['Timestamp'] for row in csv.DictReader(f)]
+        print(f"{csv_path}: {len(timestamps):,}행")
+
+        methods = [
+            ('strptime (기존)', strptime_epoch),
+            ('자정 epoch + 슬라이싱', make_midnight_epoch()),
+            ('parse_ts (fromisoformat)', parse_ts),
+        ]
+        for _, fn in methods[1:]:
+            assert [fn(t) for t in timestamps] == [strptime_epoch(t) for t in timestamps]
+        base = None
+        print(f"\n{'방법':<24}{'µs/행':>8}{'하루':>10}{'배율':>8}")
+        for name, fn in methods:
+            per_row = timed(fn, timestamps, repeat)
+            base = base or per_row
+            print(f"{name:<24}{per_row:>8.2f}{per_row * len(timestamps) / 1000:>8.1f}ms{base / per_row:>7.1f}x")
+
+        # 파일 전체 파싱 (CSV 분할 + 사전 인코딩 포함)
+        size = os.path.getsize(csv_path)
+        results = {}
+        for name, fn in (('strptime', strptime_epoch), ('parse_ts', csv_index.parse_ts)):
+            parse_cache.parse_ts = fn
+            best = None
+            for _ in range(repeat):
+                entry = parse_cache.ParsedLog(csv_path, 0)
+                started = time.perf_counter()
+                entry.consume(size)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = best
+        parse_cache.parse_ts = csv_index.parse_ts
+        print(f"\n파일 전체 파싱: strptime {results['strptime'] * 1000:.0f}ms → parse_ts {results['parse_ts'] * 1000:.0f}ms "
+              f"({results['strptime'] / results['parse_ts']:.1f}x)")
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+기존 일별 CSV 로그 → 컬럼형 바이너리 로그 변환
+- 이미 변환된 날짜는 건너뜀 (--force: 다시 변환)
+- 오늘 파일은 로거가 기록 중이므로 기본적으로 건너뜀 (--include-today: 포함)
+사용법: python3 scripts/convert_csv_to_columnar.py [--force] [--include-today] [YYYY-MM-DD ...]
+"""
+import glob
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.columnar import convert_csv_file, ColumnarDay
+
+
+def main():
+    args = sys.argv[1:]
+    force = '--force' in args
+    include_today = '--include-today' in args
+    dates = [a for a in args if not a.startswith('--')]
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    csv_files = sorted(glob.glob(os.path.join(config.LOG_DIR, '*', 'smartfarm_log_*.csv')))
+
+    converted = 0
+    total_rows = 0
+    started = time.time()
+    for csv_path in csv_files:
+        date_str = os.path.basename(csv_path).replace('smartfarm_log_', '').replace('.csv', '')
+        if dates and date_str not in dates:
+            continue
+        if date_str == today and not include_today:
+            print(f"  ⏭️  {date_str}: 오늘 파일 건너뜀 (--include-today로 포함)")
+            continue
+        rows = convert_csv_file(csv_path, overwrite=force)
+        if rows:
+            converted += 1
+            total_rows += rows
+            print(f"  ✅ {date_str}: {rows}행 변환 ({len(ColumnarDay(date_str))}행 확인)")
+        else:
+            print(f"  ⏭️  {date_str}: 이미 변환됨 또는 빈 파일")
+
+    print(f"\n총 {converted}개 파일, {total_rows}행 변환 ({time.time() - started:.1f}초)")
+    print(f"저장 위치: {config.COLUMNAR_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+기존 일별 CSV 로그 → SQLite 로그 저장소(SQLITE_LOG_FILE) 적재
+- 같은 (구역, 시각) 행은 교체되므로 여러 번 실행해도 중복 없음
+- 오늘 파일도 적재 (DATA_BACKEND='sqlite'로 바꾸기 전에 한 번 실행)
+사용법: python3 scripts/load_csv_to_sqlite.py [시작일 [종료일]]
+"""
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from core.sqlite_store import SqliteLogStore
+
+
+def main():
+    dates = [a for a in sys.argv[1:] if not a.startswith('--')]
+    start_date = dates[0] if dates else None
+    end_date = dates[1] if len(dates) > 1 else None
+
+    store = SqliteLogStore()
+    csv_files = sorted(glob.glob(os.path.join(config.LOG_DIR, '*', 'smartfarm_log_*.csv')))
+
+    loaded_days = 0
+    total_rows = 0
+    started = time.time()
+    for csv_path in csv_files:
+        date_str = os.path.basename(csv_path).replace('smartfarm_log_', '').replace('.csv', '')
+        if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+            continue
+        rows = store.load_csv(csv_path)
+        print(f"  ✅ {date_str}: {rows}행")
+        loaded_days += 1
+        total_rows += rows
+    store.close()
+
+    print(f"총 {loaded_days}일, {total_rows}행 적재 ({time.time() - started:.1f}초)")
+    print(f"저장 위치: {store.path} (구역: {store.zone})")
+
+
+if __name__ == '__main__':
+    main()
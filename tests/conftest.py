@@ -0,0 +1,12 @@
+"""
+pytest 공통 설정
+- 프로젝트 루트를 import 경로에 추가 (core, config)
+- 하드웨어가 필요한 수동 실행 스크립트는 수집하지 않음
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 시리얼 포트/카메라에 직접 연결하는 수동 테스트 스크립트
+collect_ignore = ['serial_test.py', 'focus.py']
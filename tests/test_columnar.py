@@ -0,0 +1,90 @@
+"""
+컬럼형 일별 로그 테스트 (core.columnar)
+- CSV와 같은 행을 담은 날만 컬럼형으로 읽고, 일부만 담은 날은 CSV로 대체
+"""
+import pytest
+
+import config
+from core.columnar import ColumnarLogWriter, ColumnarDay, convert_csv_file
+from core.data_reader import DataReader
+from core.logger import CsvLogWriter, get_log_path
+
+DATE = '2026-01-02'
+
+
+@pytest.fixture
+def log_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'LOG_DIR', str(tmp_path / 'logs'))
+    monkeypatch.setattr(config, 'COLUMNAR_DIR', str(tmp_path / 'columnar'))
+    return tmp_path
+
+
+def _rows(start, stop):
+    return [[f"{DATE} {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}", 20 + i % 7, 50.0, 300, 40, 1000,
+             0.8, 1.5, 'ON' if i % 10 == 0 else 'OFF', 'OFF', 'ON', 'OFF', 'CLOSED', 0, 80, 0, False, 1, 0.5]
+            for i in range(start, stop)]
+
+
+def _write_csv(rows):
+    writer = CsvLogWriter(index_every=10)
+    writer.write_rows(rows)
+    writer.close()
+    return get_log_path(DATE)[1]
+
+
+def _write_columnar(rows):
+    writer = ColumnarLogWriter()
+    writer.write_rows(rows)
+    writer.close()
+
+
+def test_round_trip(log_dirs):
+    _write_columnar(_rows(0, 50))
+    day = ColumnarDay(DATE)
+    assert len(day) == 50
+    rows = day.rows()
+    assert rows[10]['Timestamp'] == f'{DATE} 00:00:10'
+    assert rows[10]['Valve_Status'] == 'ON'
+    assert rows[10]['Emergency_Stop'] == 'False'
+    assert rows[11]['Temp_C'] == 24.0
+
+
+def test_partial_day_falls_back_to_csv(log_dirs):
+    csv_path = _write_csv(_rows(0, 100))
+    # 컬럼형 기록이 하루 중간(40행째)부터 켜짐
+    _write_columnar(_rows(40, 100))
+    reader = DataReader()
+    assert not ColumnarDay(DATE).covers(csv_path)
+    assert reader.columnar_day(DATE) is None
+
+    cols = reader.read_columns(DATE, DATE, ['Temp_C', 'Valve_Status'])
+    assert len(cols['Timestamp']) == 100
+    assert cols['Valve_Status'][:11] == ['ON'] + ['OFF'] * 9 + ['ON']
+
+
+def test_complete_day_uses_columnar_until_csv_grows(log_dirs):
+    csv_path = _write_csv(_rows(0, 100))
+    convert_csv_file(csv_path)
+    reader = DataReader()
+    assert reader.columnar_day(DATE) is not None
+    assert len(reader.read_columns(DATE, DATE, ['Temp_C'])['Timestamp']) == 100
+
+    # 컬럼형 배치 기록이 실패해 CSV에만 행이 추가됨 → CSV로 대체해 빠지는 행이 없음
+    _write_csv(_rows(100, 130))
+    assert reader.columnar_day(DATE) is None
+    cols = reader.read_columns(DATE, DATE, ['Temp_C'])
+    assert len(cols['Timestamp']) == 130
+    assert cols['Temp_C'][-1] == 20 + 129 % 7
+
+
+def test_without_csv_columnar_is_used(log_dirs):
+    _write_columnar(_rows(0, 30))
+    assert DataReader().columnar_day(DATE) is not None
+
+
+def test_statistics_count_all_csv_rows_on_partial_day(log_dirs):
+    from core.statistics import StatisticsEngine
+    _write_csv(_rows(0, 100))
+    _write_columnar(_rows(40, 100))
+    stats = StatisticsEngine(DataReader(), fields=['Temp_C']).get_statistics(DATE, DATE)
+    assert stats['Temp_C']['count'] == 100
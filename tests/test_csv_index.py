@@ -0,0 +1,95 @@
+"""
+CSV 사이드카 오프셋 인덱스, 끝부분 읽기 테스트 (core.csv_index, LatestRowCache)
+"""
+from datetime import datetime
+
+from core.csv_index import iter_rows_from, load_index, offset_for, parse_ts, read_tail, scan_csv
+from core.logger import CsvLogWriter, LatestRowCache
+
+HEADER = ['Timestamp', 'Temp_C', 'Valve_Status']
+
+
+def _line(i: int) -> str:
+    return f"2026-01-02 {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d},{20 + i % 7},{'ON' if i % 5 == 0 else 'OFF'}\n"
+
+
+def _writer(tmp_path, every):
+    path = str(tmp_path / 'smartfarm_log_2026-01-02.csv')
+    return path, CsvLogWriter(header=HEADER, path_fn=lambda date_str: (str(tmp_path), path), index_every=every)
+
+
+def _log_rows(start, stop):
+    return [_line(i).rstrip('\n').split(',') for i in range(start, stop)]
+
+
+def test_index_writer_resumes_after_reopen(tmp_path):
+    path, writer = _writer(tmp_path, every=10)
+    writer.write_rows(_log_rows(0, 25))
+    writer.close()
+
+    # 로거 재시작: 기존 인덱스의 마지막 항목부터 행 수를 세어 이어서 기록
+    path, writer = _writer(tmp_path, every=10)
+    writer.write_rows(_log_rows(25, 47))
+    writer.close()
+
+    entries = load_index(path)
+    assert entries == scan_csv(path, 10)[0]
+    assert [row for _, _, row in entries] == [0, 10, 20, 30, 40]
+    with open(path, 'rb') as f:
+        for ts, offset, row in entries:
+            f.seek(offset)
+            assert f.readline().decode().startswith(_line(row)[:19])
+
+
+def test_range_seek(tmp_path):
+    path, writer = _writer(tmp_path, every=10)
+    writer.write_rows(_log_rows(0, 100))
+    writer.close()
+
+    # 35번째 행 이전의 마지막 항목(30행)부터 읽음
+    entries = load_index(path)
+    start = parse_ts('2026-01-02 00:00:35')
+    rows = list(iter_rows_from(path, offset_for(entries, start)))
+    assert rows[0]['Timestamp'] == '2026-01-02 00:00:30'
+    assert len(rows) == 70
+    assert offset_for(entries, start - 3600) is None
+
+
+def test_truncated_csv_invalidates_index(tmp_path):
+    path, writer = _writer(tmp_path, every=10)
+    writer.write_rows(_log_rows(0, 50))
+    writer.close()
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(HEADER) + '\n' + _line(0))
+    assert load_index(path) == []
+
+
+def test_parse_ts_local_time():
+    assert parse_ts('2026-01-02 12:30:05') == int(datetime(2026, 1, 2, 12, 30, 5).timestamp())
+
+
+def test_read_tail(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(HEADER) + '\n' + ''.join(_line(i) for i in range(500)) + '2026-01-02 00:08:20,2')
+
+    # 블록이 줄보다 작거나 파일보다 큰 경우 모두 같은 결과, 기록 중인 마지막 줄은 제외
+    for block_size in (7, 64, 1 << 20):
+        rows = read_tail(path, 3, block_size=block_size)
+        assert [row['Timestamp'] for row in rows] == ['2026-01-02 00:08:17', '2026-01-02 00:08:18',
+                                                      '2026-01-02 00:08:19']
+        assert rows[-1] == {'Timestamp': '2026-01-02 00:08:19', 'Temp_C': '22', 'Valve_Status': 'OFF'}
+    assert len(read_tail(path, 1000, block_size=64)) == 500
+    assert read_tail(path, 0) == []
+
+
+def test_latest_row_cache():
+    cache = LatestRowCache(maxlen=3, header=HEADER)
+    assert cache.get(1) is None
+    cache.extend([['2026-01-02 00:00:00', 20.5, 'OFF'], ['2026-01-02 00:00:10', None, 'ON']])
+    assert cache.get(1) == [{'Timestamp': '2026-01-02 00:00:10', 'Temp_C': '', 'Valve_Status': 'ON'}]
+    cache.extend([[f'2026-01-02 00:00:{s}', 21, 'OFF'] for s in (20, 30)])
+    assert [row['Timestamp'] for row in cache.get(3)] == ['2026-01-02 00:00:10', '2026-01-02 00:00:20',
+                                                         '2026-01-02 00:00:30']
+    # 보관 개수보다 많이 요청하면 None (호출 측이 파일 끝 읽기로 대체)
+    assert cache.get(4) is None
@@ -0,0 +1,75 @@
+"""
+CSV 로그 읽기 테스트 (core.data_reader)
+- 내부 행은 epoch 초(_ts)만 들고 다니고, 공개 API로 반환할 때만 _timestamp(datetime) 부여
+- 파싱 캐시 경로와 CSV 직접 파싱 경로의 결과가 같음
+"""
+from datetime import datetime
+
+import pytest
+
+import config
+from core.data_reader import DataReader
+from core.logger import CsvLogWriter
+
+DATE = '2026-01-02'
+
+
+@pytest.fixture
+def reader(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'LOG_DIR', str(tmp_path / 'logs'))
+    monkeypatch.setattr(config, 'COLUMNAR_DIR', str(tmp_path / 'columnar'))
+    writer = CsvLogWriter(index_every=10)
+    writer.write_rows([[f"{DATE} {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}", 20 + i % 7, 50.0, 300, 40, 1000,
+                        0.8, 1.5, 'ON' if i % 10 == 0 else 'OFF', 'OFF', 'ON', 'OFF', 'CLOSED', 0, 80, 0, False, 1, 0.5]
+                       for i in range(0, 600, 3)])
+    writer.close()
+    return DataReader()
+
+
+def _uncached(reader):
+    reader.parse_cache = None
+    return reader
+
+
+def test_rows_carry_epoch_and_datetime(reader):
+    rows = reader.read_log_data(DATE, DATE)
+    assert len(rows) == 200
+    for row in rows[:5]:
+        assert isinstance(row['_ts'], int)
+        assert row['_timestamp'] == datetime.fromtimestamp(row['_ts'])
+        assert row['_timestamp'].strftime('%Y-%m-%d %H:%M:%S') == row['Timestamp']
+
+
+@pytest.mark.parametrize('cached', [True, False])
+def test_time_range_matches_between_paths(reader, cached):
+    if not cached:
+        _uncached(reader)
+    start = datetime(2026, 1, 2, 0, 1, 0, 500000)  # 경계 소수점: 00:01:01 이후만
+    end = datetime(2026, 1, 2, 0, 2, 0)
+    rows = reader.read_log_data(DATE, DATE, start_time=start, end_time=end)
+    assert [row['Timestamp'][11:] for row in rows] == [f"00:01:{s:02d}" for s in range(3, 60, 3)] + ['00:02:00']
+
+
+def test_read_columns_csv_fallback_matches_parse_cache(reader):
+    start_ts = datetime(2026, 1, 2, 0, 5, 0).timestamp() + 0.5
+    end_ts = datetime(2026, 1, 2, 0, 8, 0).timestamp()
+    cached = reader.read_columns(DATE, DATE, ['Temp_C', 'Valve_Status'], start_ts, end_ts)
+    fallback = _uncached(DataReader()).read_columns(DATE, DATE, ['Temp_C', 'Valve_Status'], start_ts, end_ts)
+    assert fallback == cached
+    assert all(isinstance(ts, int) for ts in fallback['Timestamp'])
+    assert fallback['Timestamp'][0] == int(start_ts) + 3  # 00:05:00은 범위 밖, 다음 행은 3초 뒤
+    assert fallback['Timestamp'][-1] == int(end_ts)
+
+
+@pytest.mark.parametrize('cached', [True, False])
+def test_multi_day_rows_are_concatenated_in_date_order(reader, cached):
+    if not cached:
+        _uncached(reader)
+    writer = CsvLogWriter(index_every=10)
+    writer.write_rows([[f"2026-01-03 00:00:{s:02d}", 21, 50.0, 300, 40, 1000, 0.8, 1.5,
+                        'OFF', 'OFF', 'ON', 'OFF', 'CLOSED', 0, 80, 0, False, 1, 0.5] for s in range(10)])
+    writer.close()
+    rows = reader.read_log_data(DATE, '2026-01-03')
+    assert len(rows) == 210
+    assert [row['_date'] for row in rows[199:201]] == [DATE, '2026-01-03']
+    assert all(a['_ts'] < b['_ts'] for a, b in zip(rows, rows[1:]))
@@ -0,0 +1,44 @@
+"""
+차트용 다운샘플링 테스트 (core.downsample)
+- 버려지는 행 사이의 밸브 ON 구간을 대표 행에 남기는지
+"""
+import math
+
+from core.downsample import METHOD_LTTB, METHOD_MINMAX, downsample_columns, downsample_rows
+
+
+def _rows(n, on_rows):
+    return [{'Timestamp': f"2026-01-02 {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+             'Temp_C': 20.0 + math.sin(i / 50.0),
+             'Valve_Status': 'ON' if i in on_rows else 'OFF'} for i in range(n)]
+
+
+def test_downsample_keeps_valve_on_interval():
+    on_rows = {503, 504}
+    for method in (METHOD_LTTB, METHOD_MINMAX):
+        rows = _rows(1000, on_rows)
+        result = downsample_rows(rows, 50, method=method)
+        assert len(result) <= 60
+        assert sum(row['Valve_Status'] == 'ON' for row in result) == 1
+        # 원본 행은 바꾸지 않음
+        assert [i for i, row in enumerate(rows) if row['Valve_Status'] == 'ON'] == sorted(on_rows)
+
+
+def test_downsample_short_input_unchanged():
+    rows = _rows(10, set())
+    assert downsample_rows(rows, 50) is rows
+
+
+def test_downsample_columns_keeps_valve_on_interval():
+    rows = _rows(1000, {777})
+    columns = {'Timestamp': [1767312000 + i for i in range(1000)],
+               'Temp_C': [row['Temp_C'] for row in rows],
+               'Valve_Status': [row['Valve_Status'] for row in rows]}
+    for method in (METHOD_LTTB, METHOD_MINMAX):
+        result = downsample_columns(columns, 50, method=method)
+        assert len(result['Timestamp']) == len(result['Valve_Status']) <= 60
+        assert result['Valve_Status'].count('ON') == 1
+        assert result['Timestamp'] == sorted(result['Timestamp'])
+        assert result['Timestamp'][0] == columns['Timestamp'][0]
+        assert result['Timestamp'][-1] == columns['Timestamp'][-1]
+    assert columns['Valve_Status'].count('ON') == 1
@@ -0,0 +1,78 @@
+"""
+이벤트 버스 테스트 (큐 정책: drop_oldest / drop_newest / coalesce)
+"""
+import threading
+
+import pytest
+
+from core.event_bus import (POLICY_COALESCE, POLICY_DROP_NEWEST, POLICY_DROP_OLDEST, TOPIC_ACTUATOR_CHANGED,
+                            TOPIC_SENSOR_FRAME, EventBus)
+
+
+def _payloads(sub):
+    return [event.payload for event in sub.drain(timeout=0)]
+
+
+def test_drop_oldest_keeps_latest():
+    bus = EventBus()
+    sub = bus.subscribe(TOPIC_SENSOR_FRAME, maxsize=3, policy=POLICY_DROP_OLDEST)
+    for i in range(5):
+        assert bus.publish(TOPIC_SENSOR_FRAME, i) == 1
+    assert _payloads(sub) == [2, 3, 4]
+    assert sub.stats()['dropped'] == 2
+    assert sub.stats()['delivered'] == 5
+
+
+def test_drop_newest_keeps_earliest():
+    bus = EventBus()
+    sub = bus.subscribe(TOPIC_SENSOR_FRAME, maxsize=3, policy=POLICY_DROP_NEWEST)
+    for i in range(5):
+        bus.publish(TOPIC_SENSOR_FRAME, i)
+    assert _payloads(sub) == [0, 1, 2]
+    assert sub.stats()['dropped'] == 2
+
+
+def test_coalesce_keeps_latest_per_key():
+    bus = EventBus()
+    sub = bus.subscribe([TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED], policy=POLICY_COALESCE)
+    bus.publish(TOPIC_SENSOR_FRAME, 1)
+    bus.publish(TOPIC_ACTUATOR_CHANGED, 'fan')
+    bus.publish(TOPIC_SENSOR_FRAME, 2)
+    # 병합된 이벤트는 최신 값으로 교체되고 순서는 맨 뒤로
+    assert _payloads(sub) == ['fan', 2]
+    assert sub.stats()['coalesced'] == 1
+    assert sub.stats()['dropped'] == 0
+
+
+def test_coalesce_custom_key_and_limit():
+    bus = EventBus()
+    sub = bus.subscribe(TOPIC_ACTUATOR_CHANGED, maxsize=2, policy=POLICY_COALESCE,
+                        key_fn=lambda event: event.payload[0])
+    for payload in [('fan', 1), ('valve', 1), ('fan', 2), ('led', 1)]:
+        bus.publish(TOPIC_ACTUATOR_CHANGED, payload)
+    # 키가 maxsize를 넘으면 가장 오래된 키를 버림
+    assert _payloads(sub) == [('fan', 2), ('led', 1)]
+    assert sub.stats()['coalesced'] == 1
+    assert sub.stats()['dropped'] == 1
+
+
+def test_unsubscribe_and_unknown_policy():
+    bus = EventBus()
+    sub = bus.subscribe(TOPIC_SENSOR_FRAME)
+    sub.close()
+    assert bus.publish(TOPIC_SENSOR_FRAME, 1) == 0
+    assert bus.stats()['published'] == {TOPIC_SENSOR_FRAME: 1}
+    with pytest.raises(ValueError):
+        bus.subscribe(TOPIC_SENSOR_FRAME, policy='block')
+
+
+def test_close_wakes_waiting_reader():
+    bus = EventBus()
+    sub = bus.subscribe(TOPIC_SENSOR_FRAME)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(sub.get(timeout=5)))
+    reader.start()
+    sub.close()
+    reader.join(timeout=2)
+    assert not reader.is_alive()
+    assert result == [None]
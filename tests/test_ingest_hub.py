@@ -0,0 +1,72 @@
+"""
+다중 보드 수신 허브 테스트 (core.ingest_hub)
+- I/O 오류가 난 보드는 센서/액추에이터 모두 포트를 닫고 재연결, 재연결 횟수 기록
+- 전송 쪽(command_port)은 재연결된 새 포트에 씀
+"""
+import pytest
+
+serial = pytest.importorskip('serial')
+
+from core import ingest_hub
+from core.ingest_hub import IngestionHub
+
+
+class FakeSerial:
+    opened = []
+
+    def __init__(self, port, baud_rate, timeout=None):
+        self.port = port
+        self.is_open = True
+        self.written = []
+        FakeSerial.opened.append(self)
+
+    def write(self, data):
+        self.written.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    FakeSerial.opened = []
+    monkeypatch.setattr(ingest_hub.serial, 'Serial', FakeSerial)
+    monkeypatch.setattr(IngestionHub, '_register', lambda self, link: self._registered.add(link.board_id))
+    hub = IngestionHub([{'id': 'A', 'port': '/dev/ttyA'}], [{'id': 'B', 'port': '/dev/ttyB'}], 115200)
+    for link in hub.links.values():
+        hub._open(link)
+        link.settle_until = 0.0
+    return hub
+
+
+@pytest.mark.parametrize('board_id', ['A', 'B'])
+def test_io_error_closes_and_reconnects(hub, board_id):
+    link = hub.links[board_id]
+    port = link.command_port
+    old = link.ser
+
+    hub._on_io_error(link, OSError('device removed'))
+    assert not old.is_open
+    assert link.ser is None
+    assert not port.is_open
+    with pytest.raises(serial.SerialException):
+        port.write(b'M1\n')
+
+    hub._service_connections(link.next_retry)
+    assert link.ser is not old and link.is_connected
+    assert link.stats.reconnects == 1
+    # 재부팅 대기 중에는 전송하지 않고, 안정화 후 새 포트에 씀
+    assert not port.is_open
+    hub._service_connections(link.settle_until)
+    assert port.is_open
+    assert link.command_port is port
+    port.write(b'M1\n')
+    assert link.ser.written == [b'M1\n']
+    assert old.written == []
@@ -0,0 +1,35 @@
+"""
+대시보드 실시간 피드 테스트 (web_ui.live_feed)
+- 상태 행과 알림 분석 결과를 메일박스로 전달 (알림은 표시용 상태만, 전송은 하지 않음)
+"""
+import json
+
+from core.state import StateStore
+from web_ui.live_feed import LiveFeed, EVENT_STATE, EVENT_ALERTS
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.rows = []
+
+    def analyze_current_status(self, row):
+        self.rows.append(row)
+        return [{'id': 1, 'level': 'warning', 'title': '고온', 'message': row['Temp_C'], 'actions': []}]
+
+
+def test_subscribe_publishes_state_and_alerts():
+    analyzer = FakeAnalyzer()
+    feed = LiveFeed(analyzer)
+    store = StateStore({'temp': 31.5, 'fan_status': 'ON', 'emergency_stop': False})
+
+    mailbox = feed.subscribe(store)
+    try:
+        items = dict(mailbox.take(1.0))
+        state = json.loads(items[EVENT_STATE])
+        assert state['data']['Temp_C'] == 31.5
+        assert state['data']['Fan_Status'] == 'ON'
+        assert state['data']['Emergency_Stop'] == 'False'
+        assert json.loads(items[EVENT_ALERTS])['alerts'][0]['message'] == 31.5
+        assert analyzer.rows[0]['Temp_C'] == 31.5
+    finally:
+        feed.unsubscribe(mailbox)
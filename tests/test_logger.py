@@ -0,0 +1,48 @@
+"""
+배치 CSV 기록기 테스트 (core.logger.CsvLogWriter, drain_batch)
+"""
+import queue
+
+from core.logger import CsvLogWriter, drain_batch
+
+HEADER = ['Timestamp', 'Temp_C']
+
+
+def _writer(tmp_path):
+    return CsvLogWriter(header=HEADER, path_fn=lambda date_str: (str(tmp_path), str(tmp_path / f'{date_str}.csv')))
+
+
+def test_batch_split_by_row_date(tmp_path):
+    writer = _writer(tmp_path)
+    # 자정을 걸친 배치: 행의 Timestamp 날짜별 파일로 나뉨
+    written = writer.write_rows([['2026-01-01 23:59:50', 20.5], ['2026-01-01 23:59:59', 20.6],
+                                 ['2026-01-02 00:00:09', 20.7]])
+    writer.close()
+
+    first = (tmp_path / '2026-01-01.csv').read_bytes().decode()
+    second = (tmp_path / '2026-01-02.csv').read_bytes().decode()
+    assert first == 'Timestamp,Temp_C\r\n2026-01-01 23:59:50,20.5\r\n2026-01-01 23:59:59,20.6\r\n'
+    assert second == 'Timestamp,Temp_C\r\n2026-01-02 00:00:09,20.7\r\n'
+    assert written == len(first) + len(second) - 2 * len('Timestamp,Temp_C\r\n')
+    stats = writer.stats()
+    assert (stats['rows_written'], stats['batches_written']) == (3, 1)
+
+
+def test_reopen_appends_without_second_header(tmp_path):
+    writer = _writer(tmp_path)
+    writer.write_rows([['2026-01-02 00:00:00', 1]])
+    writer.close()
+    writer = _writer(tmp_path)
+    writer.write_rows([['2026-01-02 00:00:10', 2]])
+    writer.close()
+    assert (tmp_path / '2026-01-02.csv').read_text().splitlines() == \
+        ['Timestamp,Temp_C', '2026-01-02 00:00:00,1', '2026-01-02 00:00:10,2']
+
+
+def test_drain_batch_limits():
+    q = queue.Queue()
+    for i in range(7):
+        q.put(i)
+    assert drain_batch(q, 5, 0.01) == [0, 1, 2, 3, 4]
+    assert drain_batch(q, 5, 0.01) == [5, 6]
+    assert drain_batch(q, 5, 0.01, first_timeout=0.01) == []
@@ -0,0 +1,157 @@
+"""
+CSV 로그 파싱 캐시 테스트 (core.parse_cache)
+- 워터마크: 파일이 커지면 늘어난 끝부분만 파싱, 기록 중인 마지막 줄은 다음 조회로 미룸
+- 잘리거나(크기 감소) 교체되면(inode 변경) 처음부터 다시 파싱
+- 메모리 예산 LRU, 압축 보관 항목의 크기 계산과 Timestamp 문자열 복원
+"""
+import os
+import sys
+
+from core.parse_cache import LogParseCache, ParsedLog
+
+HEADER = ['Timestamp', 'Temp_C', 'Valve_Status']
+
+
+def _line(i: int) -> str:
+    return f"2026-01-02 {i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d},{20 + i % 7},{'ON' if i % 5 == 0 else 'OFF'}\n"
+
+
+def _write(path, lines, mode='w'):
+    with open(path, mode, newline='', encoding='utf-8') as f:
+        f.write(''.join(lines))
+
+
+def _rows(entry):
+    lo, hi = entry.index_range(None, None)
+    return [values for _, values in entry.iter_values(lo, hi)]
+
+
+def test_append_parses_only_tail(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    _write(path, [','.join(HEADER) + '\n'] + [_line(i) for i in range(100)])
+    cache = LogParseCache()
+
+    entry = cache.get(path)
+    assert len(entry) == 100
+    assert cache.stats()['bytes_parsed'] == os.path.getsize(path)
+
+    # 행 추가 → 같은 항목에 늘어난 바이트만 파싱해 덧붙임
+    tail = [_line(i) for i in range(100, 130)]
+    _write(path, tail, mode='a')
+    before = cache.stats()['bytes_parsed']
+    again = cache.get(path)
+    assert again is entry
+    assert len(entry) == 130
+    assert cache.stats()['bytes_parsed'] - before == len(''.join(tail))
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['incremental_parses'] == 1
+    assert [','.join(values) + '\n' for values in _rows(entry)] == [_line(i) for i in range(130)]
+
+    # 바뀐 것이 없으면 파싱 없이 적중
+    cache.get(path)
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['bytes_parsed'] - before == len(''.join(tail))
+
+
+def test_partial_last_line_is_deferred(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    _write(path, [','.join(HEADER) + '\n'] + [_line(i) for i in range(3)] + ['2026-01-02 00:00:03,2'])
+    cache = LogParseCache()
+
+    entry = cache.get(path)
+    assert len(entry) == 3
+    assert entry.offset == os.path.getsize(path) - len('2026-01-02 00:00:03,2')
+
+    # 기록 중이던 줄이 완성되고 한 줄 더 추가됨
+    _write(path, ['3,ON\n', _line(4)], mode='a')
+    entry = cache.get(path)
+    assert len(entry) == 5
+    assert _rows(entry)[3] == ('2026-01-02 00:00:03', '23', 'ON')
+    assert cache.stats()['incremental_parses'] == 1
+
+
+def test_truncate_and_replace_reparse_fully(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    _write(path, [','.join(HEADER) + '\n'] + [_line(i) for i in range(10)])
+    cache = LogParseCache()
+    assert len(cache.get(path)) == 10
+
+    # 잘림 (크기가 워터마크보다 작아짐) → 새 항목으로 전체 파싱
+    _write(path, [','.join(HEADER) + '\n'] + [_line(i) for i in range(100, 104)])
+    before = cache.stats()['bytes_parsed']
+    entry = cache.get(path)
+    assert len(entry) == 4
+    assert _rows(entry)[0][0] == '2026-01-02 00:01:40'
+    assert cache.stats()['bytes_parsed'] - before == os.path.getsize(path)
+    assert cache.stats()['invalidations'] == 1
+
+    # 교체 (더 큰 새 파일로 rename → 크기는 늘었지만 inode가 바뀜) → 이어 붙이지 않고 전체 파싱
+    tmp = str(tmp_path / 'log.csv.tmp')
+    _write(tmp, [','.join(HEADER) + '\n'] + [_line(i) for i in range(200, 220)])
+    os.replace(tmp, path)
+    before = cache.stats()['bytes_parsed']
+    replaced = cache.get(path)
+    assert replaced is not entry
+    assert len(replaced) == 20
+    assert _rows(replaced)[0][0] == '2026-01-02 00:03:20'
+    assert cache.stats()['bytes_parsed'] - before == os.path.getsize(path)
+    assert cache.stats()['invalidations'] == 2
+    assert cache.stats()['misses'] == 3
+
+
+def test_missing_file_is_dropped(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    _write(path, [','.join(HEADER) + '\n', _line(0)])
+    cache = LogParseCache()
+    cache.get(path)
+    os.remove(path)
+    assert cache.get(path) is None
+    assert not cache.contains(path)
+
+
+def _brute_nbytes(entry):
+    size = entry.epochs.itemsize * len(entry.epochs)
+    size += sum(codes.itemsize * len(codes) for codes in entry.codes)
+    size += sum(sys.getsizeof(table) + sum(sys.getsizeof(v) for v in table) for table in entry.tables)
+    if entry._lookup is not None:
+        size += sum(sys.getsizeof(lookup) for lookup in entry._lookup)
+    return size
+
+
+def test_lru_evicts_over_budget(tmp_path):
+    paths = []
+    for d in range(3):
+        path = str(tmp_path / f'log{d}.csv')
+        _write(path, [','.join(HEADER) + '\n'] + [_line(i) for i in range(0, 3000, 10)])
+        paths.append(path)
+    one = LogParseCache().get(paths[0], closed=True).nbytes
+
+    cache = LogParseCache(max_bytes=one * 2)
+    for path in paths:
+        cache.get(path, closed=True)
+    assert not cache.contains(paths[0])
+    assert cache.contains(paths[1]) and cache.contains(paths[2])
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= one * 2
+
+
+def test_compact_entry_size_and_timestamp_text(tmp_path):
+    path = str(tmp_path / 'log.csv')
+    lines = [_line(i) for i in range(0, 7200, 10)]
+    _write(path, [','.join(HEADER) + '\n'] + lines[:300])
+    cache = LogParseCache()
+
+    # 크기는 추가된 값만 누적해도 전체를 다시 센 값과 같음
+    entry = cache.get(path)
+    assert entry.nbytes == _brute_nbytes(entry)
+    _write(path, lines[300:], mode='a')
+    entry = cache.get(path, closed=True)
+    assert entry._lookup is None
+    assert entry.nbytes == _brute_nbytes(entry)
+    assert ParsedLog.from_parts(entry.to_parts()).nbytes == entry.nbytes
+
+    # Timestamp 열은 사전 없이 epoch만 보관, 문자열은 epoch에서 원본과 같게 다시 만듦
+    assert entry.tables[entry.ts_index] == []
+    assert [','.join(values) + '\n' for values in _rows(entry)] == lines
+    lo, hi = entry.index_range(None, None)
+    assert entry.column('Timestamp', str, lo, hi) == [line.split(',')[0] for line in lines]
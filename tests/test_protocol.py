@@ -0,0 +1,39 @@
+"""
+DATA 프레임 파서 테스트 (core.protocol.FrameParser)
+"""
+from core.protocol import (REJECT_FIELD_COUNT, REJECT_NAN, REJECT_PREFIX, REJECT_VALUE,
+                           FrameParser)
+
+
+def test_accepts_with_and_without_vpd():
+    parser = FrameParser()
+    frame = parser.parse('DATA,24.5,60.0,512,45,300,1.12', rx_monotonic=1.0, board_id='A', zone='main')
+    assert (frame.temp, frame.hum, frame.soil_raw, frame.soil_pct, frame.adc, frame.vpd) == \
+        (24.5, 60.0, 512, 45, 300, 1.12)
+    assert frame.rx_monotonic == 1.0
+    assert frame.board_id == 'A' and frame.zone == 'main'
+    assert parser.parse('DATA,24.5,60.0,512,45,300').vpd is None
+    assert parser.stats() == {'parsed': 2, 'rejected': {}}
+
+
+def test_rejects_by_reason():
+    parser = FrameParser()
+    cases = [
+        ('STATUS,ok', REJECT_PREFIX),
+        ('DATA,24.5,60.0,512,45', REJECT_FIELD_COUNT),
+        ('DATA,24.5,60.0,512,45,300,1.1,extra', REJECT_FIELD_COUNT),
+        ('DATA,abc,60.0,512,45,300', REJECT_VALUE),
+        ('DATA,24.5,60.0,51.2,45,300', REJECT_VALUE),
+        ('DATA,nan,60.0,512,45,300', REJECT_NAN),
+        ('DATA,24.5,inf,512,45,300', REJECT_NAN),
+        ('DATA,24.5,60.0,512,45,300,nan', REJECT_NAN),
+    ]
+    for line, reason in cases:
+        assert parser.parse(line) is None, line
+        assert parser.last_reject == reason, line
+    assert parser.stats()['rejected'] == {REJECT_PREFIX: 1, REJECT_FIELD_COUNT: 2, REJECT_VALUE: 2, REJECT_NAN: 3}
+    assert parser.parsed_count == 0
+
+    # 정상 프레임이 오면 마지막 거부 사유 초기화
+    assert parser.parse('DATA,24.5,60.0,512,45,300') is not None
+    assert parser.last_reject is None
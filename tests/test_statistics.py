@@ -0,0 +1,40 @@
+"""
+기간 통계 테스트 (core.statistics.FieldAggregate)
+- 날짜별 부분 집계를 병합한 결과가 전체 값으로 직접 계산한 값과 같은지
+"""
+import math
+import random
+
+from core.statistics import FieldAggregate
+
+
+def _naive(values):
+    n = len(values)
+    mean = sum(values) / n
+    return n, mean, math.sqrt(sum((v - mean) ** 2 for v in values) / n), min(values), max(values)
+
+
+def test_merge_matches_naive_stats():
+    rng = random.Random(7)
+    days = [[rng.gauss(20 + d, 3 + d) for _ in range(rng.randint(50, 500))] for d in range(5)]
+    days.append([])  # 기록이 없는 날
+
+    merged = FieldAggregate.merge([FieldAggregate.from_values(values) for values in days]).to_dict()
+    count, mean, std, lo, hi = _naive([v for values in days for v in values])
+    assert merged['count'] == count
+    assert math.isclose(merged['avg'], mean, rel_tol=1e-12)
+    assert math.isclose(merged['std'], std, rel_tol=1e-9)
+    assert merged['min'] == lo
+    assert merged['max'] == hi
+
+    # 백분위수는 분위 격자로 근사 (범위의 1% 이내)
+    ordered = sorted(v for values in days for v in values)
+    exact = ordered[len(ordered) // 2]
+    assert abs(merged['p50'] - exact) < (hi - lo) * 0.01
+
+
+def test_merge_single_and_empty():
+    day = FieldAggregate.from_values([1.0, 2.0, 3.0])
+    assert FieldAggregate.merge([day, FieldAggregate()]) is day
+    assert FieldAggregate.merge([]).to_dict()['count'] == 0
+    assert day.to_dict()['p50'] == 2.0
@@ -0,0 +1,60 @@
+"""
+대시보드 열 형식 전송 포맷 테스트 (core.wire_format)
+- rle_encode, columnar_payload, binary_payload 바이트 배치 (헤더 길이, 8바이트 정렬, 열 버퍼)
+"""
+import json
+import math
+import struct
+from array import array
+
+from core.wire_format import BINARY_ALIGN, BINARY_MAGIC, binary_payload, columnar_payload, rle_encode
+
+
+def test_rle_encode():
+    assert rle_encode([]) == []
+    assert rle_encode(['OFF', 'OFF', 'ON', 'OFF']) == [['OFF', 2], ['ON', 1], ['OFF', 1]]
+    assert rle_encode([True] * 5) == [[True, 5]]
+
+
+COLUMNS = {
+    'Timestamp': [1767312000, 1767312010, 1767312020],
+    'Temp_C': [21.5, None, 22.25],
+    'Valve_Status': ['OFF', 'ON', 'ON'],
+    'Emergency_Stop': [False, False, False],
+}
+
+
+def test_columnar_payload():
+    payload = columnar_payload(COLUMNS, {'start_date': '2026-01-02'})
+    assert payload['count'] == 3
+    assert payload['timestamps'] == COLUMNS['Timestamp']
+    assert payload['Temp_C'] == [21.5, None, 22.25]
+    assert payload['Valve_Status'] == {'rle': [['OFF', 1], ['ON', 2]]}
+    assert payload['Emergency_Stop'] == {'rle': [[False, 3]]}
+
+
+def test_binary_payload_layout():
+    data = binary_payload(COLUMNS, {'start_date': '2026-01-02'})
+    assert data[:4] == BINARY_MAGIC
+    (header_len,) = struct.unpack('<I', data[4:8])
+    body = 8 + header_len
+    assert body % BINARY_ALIGN == 0
+    header = json.loads(data[8:body])
+    assert header['format'] == 'binary'
+    assert header['count'] == 3
+    assert header['start_date'] == '2026-01-02'
+    assert header['rle'] == {'Valve_Status': [['OFF', 1], ['ON', 2]], 'Emergency_Stop': [[False, 3]]}
+
+    fields = {f['name']: f for f in header['fields']}
+    assert [f['name'] for f in header['fields']] == ['timestamps', 'Temp_C']
+    for field in fields.values():
+        assert field['offset'] % BINARY_ALIGN == 0
+
+    ts = array('I')
+    ts.frombytes(data[body + fields['timestamps']['offset']:][:4 * 3])
+    assert ts.tolist() == COLUMNS['Timestamp']
+
+    temp = array('f')
+    temp.frombytes(data[body + fields['Temp_C']['offset']:][:4 * 3])
+    assert temp[0] == 21.5 and math.isnan(temp[1]) and temp[2] == 22.25
+    assert len(data) == body + fields['Temp_C']['offset'] + 16  # 12바이트 + 정렬 4바이트
@@ -0,0 +1,177 @@
+"""
+HTTP 응답 압축 (gzip / brotli)
+- API 응답: Accept-Encoding을 보고 br(설치 시) 또는 gzip으로 압축 (HTTP_COMPRESS_MIN_BYTES 이상만)
+  · 스트리밍 응답(stream=ndjson|json)은 청크마다 flush하는 gzip 스트림으로 압축
+  · ETag에 인코딩 접미사(-gz/-br)를 붙여 압축본과 원본을 구분 (http_cache가 304 판단 시 접미사 무시)
+- 정적 파일(web_ui/static): 시작 시 .gz/.br 사본을 한 번 만들어 두고 요청마다 그대로 전송
+  · 원본보다 오래된 사본은 다시 만듦, 압축 이득이 작으면 만들지 않음
+"""
+import gzip
+import mimetypes
+import os
+import zlib
+
+from flask import request, send_from_directory
+
+import config
+
+# brotli는 선택적 (없으면 gzip만)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# 이보다 작은 응답은 압축하지 않음 (헤더/CPU 대비 이득 없음)
+MIN_BYTES = getattr(config, 'HTTP_COMPRESS_MIN_BYTES', 1024)
+# 동적 응답 압축 수준 (Pi CPU 고려: gzip 6, brotli 5) / 정적 사본은 최대 수준
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+# 압축할 응답 형식 (이미지는 이미 압축됨)
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript', 'application/octet-stream',
+    'text/html', 'text/css', 'text/javascript', 'text/plain', 'image/svg+xml',
+}
+STATIC_EXTENSIONS = ('.js', '.css', '.html', '.svg', '.json')
+# 인코딩 → (사본 확장자, ETag 접미사)
+ENCODINGS = {'br': ('.br', '-br'), 'gzip': ('.gz', '-gz')}
+
+
+def accepted_encodings():
+    """요청이 받는 인코딩 (선호 순: br, gzip)"""
+    accept = request.accept_encodings
+    result = []
+    if BROTLI_AVAILABLE and accept['br']:
+        result.append('br')
+    if accept['gzip']:
+        result.append('gzip')
+    return result
+
+
+def compress(data: bytes, encoding: str, static: bool = False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=STATIC_GZIP_LEVEL if static else GZIP_LEVEL, mtime=0)
+
+
+def _gzip_stream(chunks):
+    """청크마다 sync flush (브라우저가 도착한 행부터 바로 풀 수 있도록)"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _mark_encoded(response, encoding):
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + ENCODINGS[encoding][1], weak)
+
+
+def compress_response(response):
+    """after_request: 조건에 맞는 응답 압축"""
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encodings = accepted_encodings()
+    if not encodings:
+        return response
+
+    if response.is_streamed:
+        if 'gzip' not in encodings:
+            return response
+        response.response = _gzip_stream(response.iter_encoded())
+        response.headers.pop('Content-Length', None)
+        _mark_encoded(response, 'gzip')
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_BYTES:
+        return response
+    encoding = encodings[0]
+    response.set_data(compress(data, encoding))  # Content-Length도 갱신됨
+    _mark_encoded(response, encoding)
+    return response
+
+
+def precompress_static(static_dir: str) -> dict:
+    """
+    정적 파일의 .gz/.br 사본 생성 (이미 최신이면 건너뜀)
+    Returns: {'files': 대상 파일 수, 'written': 새로 쓴 사본 수, 'bytes': 원본 합계, 'gzip': gz 합계, 'br': br 합계}
+    """
+    summary = {'files': 0, 'written': 0, 'bytes': 0, 'gzip': 0, 'br': 0}
+    encodings = ['gzip'] + (['br'] if BROTLI_AVAILABLE else [])
+    for dirpath, _, filenames in os.walk(static_dir):
+        for name in filenames:
+            if not name.endswith(STATIC_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            if st.st_size < MIN_BYTES:
+                continue
+            summary['files'] += 1
+            summary['bytes'] += st.st_size
+            data = None
+            for encoding in encodings:
+                variant = path + ENCODINGS[encoding][0]
+                try:
+                    if os.path.getmtime(variant) >= st.st_mtime:
+                        summary[encoding] += os.path.getsize(variant)
+                        continue
+                except OSError:
+                    pass
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                packed = compress(data, encoding, static=True)
+                if len(packed) >= len(data) * 0.9:
+                    continue  # 이득이 작으면 원본 전송
+                tmp_path = variant + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(packed)
+                os.replace(tmp_path, variant)
+                summary['written'] += 1
+                summary[encoding] += len(packed)
+    return summary
+
+
+def init_compression(app, precompress: bool = True) -> None:
+    """압축 응답 훅 등록 + 정적 파일 사본 생성 및 사본 우선 서빙"""
+    app.after_request(compress_response)
+    if not precompress or not app.static_folder:
+        return
+
+    import logging
+    log = logging.getLogger(__name__)
+    try:
+        summary = precompress_static(app.static_folder)
+        log.info(f"[Web] 🗜️ 정적 파일 압축 사본: {summary['files']}개 "
+                 f"({summary['bytes']:,}B → gzip {summary['gzip']:,}B"
+                 f"{', br ' + format(summary['br'], ',') + 'B' if BROTLI_AVAILABLE else ''}, 새로 씀 {summary['written']})")
+    except OSError as e:
+        log.warning(f"[Web] 정적 파일 압축 사본 생성 실패 (원본으로 서빙): {e}")
+        return
+
+    original_static = app.view_functions['static']
+
+    def static_precompressed(filename):
+        for encoding in accepted_encodings():
+            variant = filename + ENCODINGS[encoding][0]
+            if os.path.isfile(os.path.join(app.static_folder, variant)):
+                response = send_from_directory(app.static_folder, variant,
+                                               mimetype=mimetypes.guess_type(filename)[0],
+                                               max_age=app.get_send_file_max_age(filename))
+                response.headers['Content-Encoding'] = encoding
+                response.vary.add('Accept-Encoding')
+                return response
+        return original_static(filename=filename)
+
+    app.view_functions['static'] = static_precompressed
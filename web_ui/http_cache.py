@@ -0,0 +1,111 @@
+"""
+HTTP 캐시 검증 (ETag / Last-Modified / 304)
+- 응답을 만들기 전에 원본 파일들의 (크기, mtime)으로 ETag를 계산해, 브라우저가 가진 것과 같으면 본문 없이 304
+- 끝난 날짜(자정이 지나 로거가 다음 파일로 넘어간 날짜)만 담은 응답은 긴 Cache-Control로 재요청 자체를 줄임
+- 오늘이 포함된 응답은 no-cache (매번 검증하되, 파일이 그대로면 304)
+"""
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import request, make_response
+
+import config
+
+# 끝난 날짜 응답의 캐시 유지 시간 (초)
+CLOSED_MAX_AGE = getattr(config, 'HTTP_CACHE_MAX_AGE_CLOSED', 30 * 24 * 3600)
+# 마지막 기록 후 이 시간이 지나야 끝난 날짜로 취급 (자정 직후 로거 배치에 남은 전날 행 대비)
+CLOSED_GRACE_SEC = 300
+# 응답 형식이 바뀌면 올려서 기존 캐시 무효화
+CACHE_VERSION = '1'
+
+
+def log_file_states(start_date, end_date, log_dir=None):
+    """
+    날짜 범위의 일별 CSV 상태 목록 [(날짜, 크기, mtime_ns)] 과 가장 최근 mtime
+    """
+    log_dir = log_dir or config.LOG_DIR
+    states = []
+    latest = 0.0
+    current = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    while current <= end:
+        date_str = current.strftime('%Y-%m-%d')
+        path = os.path.join(log_dir, date_str[:7], f'smartfarm_log_{date_str}.csv')
+        try:
+            st = os.stat(path)
+        except OSError:
+            current += timedelta(days=1)
+            continue
+        states.append((date_str, st.st_size, st.st_mtime_ns))
+        latest = max(latest, st.st_mtime)
+        current += timedelta(days=1)
+    return states, latest
+
+
+def file_states(paths):
+    """임의 파일 목록의 [(경로, 크기, mtime_ns)] 와 가장 최근 mtime (없는 파일은 제외)"""
+    states = []
+    latest = 0.0
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        states.append((path, st.st_size, st.st_mtime_ns))
+        latest = max(latest, st.st_mtime)
+    return states, latest
+
+
+def is_closed(end_date, latest_mtime):
+    """end_date가 오늘 이전이고 마지막 기록 후 충분히 지났으면 더 바뀌지 않는 응답 (파일이 없으면 아님)"""
+    if not latest_mtime or end_date >= datetime.now().strftime('%Y-%m-%d'):
+        return False
+    return time.time() - latest_mtime > CLOSED_GRACE_SEC
+
+
+def make_etag(states):
+    """요청 URL(쿼리 포함) + 원본 상태 → ETag"""
+    key = repr((CACHE_VERSION, request.full_path, states)).encode('utf-8')
+    return hashlib.sha1(key).hexdigest()[:24]
+
+
+def conditional(states, latest_mtime, closed, build):
+    """
+    검증 후 304 또는 build()로 만든 응답에 캐시 헤더 추가
+    Args:
+        states: ETag 계산용 원본 상태 (log_file_states/file_states 결과)
+        latest_mtime: Last-Modified (epoch 초, 0이면 생략)
+        closed: True면 긴 Cache-Control
+        build: 응답을 만드는 함수 (304가 아닐 때만 호출)
+    """
+    etag = make_etag(states)
+    last_modified = datetime.fromtimestamp(int(latest_mtime), timezone.utc) if latest_mtime else None
+    cache_control = f'private, max-age={CLOSED_MAX_AGE}' if closed else 'private, no-cache'
+
+    not_modified = False
+    matched = None
+    if request.if_none_match:
+        # 압축 응답은 ETag에 인코딩 접미사가 붙음 (web_ui.compression)
+        matched = next((tag for tag in (etag, etag + '-gz', etag + '-br')
+                        if request.if_none_match.contains(tag)), None)
+        not_modified = matched is not None
+    elif request.if_modified_since and last_modified:
+        since = request.if_modified_since
+        if since.tzinfo is None:  # 구버전 werkzeug는 naive UTC
+            since = since.replace(tzinfo=timezone.utc)
+        not_modified = last_modified <= since
+
+    if not_modified:
+        response = make_response('', 304)
+        etag = matched or etag
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response  # 오류 응답은 캐시하지 않음
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = cache_control
+    return response
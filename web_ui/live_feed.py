@@ -0,0 +1,195 @@
+"""
+대시보드 실시간 피드 (/api/stream, Server-Sent Events)
+- 상태 저장소(메모리)의 센서값/구동계 상태를 /api/latest와 같은 행 형식으로 푸시 (파일 읽기 없음)
+- 알림: 같은 행으로 StatusAnalyzer 분석 (구동계/비상 정지 변경 시 즉시, 그 외 ALERT_INTERVAL_SEC마다)
+  · 화면 표시용 알림 상태만 푸시, Discord 전송은 /api/alerts 한 곳에서만
+- 허브 스레드 하나가 이벤트 버스를 구독해 메시지를 만들고 클라이언트별 메일박스에 전달
+  · 메일박스는 메시지 종류별 최신 것만 보관 (느린 클라이언트는 중간 값을 건너뜀)
+  · 버스가 없는 상태 저장소(별도 프로세스 모드의 프록시, 독립 실행)는 POLL_INTERVAL_SEC마다 버전 확인
+- 연결마다 웹 서버 작업 스레드를 하나 차지하므로 동시 연결 수 제한, MAX_STREAM_SEC 후 종료(브라우저가 재연결)
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+import config
+from core.event_bus import (
+    event_bus, POLICY_COALESCE, TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY,
+)
+
+HEARTBEAT_SEC = 15.0        # 보낼 메시지가 없을 때 주석 줄 전송 간격 (프록시/브라우저 연결 유지)
+ALERT_INTERVAL_SEC = 30.0   # 알림 재분석 간격 (기존 폴링 주기)
+POLL_INTERVAL_SEC = 1.0     # 버스가 없을 때 상태 버전 확인 간격
+MAX_CLIENTS = getattr(config, 'LIVE_STREAM_MAX_CLIENTS', 2)
+MAX_STREAM_SEC = 600        # 연결 하나의 최대 유지 시간 (EventSource가 자동 재연결)
+
+EVENT_STATE = 'state'
+EVENT_ALERTS = 'alerts'
+
+# 상태 저장소 키 → CSV 열 이름 (/api/latest 응답과 같은 형식)
+STATE_COLUMNS = [
+    ('temp', 'Temp_C'), ('hum', 'Hum_Pct'), ('soil_pct', 'Soil_Pct'), ('lux', 'Lux'),
+    ('vpd', 'VPD_kPa'), ('dli', 'DLI_mol'),
+    ('valve_status', 'Valve_Status'), ('fan_status', 'Fan_Status'),
+    ('led_w_status', 'LED_W_Status'), ('led_p_status', 'LED_P_Status'), ('curtain_status', 'Curtain_Status'),
+    ('fan_speed_pct', 'Fan_Speed_Pct'), ('led_w_brightness_pct', 'LED_W_Brightness_Pct'),
+    ('led_p_brightness_pct', 'LED_P_Brightness_Pct'),
+    ('watering_count_today', 'Watering_Count_Today'), ('water_used_today', 'Water_Used_Today_L'),
+]
+
+
+def snapshot_row(snap) -> Dict:
+    """상태 스냅샷 → /api/latest 형식 행"""
+    row = {'Timestamp': datetime.fromtimestamp(snap.updated_at).strftime('%Y-%m-%d %H:%M:%S')}
+    for key, column in STATE_COLUMNS:
+        if key in snap:
+            row[column] = snap[key]
+    row['Emergency_Stop'] = 'True' if snap.get('emergency_stop') else 'False'
+    return row
+
+
+class ClientMailbox:
+    """클라이언트별 대기 메시지 (종류별 최신 하나)"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+
+    def offer(self, event: str, data: str) -> None:
+        with self._cond:
+            if event in self._pending:
+                del self._pending[event]
+                self.coalesced += 1
+            self._pending[event] = data
+            self._cond.notify()
+
+    def take(self, timeout: float):
+        """메시지 목록 [(종류, 데이터)] (timeout 동안 없으면 빈 목록)"""
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            items = list(self._pending.items())
+            self._pending.clear()
+            self.sent += len(items)
+            return items
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class LiveFeed:
+    """상태 변경 → SSE 메시지 허브 (프로세스에 하나)"""
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.state_store = None
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last = {}            # 종류 → 마지막 메시지 (새 클라이언트 초기값)
+        self._last_alert_check = 0.0
+        self.messages = 0
+
+    # ------------------------------------------------------------------
+    def subscribe(self, state_store) -> Optional[ClientMailbox]:
+        """클라이언트 등록 (동시 연결 한도 초과 시 None)"""
+        with self._lock:
+            if len(self._clients) >= MAX_CLIENTS:
+                return None
+            self.state_store = state_store
+            mailbox = ClientMailbox()
+            for event, data in self._last.items():
+                mailbox.offer(event, data)
+            self._clients.add(mailbox)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='LiveFeed', daemon=True)
+                self._thread.start()
+        if not self._last:
+            self._publish_state(force_alerts=True)  # 허브가 첫 값을 만들기 전이면 바로 생성
+        return mailbox
+
+    def unsubscribe(self, mailbox: ClientMailbox) -> None:
+        mailbox.close()
+        with self._lock:
+            self._clients.discard(mailbox)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            clients = [{'sent': m.sent, 'coalesced': m.coalesced} for m in self._clients]
+        return {'clients': clients, 'max_clients': MAX_CLIENTS, 'messages': self.messages}
+
+    # ------------------------------------------------------------------
+    def _broadcast(self, event: str, payload: Dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._last.get(event) == data:
+                return  # 변화 없음
+            self._last[event] = data
+            clients = list(self._clients)
+        self.messages += 1
+        for mailbox in clients:
+            mailbox.offer(event, data)
+
+    def _publish_state(self, force_alerts: bool = False, snap=None) -> None:
+        store = self.state_store
+        if store is None or not self._clients:
+            return
+        if snap is None:
+            try:
+                snap = store.snapshot()
+            except OSError:
+                return  # 제어 프로세스 연결 끊김 (다음 주기에 재시도)
+        row = snapshot_row(snap)
+        self._broadcast(EVENT_STATE, {'data': row, 'version': snap.version})
+
+        now = time.monotonic()
+        if force_alerts or now - self._last_alert_check >= ALERT_INTERVAL_SEC:
+            self._last_alert_check = now
+            self._broadcast(EVENT_ALERTS, {'alerts': self.analyzer.analyze_current_status(row)})
+
+    def _run(self) -> None:
+        store = self.state_store
+        if getattr(store, 'bus', None) is event_bus:
+            sub = event_bus.subscribe([TOPIC_SENSOR_FRAME, TOPIC_ACTUATOR_CHANGED, TOPIC_EMERGENCY],
+                                      maxsize=4, policy=POLICY_COALESCE, name='live_feed')
+            while True:
+                events = sub.drain(timeout=ALERT_INTERVAL_SEC)
+                changed = any(e.topic != TOPIC_SENSOR_FRAME for e in events)
+                self._publish_state(force_alerts=changed)
+        else:
+            version = None
+            while True:
+                time.sleep(POLL_INTERVAL_SEC)
+                if not self._clients:
+                    continue
+                try:
+                    snap = self.state_store.snapshot()
+                except OSError:
+                    continue
+                if (snap.version != version
+                        or time.monotonic() - self._last_alert_check >= ALERT_INTERVAL_SEC):
+                    version = snap.version
+                    self._publish_state(snap=snap)
+
+    # ------------------------------------------------------------------
+    def stream(self, mailbox: ClientMailbox):
+        """SSE 본문 생성기"""
+        started = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() - started < MAX_STREAM_SEC:
+                items = mailbox.take(HEARTBEAT_SEC)
+                if not items:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield ''.join(f"event: {event}\ndata: {data}\n\n" for event, data in items)
+        finally:
+            self.unsubscribe(mailbox)
@@ -0,0 +1,140 @@
+"""
+웹 대시보드 실행 모드 (config.WEB_SERVER_MODE)
+- 'dev': Flask 개발 서버 (기존 방식, 요청마다 스레드 무제한 생성)
+- 'wsgi': 제어 프로세스 안에서 운영용 WSGI 서버 (고정 크기 스레드 풀 + 연결 타임아웃)
+- 'process': 웹 서버를 별도 프로세스로 실행, 제어 프로세스와는 로컬 소켓(core.control_channel)으로 통신
+  · main.py가 자식 프로세스로 띄우고(낮은 우선순위) 종료 시 정리
+  · 직접 실행: python3 -m web_ui.serving  (main.py가 실행 중이어야 구동계 제어 가능)
+  · gunicorn: gunicorn -w 1 --threads 4 --timeout 30 -b 0.0.0.0:5000 'web_ui.serving:create_app()'
+- WSGI 서버: waitress가 설치되어 있으면 사용, 없으면 werkzeug 서버 + 스레드 풀
+"""
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# waitress는 선택적 (없으면 werkzeug 서버 + 스레드 풀)
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+MODE_DEV = 'dev'
+MODE_WSGI = 'wsgi'
+MODE_PROCESS = 'process'
+MODES = (MODE_DEV, MODE_WSGI, MODE_PROCESS)
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def server_settings() -> dict:
+    return {
+        'host': getattr(config, 'WEB_HOST', '0.0.0.0'),
+        'port': getattr(config, 'WEB_PORT', 5000),
+        'threads': getattr(config, 'WEB_THREADS', 4),
+        'timeout': getattr(config, 'WEB_REQUEST_TIMEOUT_SEC', 30),
+    }
+
+
+def _pooled_server(app, host, port, threads, timeout):
+    """werkzeug WSGI 서버 + 고정 크기 스레드 풀 (풀이 차면 연결은 대기열에서 기다림)"""
+    from werkzeug.serving import BaseWSGIServer
+
+    class PooledWSGIServer(BaseWSGIServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='web')
+
+        def process_request(self, request, client_address):
+            request.settimeout(timeout)  # 느린/멈춘 클라이언트가 작업 스레드를 붙잡지 않도록
+            self.pool.submit(self._process, request, client_address)
+
+        def _process(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    return PooledWSGIServer(host, port, app)
+
+
+def serve(app, host=None, port=None, threads=None, timeout=None) -> None:
+    """운영용 WSGI 서버로 실행 (블로킹)"""
+    import logging
+    settings = server_settings()
+    host = host or settings['host']
+    port = port or settings['port']
+    threads = threads or settings['threads']
+    timeout = timeout or settings['timeout']
+    log = logging.getLogger(__name__)
+
+    if WAITRESS_AVAILABLE:
+        log.info(f"[Web] 🚀 waitress 시작: {host}:{port} (스레드 {threads}, 타임아웃 {timeout}s)")
+        waitress.serve(app, host=host, port=port, threads=threads, channel_timeout=timeout, ident='smartfarm')
+    else:
+        log.info(f"[Web] 🚀 WSGI 서버 시작: {host}:{port} (스레드 풀 {threads}, 타임아웃 {timeout}s, waitress 없음)")
+        _pooled_server(app, host, port, threads, timeout).serve_forever()
+
+
+def start_in_thread(app, mode: str) -> threading.Thread:
+    """제어 프로세스 안에서 웹 서버 스레드 시작 ('dev' 또는 'wsgi')"""
+    settings = server_settings()
+    if mode == MODE_DEV:
+        target = lambda: app.run(host=settings['host'], port=settings['port'], debug=False, use_reloader=False)
+    else:
+        target = lambda: serve(app)
+    thread = threading.Thread(target=target, name='WebServer', daemon=True)
+    thread.start()
+    return thread
+
+
+def spawn_process() -> subprocess.Popen:
+    """웹 서버 자식 프로세스 시작 (제어 루프보다 낮은 우선순위)"""
+    nice = getattr(config, 'WEB_PROCESS_NICE', 5)
+
+    def lower_priority():
+        if nice:
+            os.nice(nice)
+
+    return subprocess.Popen([sys.executable, '-m', 'web_ui.serving'], cwd=_REPO_DIR, preexec_fn=lower_priority)
+
+
+def stop_process(proc: subprocess.Popen, timeout: float = 5.0) -> None:
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def create_app():
+    """별도 프로세스용 app (제어 채널 프록시로 초기화)"""
+    from core.control_channel import ControlClient
+    from web_ui import web_server
+    web_server.init_remote(ControlClient())
+    return web_server.app
+
+
+def main():
+    import logging
+    from core import logger as logger_module
+    _, log_filepath = logger_module.get_system_log_path()
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] [web] %(message)s',
+        handlers=[logging.FileHandler(log_filepath), logging.StreamHandler()]
+    )
+    serve(create_app())
+
+
+if __name__ == "__main__":
+    main()
@@ -40,11 +40,10 @@ document.addEventListener('DOMContentLoaded', function() {
         loadLatestData();
         loadAlerts();
         
-        // 주기적 업데이트 (30초마다)
-        setInterval(() => {
-            loadLatestData();
-            loadAlerts();
-        }, 30000);
+        // 실시간 피드 (/api/stream), 연결할 수 없으면 주기적 업데이트 (30초마다)
+        if (!startLiveFeed()) {
+            startPolling();
+        }
     } catch (error) {
         console.error('초기화 중 오류 발생:', error);
         // 최소한 업데이트 시간은 표시
@@ -278,6 +277,40 @@ function initializeChart() {
 
 // 데이터 샘플링 함수 (성능 최적화)
 // 샘플링된 구간에서 밸브 상태를 체크하여 구간 내에 ON이 하나라도 있으면 ON으로 표시
+// 열 형식 응답(/api/data?format=columnar) → 기존 차트 코드가 쓰는 행 객체 목록
+function columnarToRows(payload) {
+    const timestamps = payload.timestamps || [];
+    const skip = new Set(['format', 'count', 'timestamps', 'start_date', 'end_date', 'total_rows']);
+    const columns = {};
+    Object.keys(payload).forEach(key => {
+        if (skip.has(key)) return;
+        const col = payload[key];
+        if (col && col.rle) {
+            // 런 길이 인코딩 풀기: [[값, 개수], ...]
+            const values = [];
+            col.rle.forEach(([value, count]) => {
+                for (let i = 0; i < count; i++) values.push(value);
+            });
+            columns[key] = values;
+        } else if (Array.isArray(col)) {
+            columns[key] = col;
+        }
+    });
+    const keys = Object.keys(columns);
+    return timestamps.map((epoch, i) => {
+        const d = new Date(epoch * 1000);
+        const time = `${String(d.getHours()).padStart(2, '0')}:${String(d.getMinutes()).padStart(2, '0')}:${String(d.getSeconds()).padStart(2, '0')}`;
+        const row = { Timestamp: `${formatDate(d)} ${time}` };
+        keys.forEach(key => { row[key] = columns[key][i]; });
+        return row;
+    });
+}
+
+// 차트에 그릴 최대 점 수 (화면 폭 기준, 서버 다운샘플링 max_points)
+function chartMaxPoints() {
+    return Math.min(2000, Math.max(300, Math.round(window.innerWidth || 1000)));
+}
+
 function sampleData(data, intervalMinutes) {
     if (!data || data.length === 0) return data;
     
@@ -357,6 +390,46 @@ function sampleData(data, intervalMinutes) {
     return sampled;
 }
 
+// 서버 계층형 기록 조회 (10s/1m/10m 롤업)
+// 롤업 행은 CSV 열 이름을 그대로 사용 (숫자 필드: 구간 평균, 밸브 등 구동계: 구간 내 ON이 있으면 ON)
+// 실패하거나 데이터가 없으면 null 반환 (호출자가 기존 방식으로 대체)
+async function fetchTierData(tier, params) {
+    try {
+        const query = new URLSearchParams({ tier, ...params });
+        const response = await fetch(`/api/tier_data?${query.toString()}`);
+        if (!response.ok) return null;
+        const result = await response.json();
+        if (result.error || !result.data || result.data.length === 0) return null;
+        return result.data;
+    } catch (error) {
+        console.warn('계층 데이터 조회 실패, 원본 데이터로 대체:', error);
+        return null;
+    }
+}
+
+// 시리즈 선택 버튼 이벤트 (한 번만 추가)
+function bindSeriesButtons() {
+    document.querySelectorAll('.btn-series:not(.btn-valve-toggle)').forEach(btn => {
+        // 기존 이벤트 리스너 제거 후 추가 (중복 방지)
+        const newBtn = btn.cloneNode(true);
+        btn.parentNode.replaceChild(newBtn, btn);
+        
+        newBtn.addEventListener('click', function() {
+            const seriesKey = this.getAttribute('data-series');
+            
+            // 선택된 시리즈만 활성화
+            selectedSeries.clear();
+            selectedSeries.add(seriesKey);
+            
+            // 버튼 UI 업데이트
+            updateSeriesButtonUI();
+            
+            // 차트 업데이트
+            updateChart();
+        });
+    });
+}
+
 // 로딩 인디케이터 표시/숨김
 function showLoadingIndicator() {
     const indicator = document.getElementById('loading-indicator');
@@ -522,7 +595,27 @@ async function loadRecentData(hours) {
     const endDateStr = formatDate(now);
     
     try {
-        const response = await fetch(`/api/data?start_date=${startDateStr}&end_date=${endDateStr}`);
+        // 6시간 이상은 서버 롤업 계층 사용 (6/12시간: 1분, 24시간: 10분)
+        const tier = (hours === 6 || hours === 12) ? '1m' : (hours === 24 ? '10m' : null);
+        const tierData = tier ? await fetchTierData(tier, { hours }) : null;
+        if (tierData) {
+            currentData = tierData;
+            compareMode = false;
+            const selector = document.getElementById('series-selector');
+            if (selector) {
+                selector.style.display = 'block';
+            }
+            bindSeriesButtons();
+            if (selectedSeries.size === 0) {
+                selectedSeries.add('VPD_kPa');
+            }
+            updateSeriesButtonUI();
+            updateChart();
+            return;
+        }
+        
+        // 서버에서 차트 폭 정도로 줄여서 받기 (밸브 ON 구간은 서버가 보존)
+        const response = await fetch(`/api/data?start_date=${startDateStr}&end_date=${endDateStr}&max_points=${chartMaxPoints()}&format=columnar`);
         
         if (!response.ok) {
             const errorData = await response.json().catch(() => ({}));
@@ -534,6 +627,7 @@ async function loadRecentData(hours) {
         if (result.error) {
             throw new Error(result.error);
         }
+        result.data = columnarToRows(result);
         
         if (result.data && result.data.length > 0) {
             // 시간 필터링 (현재 시각 기준 과거 N시간)
@@ -577,26 +671,7 @@ async function loadRecentData(hours) {
                 selector.style.display = 'block';
             }
             
-            // 시리즈 선택 버튼 이벤트 (한 번만 추가)
-            document.querySelectorAll('.btn-series:not(.btn-valve-toggle)').forEach(btn => {
-                // 기존 이벤트 리스너 제거 후 추가 (중복 방지)
-                const newBtn = btn.cloneNode(true);
-                btn.parentNode.replaceChild(newBtn, btn);
-                
-                newBtn.addEventListener('click', function() {
-                    const seriesKey = this.getAttribute('data-series');
-                    
-                    // 선택된 시리즈만 활성화
-                    selectedSeries.clear();
-                    selectedSeries.add(seriesKey);
-                    
-                    // 버튼 UI 업데이트
-                    updateSeriesButtonUI();
-                    
-                    // 차트 업데이트
-                    updateChart();
-                });
-            });
+            bindSeriesButtons();
             
             // 밸브 토글 버튼 제거됨 (항상 활성화)
             
@@ -645,9 +720,20 @@ async function loadRecent3Days() {
     
     try {
         for (const { key, date } of dates) {
-            const response = await fetch(`/api/data?start_date=${date}&end_date=${date}`);
+            // 서버 10분 롤업 우선 사용
+            const tierData = await fetchTierData('10m', { start_date: date, end_date: date });
+            if (tierData) {
+                compareData[key] = tierData.map(row => ({
+                    ...row,
+                    timeOnly: new Date(row.Timestamp).toTimeString().slice(0, 5) // HH:MM
+                }));
+                continue;
+            }
+            
+            const response = await fetch(`/api/data?start_date=${date}&end_date=${date}&max_points=${chartMaxPoints()}&format=columnar`);
             if (response.ok) {
                 const result = await response.json();
+                result.data = columnarToRows(result);
                 if (result.data) {
                     // 해당 날짜의 전체 데이터 (00:00~23:59)
                     let dayData = result.data
@@ -789,6 +875,43 @@ async function loadRecent3Days() {
     
 // 삭제됨: initializeScaleControls - Y축 스케일 조정 기능 제거됨
 
+// 주기적 업데이트 (실시간 피드를 쓸 수 없을 때)
+let pollingTimer = null;
+let alertTimer = null;  // 실시간 피드 사용 중 알림 조회 타이머
+function startPolling() {
+    if (pollingTimer) return;
+    clearInterval(alertTimer);
+    pollingTimer = setInterval(() => {
+        loadLatestData();
+        loadAlerts();
+    }, 30000);
+}
+
+// 실시간 피드 (Server-Sent Events: state, alerts)
+// 연결이 끊기면 브라우저가 자동 재연결, 서버가 거부(연결 수 한도 등)하면 폴링으로 전환
+function startLiveFeed() {
+    if (!window.EventSource) return false;
+    const source = new EventSource('/api/stream');
+    source.addEventListener('state', (event) => {
+        const result = JSON.parse(event.data);
+        if (result.data) {
+            updateCurrentStatus(result.data);
+        }
+        updateLastUpdateTime();
+    });
+    source.addEventListener('alerts', (event) => {
+        displayAlerts(JSON.parse(event.data).alerts || []);
+    });
+    // 실시간 피드는 알림 표시만, Discord 알림 전송은 /api/alerts에서만 하므로 알림 조회는 계속 (30초마다)
+    alertTimer = setInterval(loadAlerts, 30000);
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED) {
+            startPolling();
+        }
+    };
+    return true;
+}
+
 // 최신 데이터 로드
 async function loadLatestData() {
     try {
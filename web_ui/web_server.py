@@ -2,7 +2,8 @@
 """
 SmartFarm 웹 대시보드 서버
 """
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
+from flask import Flask, render_template, jsonify, request, session, redirect, url_for, Response, stream_with_context
+import json
 from datetime import datetime, timedelta
 import os
 import secrets
@@ -12,7 +13,18 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.data_reader import DataReader
+from core.data_reader import create_data_reader
+from core.catalog import DirectoryCatalog, image_file_key
+from core.state import StateStore
+from core import recorder as tiers
+from core import daily_summary
+from core.downsample import downsample_rows, downsample_columns, METHODS as DOWNSAMPLE_METHODS, METHOD_LTTB
+from core.wire_format import columnar_payload, binary_payload
+from core.columnar import SCHEMA, SCHEMA_JSON_TYPES, typed_row
+from core.logger import CSV_HEADER
+from web_ui.compression import init_compression
+from web_ui.live_feed import LiveFeed
+from web_ui.http_cache import conditional, log_file_states, file_states, is_closed, CLOSED_MAX_AGE
 from core.analyzer import StatusAnalyzer
 import config
 from core.env_loader import get_env
@@ -53,37 +65,71 @@ app = Flask(__name__,
 app.secret_key = secrets.token_hex(32)  # 세션 보안을 위한 시크릿 키
 if CORS_AVAILABLE:
     CORS(app)  # CORS 허용 (필요시)
+# 응답 압축 (gzip/brotli) + 정적 파일 .gz/.br 사본 생성
+init_compression(app, precompress=getattr(config, 'HTTP_PRECOMPRESS_STATIC', True))
 
 # 데이터 읽기 및 분석 모듈
-data_reader = DataReader()
+data_reader = create_data_reader()  # config.DATA_BACKEND (csv/sqlite)
+summary_store = daily_summary.DailySummaryStore()
+# 이미지 폴더 목록 캐시 (요청마다 glob 하지 않음)
+image_catalog = DirectoryCatalog(config.IMG_DIR, image_file_key,
+                                 check_interval=getattr(config, 'CATALOG_CHECK_INTERVAL_SEC', 2.0))
 analyzer = StatusAnalyzer()
+# 실시간 피드 (/api/stream): 알림 분석은 폴링 API와 분석기 인스턴스를 나누어 번호가 섞이지 않게 함
+live_feed = LiveFeed(StatusAnalyzer())  # 알림 상태 표시만 (Discord 전송은 /api/alerts)
 
 # 전역 변수: 시리얼 통신 및 상태
-sys_state = {}
+state_store = None  # core.state.StateStore (main.py와 공유)
 ser_b = None
 ser_b_lock = threading.Lock()
-state_lock = threading.Lock()
 camera_thread = None
+tiered_recorder = None  # core.recorder.TieredRecorder (독립 실행 시 None: 저장 파일/CSV만 사용)
+control_client = None  # core.control_channel.ControlClient (별도 프로세스 모드: 제어 프로세스 프록시 사용)
+hub_managed = False  # main.py 수신 허브가 포트를 관리 (끊기면 허브가 재연결, 웹 서버가 직접 열지 않음)
 
-def init_web_server(state_dict, serial_b, serial_b_lock, state_lock_obj, cam_thread=None):
+def init_web_server(store, serial_b, serial_b_lock, cam_thread=None, recorder=None):
     """웹 서버 초기화 (main.py에서 호출)"""
-    global sys_state, ser_b, ser_b_lock, state_lock, camera_thread
-    sys_state = state_dict
-    ser_b = serial_b
+    global state_store, ser_b, ser_b_lock, camera_thread, tiered_recorder, hub_managed
+    state_store = store
+    ser_b = serial_b  # ingest_hub.LinkSerial: 허브가 재연결해도 현재 포트를 가리킴
+    hub_managed = True
     ser_b_lock = serial_b_lock  # 중요: 시리얼 포트 락 공유
-    state_lock = state_lock_obj
     camera_thread = cam_thread
+    tiered_recorder = recorder
+    # 시작 시 한 번 폴더 스캔 (이후에는 바뀐 폴더만)
+    data_reader.catalog.refresh(force=True)
+    image_catalog.refresh(force=True)
     import logging
-    logging.getLogger(__name__).info(f"[Web] 웹 서버 초기화 완료: ser_b={ser_b is not None}, ser_b_lock={ser_b_lock is not None}, state_lock={state_lock is not None}")
+    logging.getLogger(__name__).info(f"[Web] 웹 서버 초기화 완료: ser_b={ser_b is not None}, ser_b_lock={ser_b_lock is not None}, state_store={state_store is not None}")
+
+def init_remote(client):
+    """별도 프로세스 모드 초기화 (상태/시리얼/카메라를 제어 프로세스 프록시로 연결)"""
+    global state_store, ser_b, ser_b_lock, camera_thread, tiered_recorder, control_client
+    from core.control_channel import RemoteStateStore, RemoteSerial, RemoteCamera
+    control_client = client
+    state_store = RemoteStateStore(client)
+    ser_b = RemoteSerial(client)
+    ser_b_lock = threading.Lock()
+    camera_thread = RemoteCamera(client)
+    tiered_recorder = None  # 롤업은 저장 파일에서 읽음
+    data_reader.catalog.refresh(force=True)
+    image_catalog.refresh(force=True)
+    import logging
+    status = client.ping()
+    logging.getLogger(__name__).info(f"[Web] 웹 서버 초기화 완료 (별도 프로세스): 제어 채널 {'연결됨 ' + str(status) if status else '대기 중'}")
 
 def init_serial_connection():
     """독립 실행 시 시리얼 포트 초기화"""
-    global ser_b, sys_state, ser_b_lock, state_lock
+    global ser_b, state_store, ser_b_lock
     
     import logging
     logger = logging.getLogger(__name__)
     
-    if ser_b and ser_b.is_open and sys_state and ser_b_lock and state_lock:
+    if control_client or hub_managed:
+        # 별도 프로세스 모드/main.py 내장 모드: 포트는 제어 프로세스나 수신 허브만 엶 (여기서 열면 충돌)
+        return bool(ser_b and ser_b.is_open)
+    
+    if ser_b and ser_b.is_open and state_store and ser_b_lock:
         return True  # 이미 연결됨
     
     try:
@@ -92,8 +138,6 @@ def init_serial_connection():
         # Lock 객체가 없으면 생성
         if not ser_b_lock:
             ser_b_lock = threading.Lock()
-        if not state_lock:
-            state_lock = threading.Lock()
         
         # 시리얼 포트 연결
         if not ser_b or not ser_b.is_open:
@@ -109,8 +153,8 @@ def init_serial_connection():
                 return False
         
         # 초기 상태 설정 (없을 때만)
-        if not sys_state:
-            sys_state = {
+        if not state_store:
+            state_store = StateStore({
                 'fan_status': 'OFF',
                 'valve_status': 'OFF',
                 'led_w_status': 'OFF',
@@ -118,7 +162,7 @@ def init_serial_connection():
                 'curtain_status': 'CLOSED',
                 'emergency_stop': False,
                 'lux': 0
-            }
+            })
         return True
     except Exception as e:
         logger.error(f"[init_serial] ❌ 시리얼 포트 연결 실패: {e}")
@@ -128,29 +172,29 @@ def init_serial_connection():
 
 def init_camera_thread():
     """독립 실행 시 카메라 스레드 초기화"""
-    global camera_thread, sys_state, state_lock, ser_b, ser_b_lock
+    global camera_thread, state_store, ser_b, ser_b_lock
     
     if camera_thread and camera_thread.is_alive():
         return True  # 이미 실행 중
+    if control_client:
+        return False  # 별도 프로세스 모드: 카메라는 제어 프로세스에서만 실행
     
     try:
-        import camera
+        from core import camera
         
-        # sys_state와 state_lock이 없으면 초기화
-        if not sys_state:
-            sys_state = {
+        # 상태 저장소가 없으면 초기화
+        if not state_store:
+            state_store = StateStore({
                 'lux': 0,
                 'led_w_status': 'OFF'
-            }
-        if not state_lock:
-            state_lock = threading.Lock()
+            })
         
         # 시리얼 포트가 없으면 초기화 시도
         if not ser_b or not ser_b.is_open:
             init_serial_connection()
         
         # 카메라 스레드 생성 및 시작 (ser_b, ser_b_lock 전달)
-        camera_thread = camera.CameraThread(sys_state, state_lock, ser_b, ser_b_lock)
+        camera_thread = camera.CameraThread(state_store, ser_b, ser_b_lock)
         camera_thread.daemon = True
         camera_thread.start()
         
@@ -249,30 +293,68 @@ def api_data():
         # 기본값: 2026-01-02부터 오늘까지
         end_date = datetime.now().strftime('%Y-%m-%d')
         start_date = '2026-01-02'  # 데이터가 있는 첫 날짜
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': '날짜 형식은 YYYY-MM-DD'}), 400
     
+    # 선택: 시각 범위 (YYYY-MM-DD HH:MM:SS) - 지정하면 인덱스로 해당 구간만 읽음
     try:
-        data = data_reader.read_log_data(start_date, end_date)
+        start_time = datetime.strptime(request.args['start_time'], '%Y-%m-%d %H:%M:%S') if request.args.get('start_time') else None
+        end_time = datetime.strptime(request.args['end_time'], '%Y-%m-%d %H:%M:%S') if request.args.get('end_time') else None
+    except ValueError:
+        return jsonify({'error': 'start_time/end_time 형식은 YYYY-MM-DD HH:MM:SS'}), 400
+    
+    # 선택: 서버 측 다운샘플링 (max_points: 최대 점 수, fields: 포함할 필드, downsample: lttb/minmax)
+    max_points = request.args.get('max_points', type=int)
+    fields = [f for f in request.args.get('fields', '').split(',') if f]
+    method = request.args.get('downsample', METHOD_LTTB)
+    if method not in DOWNSAMPLE_METHODS:
+        return jsonify({'error': f'downsample은 {", ".join(DOWNSAMPLE_METHODS)} 중 하나'}), 400
+    names = ['Timestamp'] + [f for f in fields if f != 'Timestamp'] if fields else None
+    
+    # 선택: 열 형식 응답 (format=columnar: 필드별 배열 JSON, format=binary: 타입 배열)
+    fmt = request.args.get('format', 'rows')
+    if fmt not in ('rows', 'columnar', 'binary'):
+        return jsonify({'error': 'format은 rows, columnar, binary 중 하나'}), 400
+    
+    # 선택: 스트리밍 (stream=ndjson: 한 줄에 한 행, stream=json: 청크 단위 JSON 배열)
+    stream = request.args.get('stream', '')
+    if stream and fmt == 'rows':
+        if stream not in STREAM_FORMATS:
+            return jsonify({'error': f'stream은 {", ".join(STREAM_FORMATS)} 중 하나'}), 400
+        if max_points:
+            return jsonify({'error': 'max_points는 stream과 함께 쓸 수 없습니다 (전체 범위가 필요)'}), 400
+    
+    # 조건부 요청: 범위의 CSV 파일 (크기, mtime)이 그대로면 읽지 않고 304
+    states, last_modified = log_file_states(start_date, end_date, data_reader.log_dir)
+    
+    def build():
+        if fmt != 'rows':
+            return columnar_log_data(fmt, start_date, end_date, start_time, end_time, fields, max_points, method)
+        if stream:
+            return stream_log_data(stream, start_date, end_date, start_time, end_time, names or list(CSV_HEADER))
+        return row_log_data(start_date, end_date, start_time, end_time, fields, names, max_points, method)
+    
+    return conditional(states, last_modified, is_closed(end_date, last_modified), build)
+
+def row_log_data(start_date, end_date, start_time, end_time, fields, names, max_points, method):
+    """행 형식 응답 (기본)"""
+    try:
+        data = data_reader.read_log_data(start_date, end_date, start_time=start_time, end_time=end_time)
         
-        # JSON 직렬화 가능하도록 변환
-        result = []
-        for row in data:
-            clean_row = {}
-            for key, value in row.items():
-                if key.startswith('_'):  # 내부 필드 제외
-                    continue
-                try:
-                    # 숫자 변환 시도
-                    if value is None or value == '':
-                        clean_row[key] = None
-                    elif '.' in str(value):
-                        clean_row[key] = float(value)
-                    else:
-                        clean_row[key] = int(value)
-                except (ValueError, TypeError):
-                    clean_row[key] = str(value) if value is not None else ''
-            result.append(clean_row)
+        # 스키마(core.columnar.SCHEMA)대로 타입 변환 (값마다 형식을 추측하지 않음)
+        result = [typed_row(row, names) for row in data]
         
-        return jsonify({'data': result, 'start_date': start_date, 'end_date': end_date})
+        total = len(result)
+        if max_points and total > max_points:
+            # 기준 필드: 지정한 숫자 필드 (상태/시각 제외)
+            value_fields = [f for f in fields if f != 'Timestamp' and not f.endswith('_Status')]
+            result = downsample_rows(result, max(3, max_points), method, value_fields or None)
+        
+        return jsonify({'data': result, 'start_date': start_date, 'end_date': end_date,
+                        'total_rows': total, 'downsampled': len(result) < total})
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -281,47 +363,191 @@ def api_data():
         print(traceback_str)
         return jsonify({'error': error_msg, 'data': []}), 500
 
+def columnar_log_data(fmt, start_date, end_date, start_time, end_time, fields, max_points, method):
+    """열 형식 응답 (컬럼형 로그가 있으면 CSV 파싱 없이 읽음, core.wire_format 참고)"""
+    try:
+        columns = data_reader.read_columns(start_date, end_date, [f for f in fields if f != 'Timestamp'] or None,
+                                           start_ts=start_time.timestamp() if start_time else None,
+                                           end_ts=end_time.timestamp() if end_time else None)
+        total = len(columns.get('Timestamp', ()))
+        if max_points and total > max_points:
+            value_fields = [f for f in fields if f != 'Timestamp' and not f.endswith('_Status')]
+            columns = downsample_columns(columns, max(3, max_points), method, value_fields or None)
+        meta = {'start_date': start_date, 'end_date': end_date, 'total_rows': total}
+        if fmt == 'binary':
+            return Response(binary_payload(columns, meta), mimetype='application/octet-stream')
+        return jsonify(columnar_payload(columns, meta))
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"[Web] 열 형식 데이터 읽기 오류: {e}")
+        return jsonify({'error': str(e), 'data': []}), 500
+
+STREAM_FORMATS = ('ndjson', 'json')
+STREAM_CHUNK_ROWS = 200  # 한 번에 내보낼 행 수 (청크가 너무 잘게 쪼개지지 않도록)
+
+def stream_log_data(fmt, start_date, end_date, start_time, end_time, names):
+    """
+    로그 행을 읽는 대로 직렬화해 내보내기 (범위 길이와 무관하게 메모리 일정)
+    - ndjson: 첫 줄은 {"schema": ...}, 이후 한 줄에 한 행
+    - json: {"schema": ..., "data": [행, ...]} 를 청크로 나눠 전송
+    - 전송 도중 읽기 오류: 응답 코드는 이미 200이므로 마지막에 오류 레코드를 붙임
+      (ndjson은 {"error": ...} 줄, json은 "data" 뒤에 "error" 키) → 클라이언트가 잘린 응답을 구분
+    """
+    schema = {name: SCHEMA_JSON_TYPES.get(SCHEMA.get(name), 'string') for name in names}
+    meta = {'schema': schema, 'start_date': start_date, 'end_date': end_date}
+    
+    def generate():
+        rows = data_reader.iter_log_data(start_date, end_date, start_time=start_time, end_time=end_time)
+        if fmt == 'ndjson':
+            yield json.dumps(meta, ensure_ascii=False) + '\n'
+        else:
+            yield json.dumps(meta, ensure_ascii=False)[:-1] + ', "data": ['
+        
+        chunk = []
+        first = True
+        error = None
+        try:
+            for row in rows:
+                text = json.dumps(typed_row(row, names), ensure_ascii=False, separators=(',', ':'))
+                if fmt == 'ndjson':
+                    chunk.append(text + '\n')
+                else:
+                    chunk.append(text if first else ',' + text)
+                    first = False
+                if len(chunk) >= STREAM_CHUNK_ROWS:
+                    yield ''.join(chunk)
+                    chunk = []
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).error(f"[Web] 스트리밍 중 데이터 읽기 오류: {e}")
+            error = json.dumps(str(e), ensure_ascii=False)
+        if chunk:
+            yield ''.join(chunk)
+        if fmt == 'ndjson':
+            if error:
+                yield '{"error": ' + error + '}\n'
+        elif error:
+            yield '], "error": ' + error + '}'
+        else:
+            yield ']}'
+    
+    mimetype = 'application/x-ndjson' if fmt == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route('/api/tier_data')
+def api_tier_data():
+    """
+    계층형 기록 조회 API
+    - tier: raw / 10s / 1m / 10m (config.RECORDER_TIERS)
+    - hours=N (현재 시각 기준 과거 N시간) 또는 start_date/end_date (YYYY-MM-DD, 양끝 포함)
+    """
+    if 'authenticated' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    tier = request.args.get('tier', '1m')
+    if tier != tiers.TIER_RAW and tier not in config.RECORDER_TIERS:
+        return jsonify({'error': f'지원하지 않는 계층: {tier}'}), 400
+    
+    try:
+        hours = request.args.get('hours', type=float)
+        if hours:
+            end_ts = time.time()
+            start_ts = end_ts - hours * 3600
+        else:
+            start_date = request.args.get('start_date', '')
+            end_date = request.args.get('end_date', '') or start_date
+            if not start_date:
+                return jsonify({'error': 'hours 또는 start_date가 필요합니다'}), 400
+            start_ts = datetime.strptime(start_date, '%Y-%m-%d').timestamp()
+            end_ts = (datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).timestamp() - 1
+        
+        rows = tiers.read_tier(tier, start_ts, end_ts, tiered_recorder, data_reader)
+        return jsonify({'tier': tier, 'data': rows})
+    except ValueError as e:
+        return jsonify({'error': str(e), 'data': []}), 400
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"[Web] 계층 데이터 읽기 오류: {e}")
+        return jsonify({'error': str(e), 'data': []}), 500
+
 @app.route('/api/latest')
 def api_latest():
     """최신 데이터 API"""
     if 'authenticated' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    latest = data_reader.get_latest_data(limit=1)
+    latest = data_reader.get_latest_rows(1)
     if latest:
-        latest = latest[0] if isinstance(latest, list) else latest
+        latest = latest[-1]
         # 내부 필드 제거
         clean_data = {k: v for k, v in latest.items() if not k.startswith('_')}
         
-        # 구동계 상태는 sys_state에서 직접 읽어오기 (CSV보다 정확)
+        # 구동계 상태는 상태 저장소에서 직접 읽어오기 (CSV보다 정확)
         # CSV는 주기적으로 기록되므로 실시간 상태와 다를 수 있음
-        if sys_state and state_lock:
-            with state_lock:
-                # LED 상태는 sys_state에서 우선 읽기
-                if 'led_w_status' in sys_state:
-                    clean_data['LED_W_Status'] = sys_state['led_w_status']
-                if 'led_p_status' in sys_state:
-                    clean_data['LED_P_Status'] = sys_state['led_p_status']
-                # 팬, 밸브, 커튼 상태도 sys_state에서 우선 읽기
-                if 'fan_status' in sys_state:
-                    clean_data['Fan_Status'] = sys_state['fan_status']
-                if 'valve_status' in sys_state:
-                    clean_data['Valve_Status'] = sys_state['valve_status']
-                if 'curtain_status' in sys_state:
-                    clean_data['Curtain_Status'] = sys_state['curtain_status']
+        if state_store:
+            snap = state_store.snapshot()  # 락 없이 일관된 스냅샷
+            # LED 상태는 스냅샷에서 우선 읽기
+            if 'led_w_status' in snap:
+                clean_data['LED_W_Status'] = snap['led_w_status']
+            if 'led_p_status' in snap:
+                clean_data['LED_P_Status'] = snap['led_p_status']
+            # 팬, 밸브, 커튼 상태도 스냅샷에서 우선 읽기
+            if 'fan_status' in snap:
+                clean_data['Fan_Status'] = snap['fan_status']
+            if 'valve_status' in snap:
+                clean_data['Valve_Status'] = snap['valve_status']
+            if 'curtain_status' in snap:
+                clean_data['Curtain_Status'] = snap['curtain_status']
+            return jsonify({'data': clean_data, 'version': snap.version})
         
         return jsonify({'data': clean_data})
     return jsonify({'data': None})
 
+@app.route('/api/stream')
+def api_stream():
+    """실시간 피드 (Server-Sent Events: state, alerts). 한도 초과 시 503 → 대시보드는 폴링으로 전환"""
+    if 'authenticated' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if not state_store:
+        return jsonify({'error': '상태 저장소가 초기화되지 않았습니다'}), 503
+    
+    mailbox = live_feed.subscribe(state_store)
+    if mailbox is None:
+        return jsonify({'error': '실시간 연결 수 한도 초과'}), 503
+    response = Response(stream_with_context(live_feed.stream(mailbox)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 리버스 프록시 버퍼링 방지
+    return response
+
+@app.route('/api/state')
+def api_state():
+    """실시간 상태 API (since=N: 버전 N 이후 변경이 없으면 상태 본문 생략)"""
+    if 'authenticated' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if not state_store:
+        return jsonify({'error': '상태 저장소가 초기화되지 않았습니다'}), 503
+
+    snap = state_store.snapshot()
+    since = request.args.get('since', type=int)
+    if since is not None and since == snap.version:
+        return jsonify({'changed': False, 'version': snap.version})
+    return jsonify({
+        'changed': True,
+        'version': snap.version,
+        'updated_at': snap.updated_at,
+        'state': snap.to_dict()
+    })
+
 @app.route('/api/alerts')
 def api_alerts():
     """상태 분석 및 알림 API"""
     if 'authenticated' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    latest = data_reader.get_latest_data(limit=1)
+    latest = data_reader.get_latest_rows(1)
     if latest:
-        latest = latest[0] if isinstance(latest, list) else latest
+        latest = latest[-1]
         alerts = analyzer.analyze_current_status(latest)
         
         # Discord 알림 전송 (각 알림에 대해)
@@ -349,8 +575,56 @@ def api_statistics():
         end_date = datetime.now().strftime('%Y-%m-%d')
         start_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
     
-    stats = data_reader.get_statistics(start_date, end_date)
-    return jsonify({'statistics': stats})
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': '날짜 형식은 YYYY-MM-DD'}), 400
+    
+    states, last_modified = log_file_states(start_date, end_date, data_reader.log_dir)
+    return conditional(states, last_modified, is_closed(end_date, last_modified),
+                       lambda: jsonify({'statistics': data_reader.get_statistics(start_date, end_date)}))
+
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    """읽기 캐시 상태 API (파싱 캐시 적중/실패/제거, 통계 집계 캐시, 폴더 목록 캐시)"""
+    if 'authenticated' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    stats_engine = data_reader._stats_engine
+    return jsonify({
+        'parse_cache': data_reader.parse_cache.stats() if data_reader.parse_cache is not None else None,
+        'statistics': stats_engine.stats() if stats_engine is not None else None,
+        'log_catalog': data_reader.catalog.stats(),
+        'image_catalog': image_catalog.stats(),
+        'live_feed': live_feed.stats(),
+    })
+
+@app.route('/api/daily_summary')
+def api_daily_summary():
+    """일별 요약 API (start, end: YYYY-MM-DD, zone: 선택 필터. 기본 최근 90일)"""
+    if 'authenticated' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    end_date = request.args.get('end', '') or datetime.now().strftime('%Y-%m-%d')
+    start_date = request.args.get('start', '') or (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
+    zone = request.args.get('zone') or None
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({'error': '날짜 형식은 YYYY-MM-DD'}), 400
+    
+    try:
+        # 저장된 요약만 조회 (빠진 날짜는 자동화 루프가 시작 시/자정에 채움), 파일이 그대로면 304
+        states, last_modified = file_states([summary_store.path])
+        return conditional(states, last_modified, is_closed(end_date, last_modified),
+                           lambda: jsonify({'data': summary_store.query(start_date, end_date, zone),
+                                            'start': start_date, 'end': end_date}))
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).error(f"[Web] 일별 요약 조회 오류: {e}")
+        return jsonify({'error': str(e), 'data': []}), 500
 
 @app.route('/api/latest_image')
 def api_latest_image():
@@ -358,29 +632,10 @@ def api_latest_image():
     if 'authenticated' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    import glob
-    from pathlib import Path
-    
-    # images 폴더에서 가장 최근 이미지 찾기
-    image_dir = config.IMG_DIR
-    image_patterns = [
-        os.path.join(image_dir, '**', '*.jpg'),
-        os.path.join(image_dir, '**', '*.jpeg'),
-        os.path.join(image_dir, '**', '*.png')
-    ]
-    
-    latest_image = None
-    latest_time = 0
-    
-    for pattern in image_patterns:
-        for img_path in glob.glob(pattern, recursive=True):
-            try:
-                mtime = os.path.getmtime(img_path)
-                if mtime > latest_time:
-                    latest_time = mtime
-                    latest_image = img_path
-            except OSError:
-                continue
+    # 이미지 카탈로그에서 가장 최근 이미지 찾기
+    entry = image_catalog.latest()
+    latest_image = entry.path if entry else None
+    latest_time = entry.mtime if entry else 0
     
     # 현재 시간으로부터 30분 전 시간 계산
     now = datetime.now()
@@ -424,46 +679,37 @@ def api_image():
     if not date:
         return jsonify({'error': '날짜가 필요합니다'}), 400
     
-    import glob
     from datetime import datetime
     
     # 날짜 파싱
     try:
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        year_month = date_obj.strftime('%Y-%m')
+        datetime.strptime(date, '%Y-%m-%d')
     except ValueError:
         return jsonify({'error': '잘못된 날짜 형식'}), 400
     
-    # 이미지 파일명 패턴 생성
+    # 이미지 파일명 접두어 생성
     if time:
         # 특정 시간: YYYY-MM-DD_HH-MM-SS_Auto.jpg
         time_str = time.replace(':', '-')
-        pattern = f"{date}_{time_str}*"
+        prefix = f"{date}_{time_str}"
     else:
         # 해당 날짜의 모든 이미지 중 가장 최근 것
-        pattern = f"{date}_*"
-    
-    # 이미지 검색
-    search_paths = [
-        os.path.join(config.IMG_DIR, year_month, pattern),
-        os.path.join(config.IMG_DIR, 'manual', pattern)
-    ]
-    
-    found_images = []
-    for search_path in search_paths:
-        for ext in ['*.jpg', '*.jpeg', '*.png']:
-            full_pattern = search_path.replace('*', ext)
-            found_images.extend(glob.glob(full_pattern))
-    
-    if found_images:
-        # 가장 최근 이미지 선택
-        latest_image = max(found_images, key=os.path.getmtime)
-        rel_path = os.path.relpath(latest_image, config.IMG_DIR)
-        return jsonify({
-            'image_url': f'/api/image_file/{rel_path.replace(os.sep, "/")}'
-        })
+        prefix = f"{date}_"
+    
+    # 카탈로그에서 해당 날짜 이미지 검색 (월별 폴더 + manual 폴더)
+    found_images = [e for e in image_catalog.files(date) if e.name.startswith(prefix)]
+    
+    def build():
+        if found_images:
+            # 가장 최근 이미지 선택
+            latest_image = max(found_images, key=lambda e: e.mtime).path
+            rel_path = os.path.relpath(latest_image, config.IMG_DIR)
+            return jsonify({
+                'image_url': f'/api/image_file/{rel_path.replace(os.sep, "/")}'
+            })
+        return jsonify({'image_url': None})
     
-    return jsonify({'image_url': None})
+    return image_conditional(date, found_images, build)
 
 @app.route('/api/image_times')
 def api_image_times():
@@ -475,36 +721,34 @@ def api_image_times():
     if not date:
         return jsonify({'error': '날짜가 필요합니다'}), 400
     
-    import glob
     from datetime import datetime
     
     try:
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        year_month = date_obj.strftime('%Y-%m')
+        datetime.strptime(date, '%Y-%m-%d')
     except ValueError:
         return jsonify({'error': '잘못된 날짜 형식'}), 400
     
-    # 해당 날짜의 모든 이미지 찾기
-    pattern = f"{date}_*"
-    search_paths = [
-        os.path.join(config.IMG_DIR, year_month, pattern),
-        os.path.join(config.IMG_DIR, 'manual', pattern)
-    ]
-    
-    times = set()
-    for search_path in search_paths:
-        for ext in ['*.jpg', '*.jpeg', '*.png']:
-            full_pattern = search_path.replace('*', ext)
-            for img_path in glob.glob(full_pattern):
-                filename = os.path.basename(img_path)
-                # 파일명에서 시간 추출: YYYY-MM-DD_HH-MM-SS_Auto.jpg
-                parts = filename.split('_')
-                if len(parts) >= 2:
-                    time_str = parts[1]  # HH-MM-SS
-                    time_formatted = time_str.replace('-', ':')[:5]  # HH:MM
-                    times.add(time_formatted)
-    
-    return jsonify({'times': sorted(list(times))})
+    # 해당 날짜의 모든 이미지 (카탈로그)
+    entries = image_catalog.files(date)
+    
+    def build():
+        times = set()
+        for entry in entries:
+            # 파일명에서 시간 추출: YYYY-MM-DD_HH-MM-SS_Auto.jpg
+            parts = entry.name.split('_')
+            if len(parts) >= 2:
+                time_str = parts[1]  # HH-MM-SS
+                time_formatted = time_str.replace('-', ':')[:5]  # HH:MM
+                times.add(time_formatted)
+        return jsonify({'times': sorted(list(times))})
+    
+    return image_conditional(date, entries, build)
+
+def image_conditional(date, entries, build):
+    """이미지 목록 응답의 조건부 처리 (카탈로그의 파일 크기/mtime이 검증값)"""
+    states = [(e.path, e.size, e.mtime) for e in entries]
+    last_modified = max((e.mtime for e in entries), default=0)
+    return conditional(states, last_modified, is_closed(date, last_modified), build)
 
 @app.route('/api/image_file/<path:filename>')
 def serve_image(filename):
@@ -519,7 +763,10 @@ def serve_image(filename):
         # 파일이 있는 폴더와 파일명 분리
         dir_path = os.path.dirname(image_path)
         file_name = os.path.basename(image_path)
-        return send_from_directory(dir_path, file_name)
+        response = send_from_directory(dir_path, file_name)  # ETag/Last-Modified/304는 Flask가 처리
+        # 촬영 시각이 파일명에 들어가 내용이 바뀌지 않으므로 오래 캐시
+        response.headers['Cache-Control'] = f'private, max-age={CLOSED_MAX_AGE}'
+        return response
     return jsonify({'error': 'Image not found'}), 404
 
 @app.route('/api/discord/test', methods=['POST'])
@@ -569,7 +816,7 @@ def api_actuator_toggle():
     logger = logging.getLogger(__name__)
     
     # 시스템 초기화 확인 및 시도
-    if not sys_state or not ser_b_lock or not state_lock:
+    if not state_store or not ser_b_lock:
         if not init_serial_connection():
             return jsonify({
                 'success': False, 
@@ -591,50 +838,50 @@ def api_actuator_toggle():
         return jsonify({'success': False, 'error': '구동계 타입이 필요합니다'}), 400
     
     try:
-        with state_lock:
-            if actuator_type == 'fan':
-                current_status = sys_state.get('fan_status', 'OFF')
-                status_key = 'fan_status'
-                if current_status == 'OFF':
-                    cmd = 'FAN_ON'
-                    new_status = 'ON'
-                else:
-                    cmd = 'FAN_OFF'
-                    new_status = 'OFF'
-            elif actuator_type == 'led_w':
-                current_status = sys_state.get('led_w_status', 'OFF')
-                status_key = 'led_w_status'
-                if current_status == 'OFF':
-                    cmd = 'LED_ON'  # 즉시 ON (페이드 없음, 수동 제어용)
-                    new_status = 'ON'
-                else:
-                    cmd = 'LED_OFF'  # 즉시 OFF (페이드 없음, 수동 제어용)
-                    new_status = 'OFF'
-            elif actuator_type == 'led_p':
-                current_status = sys_state.get('led_p_status', 'OFF')
-                status_key = 'led_p_status'
-                if current_status == 'OFF':
-                    cmd = 'PURPLE_ON'  # 즉시 ON (페이드 없음, 수동 제어용)
-                    new_status = 'ON'
-                else:
-                    cmd = 'PURPLE_OFF'  # 즉시 OFF (페이드 없음, 수동 제어용)
-                    new_status = 'OFF'
-            elif actuator_type == 'valve':
-                current_status = sys_state.get('valve_status', 'OFF')
-                status_key = 'valve_status'
-                cmd = 'M1'  # 밸브 토글 명령
-                new_status = 'ON' if current_status == 'OFF' else 'OFF'
-            elif actuator_type == 'curtain':
-                current_status = sys_state.get('curtain_status', 'CLOSED')
-                status_key = 'curtain_status'
-                if current_status == 'CLOSED':
-                    cmd = f'CURTAIN_OPEN:{config.CURTAIN_STEPS_OPEN}'
-                    new_status = 'OPEN'
-                else:
-                    cmd = f'CURTAIN_CLOSE:{config.CURTAIN_STEPS_CLOSE}'
-                    new_status = 'CLOSED'
+        snap = state_store.snapshot()  # 현재 상태 (락 불필요)
+        if actuator_type == 'fan':
+            current_status = snap.get('fan_status', 'OFF')
+            status_key = 'fan_status'
+            if current_status == 'OFF':
+                cmd = 'FAN_ON'
+                new_status = 'ON'
+            else:
+                cmd = 'FAN_OFF'
+                new_status = 'OFF'
+        elif actuator_type == 'led_w':
+            current_status = snap.get('led_w_status', 'OFF')
+            status_key = 'led_w_status'
+            if current_status == 'OFF':
+                cmd = 'LED_ON'  # 즉시 ON (페이드 없음, 수동 제어용)
+                new_status = 'ON'
+            else:
+                cmd = 'LED_OFF'  # 즉시 OFF (페이드 없음, 수동 제어용)
+                new_status = 'OFF'
+        elif actuator_type == 'led_p':
+            current_status = snap.get('led_p_status', 'OFF')
+            status_key = 'led_p_status'
+            if current_status == 'OFF':
+                cmd = 'PURPLE_ON'  # 즉시 ON (페이드 없음, 수동 제어용)
+                new_status = 'ON'
             else:
-                return jsonify({'success': False, 'error': f'지원하지 않는 구동계 타입: {actuator_type}'}), 400
+                cmd = 'PURPLE_OFF'  # 즉시 OFF (페이드 없음, 수동 제어용)
+                new_status = 'OFF'
+        elif actuator_type == 'valve':
+            current_status = snap.get('valve_status', 'OFF')
+            status_key = 'valve_status'
+            cmd = 'M1'  # 밸브 토글 명령
+            new_status = 'ON' if current_status == 'OFF' else 'OFF'
+        elif actuator_type == 'curtain':
+            current_status = snap.get('curtain_status', 'CLOSED')
+            status_key = 'curtain_status'
+            if current_status == 'CLOSED':
+                cmd = f'CURTAIN_OPEN:{config.CURTAIN_STEPS_OPEN}'
+                new_status = 'OPEN'
+            else:
+                cmd = f'CURTAIN_CLOSE:{config.CURTAIN_STEPS_CLOSE}'
+                new_status = 'CLOSED'
+        else:
+            return jsonify({'success': False, 'error': f'지원하지 않는 구동계 타입: {actuator_type}'}), 400
         
         # 시리얼 명령 전송 (send_cmd 함수 사용 - automation.py와 동일한 로직)
         import logging
@@ -662,23 +909,24 @@ def api_actuator_toggle():
         
         if success:
             # 상태 업데이트 (시리얼 통신 성공 시에만)
-            with state_lock:
-                old_status = sys_state.get(status_key, 'UNKNOWN')
-                sys_state[status_key] = new_status
-                
-                # 수동 제어 플래그 설정 (automation.py가 덮어쓰지 않도록)
-                if actuator_type in ['led_w', 'led_p']:
-                    # 수동 제어는 수동으로 끌 때까지 유지 (만료 시간 없음)
-                    # 수동으로 켠 경우: 무한대로 설정 (9999999999 = 약 317년 후)
-                    # 수동으로 끈 경우: 플래그 제거 (0으로 설정)
-                    if new_status == 'ON':
-                        sys_state[f'{actuator_type}_manual_override'] = 9999999999  # 무한대
-                        logger.info(f"[Web] ✅ {actuator_type} 수동 제어 플래그 설정 (수동으로 끌 때까지 유지)")
-                    else:
-                        sys_state[f'{actuator_type}_manual_override'] = 0  # 플래그 제거
-                        logger.info(f"[Web] ✅ {actuator_type} 수동 제어 플래그 제거 (자동 제어 재개 가능)")
-                
-                logger.info(f"[Web] ✅ {actuator_type} 토글 성공: {cmd} → {new_status} (sys_state 업데이트: {old_status} → {new_status})")
+            old_status = state_store.get(status_key, 'UNKNOWN')
+            changes = {status_key: new_status}
+            
+            # 수동 제어 플래그 설정 (automation.py가 덮어쓰지 않도록)
+            if actuator_type in ['led_w', 'led_p']:
+                # 수동 제어는 수동으로 끌 때까지 유지 (만료 시간 없음)
+                # 수동으로 켠 경우: 무한대로 설정 (9999999999 = 약 317년 후)
+                # 수동으로 끈 경우: 플래그 제거 (0으로 설정)
+                if new_status == 'ON':
+                    changes[f'{actuator_type}_manual_override'] = 9999999999  # 무한대
+                    logger.info(f"[Web] ✅ {actuator_type} 수동 제어 플래그 설정 (수동으로 끌 때까지 유지)")
+                else:
+                    changes[f'{actuator_type}_manual_override'] = 0  # 플래그 제거
+                    logger.info(f"[Web] ✅ {actuator_type} 수동 제어 플래그 제거 (자동 제어 재개 가능)")
+            
+            # 상태와 플래그를 한 번에 교체 (읽는 쪽은 항상 일관된 조합을 봄)
+            new_snap = state_store.update(changes)
+            logger.info(f"[Web] ✅ {actuator_type} 토글 성공: {cmd} → {new_status} (상태 v{new_snap.version}: {old_status} → {new_status})")
             
             return jsonify({
                 'success': True,
@@ -734,20 +982,16 @@ def api_camera_capture():
             waited += wait_interval
         
         # 최신 이미지 찾기 (manual 폴더에서)
-        import glob
-        manual_dir = os.path.join(config.IMG_DIR, 'manual')
-        if os.path.exists(manual_dir):
-            pattern = os.path.join(manual_dir, '*.jpg')
-            images = glob.glob(pattern)
-            if images:
-                # 가장 최근 이미지
-                latest = max(images, key=os.path.getmtime)
-                rel_path = os.path.relpath(latest, config.IMG_DIR)
-                return jsonify({
-                    'success': True,
-                    'image_url': f'/api/image_file/{rel_path.replace(os.sep, "/")}',
-                    'message': '촬영 완료'
-                })
+        image_catalog.refresh(force=True)  # 방금 촬영한 파일 반영
+        latest = image_catalog.latest(subdir='manual')
+        if latest:
+            # 가장 최근 이미지
+            rel_path = os.path.relpath(latest.path, config.IMG_DIR)
+            return jsonify({
+                'success': True,
+                'image_url': f'/api/image_file/{rel_path.replace(os.sep, "/")}',
+                'message': '촬영 완료'
+            })
         
         return jsonify({
             'success': True,
@@ -796,6 +1040,10 @@ if __name__ == '__main__':
         logger.warning("⚠️ 카메라 스레드 초기화 실패")
     
     logger.info("웹 서버 시작...")
-    # 개발 모드 (프로덕션에서는 gunicorn 등 사용)
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    # 개발 서버는 WEB_SERVER_MODE = 'dev'일 때만 (그 외에는 운영용 WSGI 서버, web_ui.serving 참고)
+    from web_ui import serving
+    if getattr(config, 'WEB_SERVER_MODE', serving.MODE_WSGI) == serving.MODE_DEV:
+        app.run(host=serving.server_settings()['host'], port=serving.server_settings()['port'], debug=False)
+    else:
+        serving.serve(app)
 